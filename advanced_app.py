@@ -1,5 +1,9 @@
 import streamlit as st
-import pandas as pd
+
+from catalog import load_catalog
+from energy import assess
+from food_search import search_index
+from session_log import new_exercise_log, new_food_log
 
 # --- APP CONFIGURATION ---
 st.set_page_config(page_title="May Bloom Advanced", page_icon="🌸", layout="wide")
@@ -23,113 +27,17 @@ st.markdown("""
 
 # --- INITIALIZE SESSION STATES ---
 if 'food_log' not in st.session_state:
-    st.session_state.food_log = []
+    st.session_state.food_log = new_food_log()
 if 'exercise_log' not in st.session_state:
-    st.session_state.exercise_log = []
+    st.session_state.exercise_log = new_exercise_log()
 
 # --- PART 1: COMPLETE DATABASES (Your Full List) ---
-food_database = {
-    # --- CARBOHYDRATES ---
-    "Rice (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 0},
-    "Whole Meal Bread (1 slice)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 1},
-    "Oats (3 tablespoons)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 2},
-    "Mee / Noodle (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 1},
-    "Potato/ Carrot (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 0},
-    "Corn / Jagung (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 1},
-    "Yam / Keladi (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 0},
-    "Cream Crackers (3 pieces)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 2},
-    "Plain Biscuits / Marie (3 pieces)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 2},
-    "Bun (1 small plain)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 2},
-    "Spaghetti (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 1},
-    "Baked beans,canned/ Lentils (1/3 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 1},
-
-    # --- FRUITS ---
-    "Apple (1 small)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Orange (1 small)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Pear (1/2 medium)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Kiwi (1 large)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Ciku (2 medium)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Pineapple (1 slice)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Honeydew (1 slice)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Jackfruit / Nangka (4 pieces)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Plum (2 medium)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Mango (1/2 small)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Guava (1/2 medium)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Banana (1 small)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Papaya (1 slice)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Watermelon (1 slice)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-
-    # --- VEGETABLES ---
-    "Ulam (Cucumber/Raw Greens)":   {"Cals": 0,  "Prot": 0,  "Carbs": 0,  "Fat": 0},
-    "Bayam Soup (Spinach)":         {"Cals": 45,  "Prot": 0,  "Carbs": 0,  "Fat": 5},
-    "Sawi / Choy Sum (Blanched)":   {"Cals": 0,  "Prot": 0,  "Carbs": 0,  "Fat": 0},
-    "Steamed Broccoli/ cauliflower": {"Cals": 0,  "Prot": 0,  "Carbs": 0,  "Fat": 0},
-    "Stir fry vegetables":          {"Cals": 45,  "Prot": 0,  "Carbs": 0,  "Fat": 5},
-    
-    # --- PROTEINS ---
-    "Chicken Drumstick (1 piece)": {"Cals": 130, "Prot": 14, "Carbs": 0, "Fat": 8},
-    "Meat / Beef / Mutton (Lean - 2 matchbox size)": {"Cals": 130, "Prot": 14, "Carbs": 0, "Fat": 8},
-    "Prawns (6 medium)": {"Cals": 50, "Prot": 7, "Carbs": 0, "Fat": 2},
-    "Egg (1 whole)": {"Cals": 65, "Prot": 7, "Carbs": 0, "Fat": 5},
-    "Fish (1 medium piece)": {"Cals": 70, "Prot": 14, "Carbs": 0, "Fat": 2},
-    "Taukua (1 piece)": {"Cals": 130, "Prot": 14, "Carbs": 0, "Fat": 8},
-    "Ikan Bilis (2 tbsp)": {"Cals": 65, "Prot": 7, "Carbs": 0, "Fat": 2},
-    
-    # --- DAIRY / YOGURT ---
-    "Yogurt (Natural - 1 cup)": {"Cals": 100, "Prot": 8, "Carbs": 12, "Fat": 2},
-    "Low Fat Milk (1 glass)": {"Cals": 125, "Prot": 8, "Carbs": 12, "Fat": 5},
-    "Full Cream Milk (1 glass)": {"Cals": 150, "Prot": 8, "Carbs": 10, "Fat": 9},
-    "Skim Milk (1 glass)": {"Cals": 90, "Prot": 8, "Carbs": 15, "Fat": 0},
-    
-    # --- FATS ---
-    "Cooking Oil (1 tsp)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Butter / Margarine / Mayonnaise (1 tsp)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Peanut (20 small)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Walnut (1 whole)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Almond/ Cashew nut (6 whole)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Sesame seed (1 level tablespoon)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Coconut milk (santan) (2 level tablespoons)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-
-    # --- LOCAL FAVORITES (MEALS) ---
-    "Nasi Lemak (Standard Hawker)": {"Cals": 440, "Prot": 11, "Carbs": 30, "Fat": 25},
-    "Chicken Rice (Roasted - 1 plate)": {"Cals": 600, "Prot": 25, "Carbs": 60, "Fat": 28},
-    "Mee Goreng / Fried Mee (1 plate)": {"Cals": 500, "Prot": 15, "Carbs": 60, "Fat": 22},
-    "Noodle Soup / Mee Soup (1 bowl)": {"Cals": 350, "Prot": 15, "Carbs": 45, "Fat": 12},
-    "Curry Mee (1 bowl)": {"Cals": 550, "Prot": 18, "Carbs": 50, "Fat": 30},
-    "Char Kuey Teow (1 plate)": {"Cals": 740, "Prot": 15, "Carbs": 70, "Fat": 40},
-    "Roti Canai (1 piece + dhal)": {"Cals": 300, "Prot": 6, "Carbs": 35, "Fat": 15},
-    "Tosai (1 piece)": {"Cals": 200, "Prot": 4, "Carbs": 35, "Fat": 4},
-    "Sandwich (Egg Mayo - 2 slices)": {"Cals": 300, "Prot": 10, "Carbs": 30, "Fat": 15},
-    "Satay (Chicken - 5 sticks)": {"Cals": 185, "Prot": 15, "Carbs": 5, "Fat": 12},
-    
-    # --- LOCAL DRINKS ---
-    "Teh Tarik (1 glass)": {"Cals": 180, "Prot": 4, "Carbs": 25, "Fat": 6},
-    "Kopi O (Black with Sugar)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Kopi Susu (Coffee with Milk)": {"Cals": 140, "Prot": 3, "Carbs": 20, "Fat": 5},
-    "Milo (1 cup)": {"Cals": 150, "Prot": 3, "Carbs": 25, "Fat": 4},
-    "Syrup Bandung (1 glass)": {"Cals": 150, "Prot": 2, "Carbs": 25, "Fat": 5},
-    "Plain Water": {"Cals": 0, "Prot": 0, "Carbs": 0, "Fat": 0}
-}
-
-exercise_database = {
-    # High Intensity
-    "Zumba / Aerobics": 250,
-    "Pound (Cardio Drumming)": 240,   
-    "Jogging": 240,
-    "Swimming (Laps)": 230,
-    "Badminton (Competitive)": 220,
-    "Cycling": 200,
-
-    # Moderate Intensity
-    "Badminton / Pickleball (Casual)": 150, 
-    "Walking (Brisk)": 130,
-    "Gardening": 140,
-
-    # Low Intensity / Strength
-    "Yoga": 100,                      
-    "Pilates": 110,                    
-    "House Chores": 90,
-}
+# Shared catalog (catalog.py), built once per server process
+catalog = load_catalog()
+food_database = catalog.foods
+exercise_database = catalog.exercises
+food_index = search_index(catalog)
+FOOD_SEARCH_RESULTS = 20
 
 # --- PART 2: SIDEBAR (PROFILE) ---
 with st.sidebar:
@@ -142,48 +50,30 @@ with st.sidebar:
     
     st.divider()
     
-    # CALCULATE LOGIC (Advanced BMI & Adjusted Weight)
-    height_m = height_cm / 100
-    bmi = weight_kg / (height_m ** 2)
+    # CALCULATE LOGIC (Advanced BMI & Adjusted Weight) -> energy.py
+    metrics = assess(height_cm, weight_kg, activity)
+    bmi, status = metrics.bmi, metrics.status
     
-    if bmi < 18.5:
-        status = "Underweight"
+    if status == "Underweight":
         st.info(f"BMI: {bmi:.1f} ({status})")
-        calc_weight = weight_kg
-    elif 18.5 <= bmi < 23:
-        status = "Normal"
+    elif status == "Normal":
         st.success(f"BMI: {bmi:.1f} ({status})")
-        calc_weight = weight_kg
-    elif 23 <= bmi < 25:
-        status = "Overweight"
+    elif status == "Overweight":
         st.warning(f"BMI: {bmi:.1f} ({status})")
-        calc_weight = weight_kg
     else:
-        status = "Obese"
         st.error(f"BMI: {bmi:.1f} ({status})")
-        ideal_weight = 22 * (height_m ** 2)
-        adj_weight = ideal_weight + 0.25 * (weight_kg - ideal_weight)
-        calc_weight = adj_weight
-        st.caption(f"⚠️ Using Adjusted Weight: {adj_weight:.1f}kg")
+        st.caption(f"⚠️ Using Adjusted Weight: {metrics.calc_weight:.1f}kg")
 
-    daily_needs = calc_weight * (25 if "Sedentary" in activity else 30)
+    daily_needs = metrics.daily_needs
     st.metric("🔥 Daily Target", f"{int(daily_needs)} kcal")
 
 # --- PART 3: MAIN DASHBOARD ---
 st.title("🌸 May Bloom Lifestyle Tracker")
 
 # Calculate Totals
-if st.session_state.food_log:
-    f_df = pd.DataFrame(st.session_state.food_log)
-    total_intake = f_df["Calories"].sum()
-else:
-    total_intake = 0
-
-if st.session_state.exercise_log:
-    e_df = pd.DataFrame(st.session_state.exercise_log)
-    total_burned = e_df["Calories Burned"].sum()
-else:
-    total_burned = 0
+# Running totals are kept up to date by the session logs (no DataFrame needed)
+total_intake = st.session_state.food_log.total("Calories")
+total_burned = st.session_state.exercise_log.total("Calories Burned")
 
 net_calories = total_intake - total_burned
 remaining = daily_needs - net_calories
@@ -213,12 +103,17 @@ with tab1:
     with c1:
         meal = st.selectbox("Meal Type", ["Breakfast", "Lunch", "Dinner", "Snack"])
     with c2:
-        food = st.selectbox("Food Item", list(food_database.keys()))
+        # Only the top matches for what the client typed go to the browser
+        food_query = st.text_input("Search Food", placeholder="e.g. jagung, nasi, telur")
+        food_matches = food_index.search(food_query, k=FOOD_SEARCH_RESULTS)
+        food = st.selectbox("Food Item", food_matches)
+        if not food_matches:
+            st.caption("No matching food found.")
     with c3:
         # Using Dropdown for cleaner mobile experience
         qty = st.selectbox("Serving", [0.5, 1.0, 1.5, 2.0, 2.5, 3.0], index=1)
         
-    if st.button("Add Meal ➕", use_container_width=True):
+    if st.button("Add Meal ➕", use_container_width=True, disabled=food is None):
         st.session_state.food_log.append({
             "Meal": meal, "Food": food, "Qty": qty, 
             "Calories": food_database[food]["Cals"] * qty,
@@ -230,9 +125,9 @@ with tab1:
         st.rerun()
 
     if st.session_state.food_log:
-        st.dataframe(pd.DataFrame(st.session_state.food_log), use_container_width=True)
+        st.dataframe(st.session_state.food_log.to_frame(), use_container_width=True)
         if st.button("Clear Food 🗑️"):
-            st.session_state.food_log = []
+            st.session_state.food_log.clear()
             st.rerun()
 
 with tab2:
@@ -252,7 +147,7 @@ with tab2:
         st.rerun()
         
     if st.session_state.exercise_log:
-        st.dataframe(pd.DataFrame(st.session_state.exercise_log), use_container_width=True)
+        st.dataframe(st.session_state.exercise_log.to_frame(), use_container_width=True)
         if st.button("Clear Exercise 🗑️"):
-            st.session_state.exercise_log = []
+            st.session_state.exercise_log.clear()
             st.rerun()
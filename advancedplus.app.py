@@ -1,60 +1,172 @@
+import io
+import os
+import pathlib
+import threading
+import time
 import streamlit as st
 import pandas as pd
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from datetime import date
+from datetime import date, timedelta
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from bulk import EXPORT_FORMATS, export_file, import_logs, import_template
+from catalog import FOOD_ALIASES, load_catalog
+from drafts import EXERCISE, FOOD, DraftStore
+from energy import INCOMPLETE, assess, assess_batch
+from feedback import FeedbackIndex
+from food_search import search_index
+from instrumentation import Profiler
+from meal_templates import TemplateStore
+from quota import QuotaExceeded, QuotaGovernor
+from recommend import RANKINGS, recommender
+from rollups import ClientRollups
+from session_log import new_exercise_log, new_food_log
+from shared_cache import NullCache, SharedCache
+from sheets import SheetsConnection
+from spool import ITEMS, SUMMARY, SaveSpool, SpoolWorker
+from storage import format_log_to_string, log_item_day, make_storage
+from trends import PERIODS, TABLE_ROWS, daily_frame, downsample, summarize
+
+RERUN_STARTED = time.perf_counter()
 
 # --- 1. APP CONFIGURATION ---
 st.set_page_config(page_title="May Bloom Advanced", page_icon="🌸", layout="wide")
 
-# --- 2. GOOGLE SHEETS CONNECTION ---
+def current_run():
+    """(session id, username) of the rerun on this thread, full or fragment-only; None off the script threads."""
+    ctx = get_script_run_ctx(suppress_warning=True)
+    if ctx is None:
+        return None
+    return ctx.session_id, st.session_state.get("username")
+
+@st.cache_resource
+def get_profiler():
+    """Process-wide rerun timings + Sheets call counters (secrets.toml [ops] profiling = true)."""
+    return Profiler(enabled=bool(st.secrets.get("ops", {}).get("profiling", False)), context=current_run)
+
+profiler = get_profiler()
+
+# --- 2. STORAGE (Google Sheets or local SQLite) ---
 SHEET_NAME = "wellness_database"
+LOCAL_DATA_DIR = "local_data"  # on-disk stores (save spool, sqlite engine etc.), kept out of git
 
-def get_sheet_connection(type="main"):
+@st.cache_resource
+def get_sheets():
     """
-    Connects to Google Sheets.
-    type="main" -> Returns the FIRST tab (your data logs)
-    type="feedback" -> Returns the 'feedback' tab
+    One authorized client + spreadsheet handle shared by every session in this process.
+    All sessions share one quota budget too (secrets.toml [quota] reads_per_minute, writes_per_minute, ...).
     """
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/drive"]
-    creds = ServiceAccountCredentials.from_json_keyfile_dict(dict(st.secrets["service_account"]), scope)
-    client = gspread.authorize(creds)
-    
-    spreadsheet = client.open(SHEET_NAME)
-    
-    if type == "feedback":
-        try:
-            return spreadsheet.worksheet("feedback")
-        except:
-            return None # Feedback tab doesn't exist
-    else:
-        # "get_worksheet(0)" always grabs the first tab
-        return spreadsheet.get_worksheet(0)
-
-def format_log_to_string(log_list, type="food"):
-    if not log_list: return "None"
-    text_summary = []
-    for item in log_list:
-        if type == "food":
-            text_summary.append(f"{item['Meal']}: {item['Food']} (x{item['Qty']})")
-        else:
-            text_summary.append(f"{item['Activity']} ({item['Duration']} mins)")
-    return ", ".join(text_summary)
+    governor = QuotaGovernor(**st.secrets.get("quota", {}))
+    return SheetsConnection(st.secrets["service_account"], SHEET_NAME, observer=profiler.on_sheets_call, governor=governor)
+
+@st.cache_resource
+def get_shared_cache():
+    """
+    Cache shared by every app process on this host (secrets.toml [cache] shared_path),
+    so adding replicas doesn't multiply Sheets reads. Without it nothing is shared.
+    """
+    path = st.secrets.get("cache", {}).get("shared_path")
+    return SharedCache(path) if path else NullCache()
+
+@st.cache_resource
+def get_storage():
+    """
+    The storage engine picked in secrets.toml [storage] engine = "sheets" | "sqlite".
+    Shared by every session in this process.
+    """
+    config = dict(st.secrets.get("storage", {}))
+    return make_storage(config, get_sheets, f"{LOCAL_DATA_DIR}/wellness.db", shared=get_shared_cache())
+
+@st.cache_resource
+def get_feedback_index():
+    """Latest coach note per client, shared by every session and refreshed on a TTL."""
+    return FeedbackIndex(get_storage(), shared=get_shared_cache())
+
+PROFILES_TTL = 300  # seconds
+
+@st.cache_data(ttl=PROFILES_TTL, show_spinner=False)
+def load_profiles():
+    """
+    Client profiles for the admin table, read at most once per PROFILES_TTL in
+    this process; the shared cache (if any) saves the other replicas the read too.
+    """
+    return get_shared_cache().get_or_load("profiles", PROFILES_TTL, get_storage().read_profiles)
+
+@st.cache_resource
+def get_rollups():
+    """Per-client rollups shared by every admin session; refreshed from new rows only."""
+    return ClientRollups()
+
+@st.cache_resource
+def get_draft_store():
+    """Unsaved day logs per (username, entry_date), so a refresh or log out loses nothing."""
+    return DraftStore(f"{LOCAL_DATA_DIR}/drafts.db")
+
+@st.cache_resource
+def get_template_store():
+    """Each client's saved meals, priced against the catalog when saved."""
+    return TemplateStore(f"{LOCAL_DATA_DIR}/meal_templates.db")
+
+def normalized_items_enabled():
+    """secrets.toml [storage] normalized_items = true -> also store one row per logged item."""
+    return bool(st.secrets.get("storage", {}).get("normalized_items", False))
+
+@st.cache_resource
+def get_save_spool():
+    """
+    Durable local queue for saves + the one background worker that drains it
+    into the storage engine in batches.
+    """
+    spool = SaveSpool(f"{LOCAL_DATA_DIR}/save_spool.db")
+    storage = get_storage()
+    worker = SpoolWorker(spool, {SUMMARY: storage.save_daily_summaries, ITEMS: storage.save_log_items})
+    worker.start()
+    return spool, worker
 
 def save_daily_summary(selected_date, food_log, exercise_log, net_calories):
+    """Queues the day's summary locally; the spool worker pushes it to storage."""
     try:
-        # Save to the main log sheet (First Tab)
-        sheet = get_sheet_connection("main")
         food_str = format_log_to_string(food_log, type="food")
         exercise_str = format_log_to_string(exercise_log, type="exercise")
         
         new_row = [str(selected_date), food_str, exercise_str, net_calories, st.session_state["username"]]
-        sheet.append_row(new_row)
+        spool, worker = get_save_spool()
+        spool.enqueue(st.session_state["username"], selected_date, new_row)
+        if normalized_items_enabled():
+            item_day = log_item_day(selected_date, st.session_state["username"], food_log, exercise_log)
+            spool.enqueue(st.session_state["username"], selected_date, item_day, ITEMS)
+        worker.notify()
         return True
     except Exception as e:
-        st.error(f"Error saving to cloud: {e}")
+        st.error(f"Error saving your entry: {e}")
         return False
 
+@st.cache_resource
+def start_warm_up():
+    """
+    secrets.toml [ops] warm_up = true: the first visit to a fresh server starts
+    connecting to storage and building the food indexes in the background, so
+    the first login doesn't wait for them while the login form is on screen.
+    A step that fails is recorded (shown in the admin sidebar) and the next
+    one still runs; the real request retries it anyway.
+    """
+    storage = get_storage()
+    status = {"errors": 0, "last_error": None}
+    steps = [("food index", lambda: search_index(load_catalog()).warm()), ("storage", storage.warm_up)]
+
+    def warm_up():
+        for name, step in steps:
+            try:
+                step()
+            except Exception as e:
+                status["errors"] += 1
+                status["last_error"] = f"{name}: {e}"
+
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+    return status
+
+if st.secrets.get("ops", {}).get("warm_up", False):
+    start_warm_up()
+
 # --- 3. SECURE LOGIN SYSTEM ---
 def check_password():
     if "logged_in" not in st.session_state:
@@ -88,24 +200,27 @@ if not check_password():
 if st.session_state["username"] == "admin":
     
     # --- ADMIN SIDEBAR START ---
-    with st.sidebar:
+    with profiler.section("admin.sidebar"), st.sidebar:
         st.header("👑 Admin Panel")
         
         # Admin Feedback Check (To test if the blue box works)
-        try:
-            feedback_sheet = get_sheet_connection("feedback")
-            if feedback_sheet:
-                fb_data = feedback_sheet.get_all_records()
-                fb_df = pd.DataFrame(fb_data)
-                
-                if not fb_df.empty and "username" in fb_df.columns:
-                    # Check if 'admin' has a note
-                    user_fb = fb_df[fb_df["username"] == "admin"]
-                    if not user_fb.empty:
-                        last_note = user_fb.iloc[-1]
-                        st.info(f"💌 **Test Note ({last_note['month']}):**\n\n{last_note['note']}")
-        except:
-            pass
+        feedback_index = get_feedback_index()
+        last_note = feedback_index.latest("admin")
+        if last_note:
+            st.info(f"💌 **Test Note ({last_note['month']}):**\n\n{last_note['note']}")
+        
+        fb_stats = feedback_index.stats()
+        st.caption(f"💌 Notes for {fb_stats['users_with_notes']} clients · {fb_stats['refreshes']} reads · {fb_stats['lookups']} lookups")
+        shared = get_shared_cache()
+        if shared.enabled:
+            cache_stats = shared.stats()
+            st.caption(f"🗄️ Shared cache: {cache_stats['hits']} hits · {cache_stats['misses']} misses · {cache_stats['published']} events sent")
+        if fb_stats["errors"]:
+            st.warning(f"Feedback read failed {fb_stats['errors']}x. Last error: {fb_stats['last_error']}")
+        if st.secrets.get("ops", {}).get("warm_up", False):
+            warm_up_status = start_warm_up()
+            if warm_up_status["errors"]:
+                st.warning(f"Warm-up failed {warm_up_status['errors']}x. Last error: {warm_up_status['last_error']}")
 
         st.divider()
         if st.button("Log Out Admin"):
@@ -116,27 +231,163 @@ if st.session_state["username"] == "admin":
     st.title("👑 Admin Dashboard")
     st.success("Welcome, Coach! Here is the master view.")
     
+    RAW_PAGE_SIZE = 50
+
     try:
-        sheet = get_sheet_connection("main")
-        data = sheet.get_all_records()
-        df_master = pd.DataFrame(data)
+        storage = get_storage()
+        rollups = get_rollups()
+        with profiler.section("admin.rollups_refresh"):
+            rollups.refresh(storage)
         
-        if df_master.empty:
-            st.warning("⚠️ Google Sheet is empty.")
+        if rollups.total_entries == 0:
+            st.warning("⚠️ No entries saved yet.")
         else:
             col1, col2, col3 = st.columns(3)
-            col1.metric("Total Entries", len(df_master))
-            col2.metric("Total Clients", df_master['username'].nunique())
-            col3.metric("Latest Entry", df_master.iloc[-1]['Date'] if 'Date' in df_master.columns else "N/A")
+            col1.metric("Total Entries", rollups.entries)
+            col2.metric("Total Clients", len(rollups.clients))
+            col3.metric("Latest Entry", rollups.latest_date or "N/A")
+            
+            st.subheader("👥 Clients at a Glance")
+            df_clients = pd.DataFrame(rollups.summary())
+            
+            # Score each client's latest saved day against their target (one vectorized call)
+            df_profiles = pd.DataFrame(load_profiles())
+            if not df_profiles.empty:
+                targets = assess_batch(df_profiles["height_cm"], df_profiles["weight_kg"], df_profiles["activity"])
+                df_profiles["bmi_status"] = targets["status"]
+                df_profiles["daily_target"] = targets["daily_needs"].round()
+                df_clients = df_clients.merge(df_profiles[["username", "bmi_status", "daily_target"]], on="username", how="left")
+                df_clients["last_day_vs_target_%"] = (100 * df_clients["last_day_net"] / df_clients["daily_target"]).round()
+            st.dataframe(df_clients, use_container_width=True, hide_index=True)
+            if df_profiles.empty:
+                st.caption("Add a 'profiles' tab (username, height_cm, weight_kg, activity) to see each client's daily target here.")
+            elif (df_profiles["bmi_status"] == INCOMPLETE).any():
+                incomplete = df_profiles.loc[df_profiles["bmi_status"] == INCOMPLETE, "username"]
+                st.caption(f"⚠️ {len(incomplete)} profiles need a height and weight: {', '.join(map(str, incomplete))}")
             
+            # Raw rows are only downloaded when the coach asks for them, one page at a time
             st.subheader("📋 Client Logs")
-            st.dataframe(df_master, use_container_width=True)
+            if st.toggle("Show raw logs"):
+                client_choice = st.selectbox("Client", ["All clients"] + sorted(rollups.clients))
+                if client_choice == "All clients":
+                    total_rows = rollups.rows  # row slots, the unit read_master_page pages by
+                else:
+                    client_rows = storage.read_history(client_choice)
+                    total_rows = len(client_rows)
+                pages = max(1, -(-total_rows // RAW_PAGE_SIZE))
+                page = st.number_input(f"Page (of {pages})", 1, pages, pages)
+                offset = (page - 1) * RAW_PAGE_SIZE
+                
+                if client_choice == "All clients":
+                    page_rows = storage.read_master_page(offset, RAW_PAGE_SIZE)
+                else:
+                    page_rows = client_rows[offset:offset + RAW_PAGE_SIZE]
+                st.dataframe(pd.DataFrame(page_rows), use_container_width=True)
             
-            st.info("💡 Tip: To give feedback, go to the 'feedback' tab in Google Sheets and add a row for your client!")
+            if storage.name == "sheets":
+                conn_stats = storage.stats()
+                st.caption(f"🔌 Sheets handshakes: {conn_stats['handshakes']} · avoided: {conn_stats['handshakes_avoided']} · auth reconnects: {conn_stats['auth_reconnects']}")
+                quota = conn_stats["quota"]
+                st.caption(f"🚦 Quota: {quota['reads']} reads · {quota['writes']} writes · {quota['coalesced']} coalesced · {quota['stale_served']} served stale · {quota['queued']} queued · {quota['rejected']} rejected")
+
+            # Saves now overwrite the day's row; rows duplicated before that can be cleaned up once
+            with st.expander("🧹 Maintenance"):
+                duplicates = rollups.total_entries - rollups.entries
+                st.caption(f"{duplicates} saved rows repeat a day that has a later save. Compaction keeps the latest save of each day.")
+                if st.button("Remove duplicate days", disabled=duplicates <= 0):
+                    removed = storage.compact_daily_summaries()
+                    rollups.refresh(storage, force=True)
+                    st.success(f"Removed {removed} duplicate rows.")
+
+            # --- COACH NOTES ---
+            # The form keeps the editor from rerunning on every keystroke; all notes go out in one write
+            with st.expander("💌 Coach notes", expanded=True):
+                if st.session_state.get("notes_published"):
+                    st.success(f"Published {st.session_state.pop('notes_published')} notes.")
+                note_columns = [c for c in ("username", "last_seen", "week_net", "month_net", "last_day_vs_target_%") if c in df_clients]
+                df_notes = df_clients[note_columns].copy()
+                df_notes["current_note"] = [(feedback_index.latest(u) or {}).get("note", "") for u in df_notes["username"]]
+                df_notes["new_note"] = ""
+                with st.form("coach_notes", border=False):
+                    note_month = st.text_input("Month", date.today().strftime("%Y-%m"))
+                    edited = st.data_editor(
+                        df_notes, hide_index=True, use_container_width=True,
+                        disabled=[c for c in df_notes.columns if c != "new_note"],
+                        key=f"notes_editor_{st.session_state.get('notes_round', 0)}",
+                    )
+                    publish = st.form_submit_button("📨 Publish notes")
+                if publish:
+                    new_notes = edited["new_note"].fillna("").astype(str).str.strip()
+                    notes = [[u, note_month.strip(), n] for u, n in zip(edited["username"], new_notes) if n]
+                    if notes:
+                        st.session_state["notes_published"] = feedback_index.publish(notes)
+                        st.session_state["notes_round"] = st.session_state.get("notes_round", 0) + 1  # fresh, empty editor
+                        st.rerun()
+                    st.info("Write at least one note first.")
+
+        # --- BULK EXPORT / IMPORT ---
+        with st.expander("📦 Bulk export / import"):
+            st.markdown("**Export** the master log, streamed in chunks to a file on the server.")
+            export_format = st.radio("Format", EXPORT_FORMATS, horizontal=True, format_func=str.upper)
+            if st.button("Prepare export"):
+                with st.spinner("Exporting..."):
+                    st.session_state["export_file"] = export_file(storage, export_format, f"{LOCAL_DATA_DIR}/exports")
+            if st.session_state.get("export_file"):
+                export_path, export_rows = st.session_state["export_file"]
+                if not os.path.exists(export_path):  # rotated out by a newer export
+                    del st.session_state["export_file"]
+                else:
+                    # The file is only read when the button is clicked, not on every rerun
+                    st.download_button(f"⬇️ Download {os.path.basename(export_path)} ({export_rows} rows)",
+                                       pathlib.Path(export_path).read_bytes, file_name=os.path.basename(export_path))
+
+            st.divider()
+            st.markdown("**Import** past logs: one row per food or exercise item. Each (client, day) in the file replaces that day's saved summary.")
+            st.download_button("Download template", import_template(), file_name="log_import_template.csv")
+            upload = st.file_uploader("Log CSV", type="csv")
+            dry_run = st.checkbox("Only validate (write nothing)", value=True)
+            if upload is not None and st.button("Run import"):
+                import_catalog = load_catalog()
+                try:
+                    with st.spinner("Importing..."):
+                        report = import_logs(
+                            storage, io.TextIOWrapper(upload, encoding="utf-8-sig"),
+                            import_catalog.foods, import_catalog.exercises, aliases=FOOD_ALIASES,
+                            usernames=set(st.secrets["passwords"]), with_items=normalized_items_enabled(),
+                            dry_run=dry_run,
+                        )
+                except ValueError as e:
+                    st.error(f"Could not read the file: {e}")
+                else:
+                    st.write(f"{report['rows_read']} rows · {report['days']} days · {report['users']} clients")
+                    if report["error_count"]:
+                        st.error(f"{report['error_count']} invalid rows, nothing was written. Fix them and try again.")
+                        st.dataframe(pd.DataFrame(report["errors"], columns=["line", "problem"]), hide_index=True)
+                    elif dry_run:
+                        st.success("All rows are valid. Untick 'Only validate' to write them.")
+                    else:
+                        rollups.refresh(storage, force=True)
+                        st.success(f"Imported {report['written']} daily summaries.")
 
     except Exception as e:
         st.error(f"System Error: {e}")
-        
+
+    # --- OPS: rerun timings + Sheets usage (opt-in) ---
+    st.subheader("⚙️ Ops")
+    if not profiler.enabled:
+        st.caption("Profiling is off. Add `[ops]` / `profiling = true` to secrets.toml to collect rerun timings and Sheets call counts.")
+    else:
+        st.caption("Rolling p50/p95/p99 per section (ms), since the server started.")
+        st.dataframe(pd.DataFrame(profiler.percentiles()), use_container_width=True, hide_index=True)
+        usage_scope = st.radio("Sheets calls by", ["user", "session", "method"], horizontal=True)
+        st.dataframe(pd.DataFrame(profiler.sheets_usage(usage_scope)), use_container_width=True, hide_index=True)
+        if st.button("📤 Export metrics"):
+            os.makedirs(LOCAL_DATA_DIR, exist_ok=True)
+            path = profiler.export(f"{LOCAL_DATA_DIR}/ops_metrics.jsonl")
+            st.success(f"Snapshot appended to {path}")
+
+    if profiler.enabled:
+        profiler.record("rerun.admin", (time.perf_counter() - RERUN_STARTED) * 1000)
     st.stop() 
 
 # ==========================================
@@ -151,105 +402,25 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# --- INITIALIZE STATES ---
-if 'food_log' not in st.session_state: st.session_state.food_log = []
-if 'exercise_log' not in st.session_state: st.session_state.exercise_log = []
-
 # --- DATABASES ---
-food_database = {
-    "Rice (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 0},
-    "Whole Meal Bread (1 slice)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 1},
-    "Oats (3 tablespoons)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 2},
-    "Mee / Noodle (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 1},
-    "Potato/ Carrot (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 0},
-    "Corn / Jagung (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 1},
-    "Yam / Keladi (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 0},
-    "Cream Crackers (3 pieces)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 2},
-    "Plain Biscuits / Marie (3 pieces)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 2},
-    "Bun (1 small plain)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 2},
-    "Spaghetti (1/2 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 1},
-    "Baked beans,canned/ Lentils (1/3 cup)": {"Cals": 75, "Prot": 2, "Carbs": 15, "Fat": 1},
-    "Apple (1 small)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Orange (1 small)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Pear (1/2 medium)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Kiwi (1 large)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Ciku (2 medium)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Pineapple (1 slice)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Honeydew (1 slice)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Jackfruit / Nangka (4 pieces)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Plum (2 medium)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Mango (1/2 small)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Guava (1/2 medium)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Banana (1 small)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Papaya (1 slice)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Watermelon (1 slice)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Ulam (Cucumber/Raw Greens)":   {"Cals": 0,  "Prot": 0,  "Carbs": 0,  "Fat": 0},
-    "Bayam Soup (Spinach)":         {"Cals": 45,  "Prot": 0,  "Carbs": 0,  "Fat": 5},
-    "Sawi / Choy Sum (Blanched)":   {"Cals": 0,  "Prot": 0,  "Carbs": 0,  "Fat": 0},
-    "Steamed Broccoli/ cauliflower": {"Cals": 0,  "Prot": 0,  "Carbs": 0,  "Fat": 0},
-    "Stir fry vegetables":          {"Cals": 45,  "Prot": 0,  "Carbs": 0,  "Fat": 5},
-    "Chicken Drumstick (1 piece)": {"Cals": 130, "Prot": 14, "Carbs": 0, "Fat": 8},
-    "Meat / Beef / Mutton (Lean - 2 matchbox size)": {"Cals": 130, "Prot": 14, "Carbs": 0, "Fat": 8},
-    "Prawns (6 medium)": {"Cals": 50, "Prot": 7, "Carbs": 0, "Fat": 2},
-    "Egg (1 whole)": {"Cals": 65, "Prot": 7, "Carbs": 0, "Fat": 5},
-    "Fish (1 medium piece)": {"Cals": 70, "Prot": 14, "Carbs": 0, "Fat": 2},
-    "Taukua (1 piece)": {"Cals": 130, "Prot": 14, "Carbs": 0, "Fat": 8},
-    "Ikan Bilis (2 tbsp)": {"Cals": 65, "Prot": 7, "Carbs": 0, "Fat": 2},
-    "Yogurt (Natural - 1 cup)": {"Cals": 100, "Prot": 8, "Carbs": 12, "Fat": 2},
-    "Low Fat Milk (1 glass)": {"Cals": 125, "Prot": 8, "Carbs": 12, "Fat": 5},
-    "Full Cream Milk (1 glass)": {"Cals": 150, "Prot": 8, "Carbs": 10, "Fat": 9},
-    "Skim Milk (1 glass)": {"Cals": 90, "Prot": 8, "Carbs": 15, "Fat": 0},
-    "Cooking Oil (1 tsp)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Butter / Margarine / Mayonnaise (1 tsp)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Peanut (20 small)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Walnut (1 whole)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Almond/ Cashew nut (6 whole)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Sesame seed (1 level tablespoon)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Coconut milk (santan) (2 level tablespoons)": {"Cals": 45, "Prot": 0, "Carbs": 0, "Fat": 5},
-    "Nasi Lemak (Standard Hawker)": {"Cals": 440, "Prot": 11, "Carbs": 30, "Fat": 25},
-    "Chicken Rice (Roasted - 1 plate)": {"Cals": 600, "Prot": 25, "Carbs": 60, "Fat": 28},
-    "Mee Goreng / Fried Mee (1 plate)": {"Cals": 500, "Prot": 15, "Carbs": 60, "Fat": 22},
-    "Noodle Soup / Mee Soup (1 bowl)": {"Cals": 350, "Prot": 15, "Carbs": 45, "Fat": 12},
-    "Curry Mee (1 bowl)": {"Cals": 550, "Prot": 18, "Carbs": 50, "Fat": 30},
-    "Char Kuey Teow (1 plate)": {"Cals": 740, "Prot": 15, "Carbs": 70, "Fat": 40},
-    "Roti Canai (1 piece + dhal)": {"Cals": 300, "Prot": 6, "Carbs": 35, "Fat": 15},
-    "Tosai (1 piece)": {"Cals": 200, "Prot": 4, "Carbs": 35, "Fat": 4},
-    "Sandwich (Egg Mayo - 2 slices)": {"Cals": 300, "Prot": 10, "Carbs": 30, "Fat": 15},
-    "Satay (Chicken - 5 sticks)": {"Cals": 185, "Prot": 15, "Carbs": 5, "Fat": 12},
-    "Teh Tarik (1 glass)": {"Cals": 180, "Prot": 4, "Carbs": 25, "Fat": 6},
-    "Kopi O (Black with Sugar)": {"Cals": 60, "Prot": 0, "Carbs": 15, "Fat": 0},
-    "Kopi Susu (Coffee with Milk)": {"Cals": 140, "Prot": 3, "Carbs": 20, "Fat": 5},
-    "Milo (1 cup)": {"Cals": 150, "Prot": 3, "Carbs": 25, "Fat": 4},
-    "Syrup Bandung (1 glass)": {"Cals": 150, "Prot": 2, "Carbs": 25, "Fat": 5},
-    "Plain Water": {"Cals": 0, "Prot": 0, "Carbs": 0, "Fat": 0}
-}
-
-exercise_database = {
-    "Zumba / Aerobics": 250, "Pound (Cardio Drumming)": 240, "Jogging": 240,
-    "Swimming (Laps)": 230, "Badminton (Competitive)": 220, "Cycling": 200,
-    "Badminton / Pickleball (Casual)": 150, "Walking (Brisk)": 130, "Gardening": 140,
-    "Yoga": 100, "Pilates": 110, "House Chores": 90,
-}
+# Shared catalog (catalog.py), built once per server process
+catalog = load_catalog()
+food_database = catalog.foods
+exercise_database = catalog.exercises
+food_index = search_index(catalog)
+FOOD_SEARCH_RESULTS = 20
+PROTEIN_PER_KG = 1.0  # g of protein per kg (adjusted) body weight, for budget suggestions
 
 # --- SIDEBAR (UPDATED) ---
-with st.sidebar:
+with profiler.section("client.sidebar"), st.sidebar:
     st.image("https://cdn-icons-png.flaticon.com/512/3050/3050484.png", width=80)
     st.header(f"👤 {st.session_state['username'].title()}")
     
     # --- 💌 COACH FEEDBACK ---
-    try:
-        feedback_sheet = get_sheet_connection("feedback")
-        if feedback_sheet:
-            fb_data = feedback_sheet.get_all_records()
-            fb_df = pd.DataFrame(fb_data)
-            
-            if not fb_df.empty and "username" in fb_df.columns:
-                user_fb = fb_df[fb_df["username"] == st.session_state["username"]]
-                if not user_fb.empty:
-                    last_note = user_fb.iloc[-1]
-                    st.info(f"💌 **Coach's Note ({last_note['month']}):**\n\n{last_note['note']}")
-    except:
-        pass 
+    with profiler.section("client.feedback_lookup"):
+        last_note = get_feedback_index().latest(st.session_state["username"])
+    if last_note:
+        st.info(f"💌 **Coach's Note ({last_note['month']}):**\n\n{last_note['note']}")
     # -------------------------
 
     st.divider()
@@ -259,26 +430,21 @@ with st.sidebar:
     activity = st.selectbox("Activity Level", ["Sedentary (x25)", "Active (x30)"])
     st.divider()
     
-    height_m = height_cm / 100
-    bmi = weight_kg / (height_m ** 2)
+    metrics = assess(height_cm, weight_kg, activity)
+    bmi = metrics.bmi
     
-    if bmi < 18.5:
+    if metrics.status == "Underweight":
         st.info(f"BMI: {bmi:.1f} (Underweight)")
-        calc_weight = weight_kg
-    elif 18.5 <= bmi < 23:
+    elif metrics.status == "Normal":
         st.success(f"BMI: {bmi:.1f} (Normal)")
-        calc_weight = weight_kg
-    elif 23 <= bmi < 25:
+    elif metrics.status == "Overweight":
         st.warning(f"BMI: {bmi:.1f} (Overweight)")
-        calc_weight = weight_kg
     else:
         st.error(f"BMI: {bmi:.1f} (Obese)")
-        ideal_weight = 22 * (height_m ** 2)
-        adj_weight = ideal_weight + 0.25 * (weight_kg - ideal_weight)
-        calc_weight = adj_weight
-        st.caption(f"⚠️ Adjusted Weight: {adj_weight:.1f}kg")
+        st.caption(f"⚠️ Adjusted Weight: {metrics.calc_weight:.1f}kg")
 
-    daily_needs = calc_weight * (25 if "Sedentary" in activity else 30)
+    daily_needs = metrics.daily_needs
+    protein_target = PROTEIN_PER_KG * metrics.calc_weight
     st.metric("🔥 Daily Target", f"{int(daily_needs)} kcal")
     
     if st.button("Log Out"):
@@ -290,125 +456,244 @@ st.title("🌸 May Bloom Lifestyle Tracker")
 
 entry_date = st.date_input("📅 Date of Entry", date.today())
 
-# Calculate Totals
-if st.session_state.food_log:
-    f_df = pd.DataFrame(st.session_state.food_log)
-    total_intake = f_df["Calories"].sum()
-else:
-    total_intake = 0
-
-if st.session_state.exercise_log:
-    e_df = pd.DataFrame(st.session_state.exercise_log)
-    total_burned = e_df["Calories Burned"].sum()
-else:
-    total_burned = 0
-
-net_calories = total_intake - total_burned
-remaining = daily_needs - net_calories
-
-col1, col2, col3 = st.columns(3)
-col1.metric("🍽️ Food Intake", f"{int(total_intake)} kcal")
-col2.metric("🔥 Exercise Burn", f"-{int(total_burned)} kcal")
-col3.metric("⚖️ Net Calories", f"{int(net_calories)} kcal", delta=f"{int(remaining)} left")
-
-st.write("Daily Energy Progress:")
-progress = min(max(net_calories / daily_needs, 0.0), 1.0)
-st.progress(progress)
-
-if remaining < 0:
-    st.error(f"⚠️ Over budget by {abs(int(remaining))} kcal!")
-else:
-    st.info(f"✅ {int(remaining)} kcal remaining.")
-
-# --- SAVE TO CLOUD BUTTON ---
-st.markdown("---")
-if st.button("☁️ Save Daily Summary to Cloud", use_container_width=True):
-    if save_daily_summary(entry_date, st.session_state.food_log, st.session_state.exercise_log, net_calories):
-        st.success(f"Daily summary for {entry_date} saved to Google Sheets!")
-        st.balloons()
-
-# --- TABS ---
-st.divider()
-tab1, tab2, tab3 = st.tabs(["🍽️ Food Log", "🏃‍♀️ Exercise Log", "📅 History"])
-
-with tab1:
-    c1, c2, c3 = st.columns([2,2,1])
-    with c1:
-        meal = st.selectbox("Meal Type", ["Breakfast", "Lunch", "Dinner", "Snack"])
-    with c2:
-        food = st.selectbox("Food Item", list(food_database.keys()))
-    with c3:
-        qty = st.selectbox("Serving", [0.5, 1.0, 1.5, 2.0, 2.5, 3.0], index=1)
-        
-    if st.button("Add Meal ➕", use_container_width=True):
-        st.session_state.food_log.append({
-            "Meal": meal, "Food": food, "Qty": qty, 
-            "Calories": food_database[food]["Cals"] * qty,
-            "Protein": food_database[food]["Prot"] * qty,
-            "Carbs": food_database[food]["Carbs"] * qty,
-            "Fat": food_database[food]["Fat"] * qty
-        })
-        st.rerun()
-
-    if st.session_state.food_log:
-        st.dataframe(pd.DataFrame(st.session_state.food_log), use_container_width=True)
-        st.info(f"🍽️ **Total Calories in this list:** {int(total_intake)} kcal")
-        
-        col_undo, col_clear = st.columns(2)
-        with col_undo:
-            if st.button("Undo Last Entry ↩️", use_container_width=True):
-                st.session_state.food_log.pop()
-                st.rerun()
-        with col_clear:
-            if st.button("Clear All Food 🗑️", use_container_width=True):
-                st.session_state.food_log = []
-                st.rerun()
-
-with tab2:
-    c1, c2 = st.columns([3,1])
-    with c1:
-        ex_name = st.selectbox("Activity Type", list(exercise_database.keys()))
-    with c2:
-        ex_dur = st.selectbox("Duration (30 mins)", [0.5, 1.0, 1.5, 2.0, 2.5, 3.0], index=1)
-
-    if st.button("Add Activity ➕", use_container_width=True):
-        st.session_state.exercise_log.append({
-            "Activity": ex_name, 
-            "Duration": ex_dur * 30, 
-            "Calories Burned": exercise_database[ex_name] * ex_dur
-        })
-        st.rerun()
-        
-    if st.session_state.exercise_log:
-        st.dataframe(pd.DataFrame(st.session_state.exercise_log), use_container_width=True)
-        st.info(f"🔥 **Total Calories Burned:** {int(total_burned)} kcal")
-        
-        col_undo, col_clear = st.columns(2)
-        with col_undo:
-            if st.button("Undo Last Activity ↩️", use_container_width=True):
-                st.session_state.exercise_log.pop()
-                st.rerun()
-        with col_clear:
-            if st.button("Clear All Exercise 🗑️", use_container_width=True):
-                st.session_state.exercise_log = []
-                st.rerun()
+# --- INITIALIZE STATES ---
+# The day log belongs to (user, date): on login or when the date changes,
+# the server-side draft for that day is restored in one read.
+draft_key = (st.session_state["username"], str(entry_date))
+if st.session_state.get("draft_key") != draft_key:
+    draft = get_draft_store().load(*draft_key)
+    st.session_state.food_log = new_food_log()
+    st.session_state.food_log.extend(draft.get(FOOD, []))
+    st.session_state.exercise_log = new_exercise_log()
+    st.session_state.exercise_log.extend(draft.get(EXERCISE, []))
+    st.session_state.draft_key = draft_key
+    if draft:
+        st.toast(f"📝 Restored your unsaved log for {entry_date}.")
+
+# The day log (dashboard + food + exercise) and the history are fragments:
+# adding, undoing or clearing an item only reruns the day log, not the sidebar,
+# feedback lookup, BMI block or history read. The buttons use on_click callbacks,
+# which run before the fragment redraws, so the totals are already up to date.
+# Each change is also written to the day's draft (one small SQLite write).
+def add_entry(kind, entry):
+    st.session_state[f"{kind}_log"].append(entry)
+    get_draft_store().append(*st.session_state.draft_key, kind, entry)
+
+def add_entries(kind, entries):
+    st.session_state[f"{kind}_log"].extend(entries)
+    get_draft_store().extend(*st.session_state.draft_key, kind, entries)
+
+def undo_entry(kind):
+    if len(st.session_state[f"{kind}_log"]):
+        st.session_state[f"{kind}_log"].pop()
+        get_draft_store().pop(*st.session_state.draft_key, kind)
+
+def clear_entries(kind):
+    st.session_state[f"{kind}_log"].clear()
+    get_draft_store().clear(*st.session_state.draft_key, kind)
+
+def add_meal():
+    food, qty = st.session_state.food_choice, st.session_state.food_qty
+    add_entry(FOOD, {
+        "Meal": st.session_state.meal_type, "Food": food, "Qty": qty, 
+        "Calories": food_database[food]["Cals"] * qty,
+        "Protein": food_database[food]["Prot"] * qty,
+        "Carbs": food_database[food]["Carbs"] * qty,
+        "Fat": food_database[food]["Fat"] * qty
+    })
+
+def save_template():
+    name = st.session_state.template_name.strip()
+    if name and st.session_state.food_log:
+        get_template_store().save(st.session_state["username"], name, list(st.session_state.food_log), catalog)
+        st.session_state.template_name = ""
+
+def delete_template(name):
+    get_template_store().delete(st.session_state["username"], name)
+
+def add_activity():
+    ex_name, ex_dur = st.session_state.ex_name, st.session_state.ex_dur
+    add_entry(EXERCISE, {
+        "Activity": ex_name, 
+        "Duration": ex_dur * 30, 
+        "Calories Burned": exercise_database[ex_name] * ex_dur
+    })
+
+@st.fragment
+@profiler.timed("client.day_log_panel")
+def day_log_panel(daily_needs, protein_target, entry_date):
+    # Running totals are kept up to date by the session logs (no DataFrame needed)
+    total_intake = st.session_state.food_log.total("Calories")
+    total_burned = st.session_state.exercise_log.total("Calories Burned")
+
+    net_calories = total_intake - total_burned
+    remaining = daily_needs - net_calories
+
+    col1, col2, col3 = st.columns(3)
+    col1.metric("🍽️ Food Intake", f"{int(total_intake)} kcal")
+    col2.metric("🔥 Exercise Burn", f"-{int(total_burned)} kcal")
+    col3.metric("⚖️ Net Calories", f"{int(net_calories)} kcal", delta=f"{int(remaining)} left")
+
+    st.write("Daily Energy Progress:")
+    progress = min(max(net_calories / daily_needs, 0.0), 1.0)
+    st.progress(progress)
+
+    if remaining < 0:
+        st.error(f"⚠️ Over budget by {abs(int(remaining))} kcal!")
+    else:
+        st.info(f"✅ {int(remaining)} kcal remaining.")
+
+        with st.expander("🍱 What fits my remaining budget?"):
+            protein_gap = protein_target - st.session_state.food_log.total("Protein")
+            rank = st.radio("Rank by", list(RANKINGS), format_func=RANKINGS.get, horizontal=True, key="suggest_rank")
+            suggestions = recommender(catalog).suggest(remaining, protein_gap, rank)
+            st.caption(f"Foods within {suggestions['budget']} kcal · {max(0, int(protein_gap))} g protein still to go today")
+            if not suggestions["singles"]:
+                st.caption("Nothing in the catalog fits what's left today.")
+            else:
+                st.dataframe(pd.DataFrame(suggestions["singles"]), use_container_width=True, hide_index=True)
+                if suggestions["pairs"]:
+                    st.write("Or combine two:")
+                    st.dataframe(pd.DataFrame(suggestions["pairs"]), use_container_width=True, hide_index=True)
+
+    # --- SAVE TO CLOUD BUTTON ---
+    st.markdown("---")
+    if st.button("☁️ Save Daily Summary to Cloud", use_container_width=True):
+        if save_daily_summary(entry_date, st.session_state.food_log, st.session_state.exercise_log, net_calories):
+            st.success(f"Daily summary for {entry_date} saved! It will sync to the cloud in the background.")
+            st.balloons()
+
+    with st.expander("☁️ Sync Status"):
+        spool, _ = get_save_spool()
+        recent_saves = spool.recent(st.session_state["username"])
+        if not recent_saves:
+            st.caption("No saves yet.")
+        for _, saved_date, status, attempts, last_error, _ in recent_saves:
+            if status == "synced":
+                st.write(f"✅ {saved_date} — synced")
+            elif status == "failed":
+                st.write(f"❌ {saved_date} — failed: {last_error}")
+            else:
+                retry_note = f" (retrying after {attempts} attempt(s))" if attempts else ""
+                st.write(f"⏳ {saved_date} — pending{retry_note}")
 
-with tab3:
+    # --- TABS ---
+    st.divider()
+    tab1, tab2 = st.tabs(["🍽️ Food Log", "🏃‍♀️ Exercise Log"])
+
+    with tab1:
+        c1, c2, c3 = st.columns([2,2,1])
+        with c1:
+            st.selectbox("Meal Type", ["Breakfast", "Lunch", "Dinner", "Snack"], key="meal_type")
+        with c2:
+            # Only the top matches for what the client typed go to the browser
+            food_query = st.text_input("Search Food", placeholder="e.g. jagung, nasi, telur")
+            food_matches = food_index.search(food_query, k=FOOD_SEARCH_RESULTS)
+            food = st.selectbox("Food Item", food_matches, key="food_choice")
+            if not food_matches:
+                st.caption("No matching food found.")
+        with c3:
+            st.selectbox("Serving", [0.5, 1.0, 1.5, 2.0, 2.5, 3.0], index=1, key="food_qty")
+            
+        st.button("Add Meal ➕", use_container_width=True, disabled=food is None, on_click=add_meal)
+
+        # --- SAVED MEALS ---
+        # A saved meal adds all its items (already priced) in one click and one rerun
+        with st.expander("⭐ My Meals"):
+            templates = get_template_store().load(st.session_state["username"], catalog)
+            if templates:
+                choice = st.selectbox("Saved meal", list(templates), key="template_choice")
+                template = templates[choice]
+                items = ", ".join(f"{e['Meal']}: {e['Food']} (x{e['Qty']:g})" for e in template["entries"])
+                st.caption(f"{items} · {int(template['totals']['Calories'])} kcal · {template['totals']['Protein']:g} g protein")
+                col_add, col_delete = st.columns(2)
+                with col_add:
+                    st.button("Add Saved Meal ➕", use_container_width=True, disabled=not template["entries"],
+                              on_click=add_entries, args=(FOOD, template["entries"]))
+                with col_delete:
+                    st.button("Delete Saved Meal 🗑️", use_container_width=True, on_click=delete_template, args=(choice,))
+            else:
+                st.caption("Save the food list below as a meal to add it again in one click.")
+            st.text_input("Meal name", placeholder="e.g. My usual breakfast", key="template_name")
+            st.button("Save Food List as Meal ⭐", use_container_width=True,
+                      disabled=not st.session_state.food_log, on_click=save_template)
+
+        if st.session_state.food_log:
+            st.dataframe(st.session_state.food_log.to_frame(), use_container_width=True)
+            st.info(f"🍽️ **Total Calories in this list:** {int(total_intake)} kcal")
+            
+            col_undo, col_clear = st.columns(2)
+            with col_undo:
+                st.button("Undo Last Entry ↩️", use_container_width=True, on_click=undo_entry, args=(FOOD,))
+            with col_clear:
+                st.button("Clear All Food 🗑️", use_container_width=True, on_click=clear_entries, args=(FOOD,))
+
+    with tab2:
+        c1, c2 = st.columns([3,1])
+        with c1:
+            st.selectbox("Activity Type", list(exercise_database.keys()), key="ex_name")
+        with c2:
+            st.selectbox("Duration (30 mins)", [0.5, 1.0, 1.5, 2.0, 2.5, 3.0], index=1, key="ex_dur")
+
+        st.button("Add Activity ➕", use_container_width=True, on_click=add_activity)
+            
+        if st.session_state.exercise_log:
+            st.dataframe(st.session_state.exercise_log.to_frame(), use_container_width=True)
+            st.info(f"🔥 **Total Calories Burned:** {int(total_burned)} kcal")
+            
+            col_undo, col_clear = st.columns(2)
+            with col_undo:
+                st.button("Undo Last Activity ↩️", use_container_width=True, on_click=undo_entry, args=(EXERCISE,))
+            with col_clear:
+                st.button("Clear All Exercise 🗑️", use_container_width=True, on_click=clear_entries, args=(EXERCISE,))
+
+@st.fragment
+@profiler.timed("client.history_panel")
+def history_panel():
     st.header("📜 Your Wellness History")
+    st.button("🔄 Refresh History")  # clicking just reruns this fragment
     try:
-        sheet = get_sheet_connection("main")
-        data = sheet.get_all_records()
-        df_history = pd.DataFrame(data)
+        # Only this user's rows are downloaded (and cached per user)
+        with profiler.section("client.history_read"):
+            my_history = get_storage().read_history(st.session_state["username"])
         
-        if df_history.empty:
+        # Rolled up and downsampled here, so the browser gets a bounded payload
+        daily = daily_frame(my_history)
+        if daily.empty:
             st.info("No history found yet. Save your first entry!")
-        elif "username" in df_history.columns:
-            my_history = df_history[df_history["username"] == st.session_state["username"]]
-            if my_history.empty:
-                st.warning("No records found for your username.")
+        else:
+            first_day, last_day = daily.index.min().date(), daily.index.max().date()
+            c1, c2 = st.columns([1, 2])
+            with c1:
+                period = st.radio("View", list(PERIODS), horizontal=True, key="history_period")
+            with c2:
+                default_start = max(first_day, last_day - timedelta(days=90))
+                picked = st.date_input("Date range", (default_start, last_day), first_day, last_day, key="history_range")
+            start, end = (picked[0], picked[-1]) if isinstance(picked, (tuple, list)) and picked else (first_day, last_day)
+
+            summary = summarize(daily.loc[str(start):str(end)], period)
+            if summary.empty:
+                st.info("Nothing saved in this date range.")
             else:
-                st.dataframe(my_history.drop(columns=["username"]), use_container_width=True)
-                if not my_history.empty:
-                    st.line_chart(my_history, x="Date", y="Net_Calories")
+                value_column = "Net_Calories" if period == "Daily" else "Avg_Net_Calories"
+                chart = downsample(summary, value_column)
+                st.line_chart(chart.drop(columns=["Total_Net_Calories", "Days_Logged"], errors="ignore"))
+                if len(chart) < len(summary):
+                    st.caption(f"Chart shows {len(chart)} of {len(summary)} points (shape-preserving downsampling).")
+
+                table = daily.loc[str(start):str(end)] if period == "Daily" else summary
+                st.dataframe(table.iloc[::-1].head(TABLE_ROWS), use_container_width=True)
+                if len(table) > TABLE_ROWS:
+                    st.caption(f"Showing the latest {TABLE_ROWS} of {len(table)} rows. Narrow the date range to see older ones.")
+    except QuotaExceeded:
+        st.warning("⏳ Google Sheets is busy right now. Your history will load if you refresh in a minute.")
     except Exception as e:
         st.error(f"Could not load history: {e}")
+
+day_log_panel(daily_needs, protein_target, entry_date)
+
+st.divider()
+history_panel()
+
+if profiler.enabled:
+    profiler.record("rerun.client", (time.perf_counter() - RERUN_STARTED) * 1000)
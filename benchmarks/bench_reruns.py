@@ -0,0 +1,185 @@
+"""
+Headless rerun-latency benchmark for app.py, advanced_app.py and advancedplus.app.py.
+
+Drives each app with Streamlit's AppTest harness against an in-process fake
+Google Sheet (benchmarks/fake_gspread.py) and records, per interaction:
+wall time, peak Python memory (with --memory) and the Sheets calls made.
+The save spool's background worker is held, not started: the spool is drained
+explicitly in its own "background sync" row, so call counts don't depend on
+when the worker thread happens to run.
+
+    python benchmarks/bench_reruns.py                       # 1k and 100k rows
+    python benchmarks/bench_reruns.py --rows 1000 1000000 --memory --json bench.json
+
+Run it from the repo root. Numbers include AppTest's own overhead, so compare
+them against earlier runs of this script rather than against production.
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import streamlit as st  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+import fake_gspread  # noqa: E402
+import spool  # noqa: E402
+
+SECRETS = {
+    "passwords": {"client0001": "pw", "admin": "pw"},
+    "service_account": {"type": "service_account"},
+    "storage": {"engine": "sheets"},
+}
+TIMEOUT = 600
+HELD_WORKERS = []
+
+
+def hold_worker(worker):
+    """Stands in for SpoolWorker.start: keeps the worker so the bench flushes it itself."""
+    HELD_WORKERS.append(worker)
+
+
+spool.SpoolWorker.start = hold_worker
+
+
+class Recorder:
+    def __init__(self, app, rows, memory):
+        self.app = app
+        self.rows = rows
+        self.memory = memory
+        self.results = []
+
+    def measure(self, interaction, action):
+        fake_gspread.reset_calls()
+        if self.memory:
+            tracemalloc.start()
+        start = time.perf_counter()
+        at = action()
+        elapsed = time.perf_counter() - start
+        peak = None
+        if self.memory:
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+        if at is not None and at.exception:
+            raise RuntimeError(f"{self.app} / {interaction}: {at.exception[0].message}")
+        self.results.append({
+            "app": self.app,
+            "rows": self.rows,
+            "interaction": interaction,
+            "ms": round(elapsed * 1000, 1),
+            "peak_kb": round(peak / 1024) if peak is not None else None,
+            "sheets_calls": fake_gspread.CALLS["total"],
+            "calls": {k: v for k, v in fake_gspread.CALLS.items() if k != "total"},
+        })
+        return at
+
+
+def button(at, label):
+    return next(b for b in at.button if label in b.label)
+
+
+def drain_spool():
+    """Flushes the held save worker(s) until nothing is pending."""
+    for worker in HELD_WORKERS:
+        while worker.flush_once():
+            pass
+
+
+# --- SCENARIOS ---
+def bench_app(rec):
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=TIMEOUT)
+    rec.measure("first load", at.run)
+    rec.measure("add food", lambda: button(at, "Add to List").click().run())
+    rec.measure("undo", lambda: button(at, "Undo Last Entry").click().run())
+
+
+def bench_advanced(rec):
+    at = AppTest.from_file(os.path.join(ROOT, "advanced_app.py"), default_timeout=TIMEOUT)
+    rec.measure("first load", at.run)
+    rec.measure("add meal", lambda: button(at, "Add Meal").click().run())
+    rec.measure("clear", lambda: button(at, "Clear Food").click().run())
+
+
+def bench_advancedplus(rec):
+    at = AppTest.from_file(os.path.join(ROOT, "advancedplus.app.py"), default_timeout=TIMEOUT)
+    for key, value in SECRETS.items():
+        at.secrets[key] = value
+    at.run()
+
+    def login():
+        at.text_input(key="login_user").input("client0001")
+        at.text_input(key="login_pass").input("pw")
+        return at.button(key="login_btn").click().run()
+
+    rec.measure("login", login)
+    rec.measure("add meal", lambda: button(at, "Add Meal").click().run())
+    rec.measure("undo", lambda: button(at, "Undo Last Entry").click().run())
+    button(at, "Add Meal").click().run()
+    rec.measure("save", lambda: button(at, "Save Daily Summary").click().run())
+    rec.measure("save (background sync)", drain_spool)
+    rec.measure("open history", lambda: button(at, "Refresh History").click().run())
+
+    admin = AppTest.from_file(os.path.join(ROOT, "advancedplus.app.py"), default_timeout=TIMEOUT)
+    for key, value in SECRETS.items():
+        admin.secrets[key] = value
+    admin.run()
+
+    def admin_login():
+        admin.text_input(key="login_user").input("admin")
+        admin.text_input(key="login_pass").input("pw")
+        return admin.button(key="login_btn").click().run()
+
+    rec.measure("admin login", admin_login)
+
+
+APPS = {"app.py": bench_app, "advanced_app.py": bench_advanced, "advancedplus.app.py": bench_advancedplus}
+
+
+def run(rows_list, apps, memory):
+    results = []
+    for rows in rows_list:
+        fake_gspread.install(fake_gspread.make_spreadsheet(rows))
+        for app in apps:
+            # Fresh process-wide caches and local stores for every size
+            st.cache_resource.clear()
+            st.cache_data.clear()
+            HELD_WORKERS.clear()
+            workdir = tempfile.mkdtemp(prefix="bench-")
+            os.chdir(workdir)
+            rec = Recorder(app, rows, memory)
+            APPS[app](rec)
+            results.extend(rec.results)
+    return results
+
+
+def print_table(results):
+    print(f"{'app':<22}{'rows':>9}  {'interaction':<24}{'ms':>10}{'peak KB':>10}{'sheets':>8}")
+    for r in results:
+        peak = r["peak_kb"] if r["peak_kb"] is not None else "-"
+        print(f"{r['app']:<22}{r['rows']:>9}  {r['interaction']:<24}{r['ms']:>10}{peak:>10}{r['sheets_calls']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 100_000])
+    parser.add_argument("--apps", nargs="+", choices=list(APPS), default=list(APPS))
+    parser.add_argument("--memory", action="store_true", help="track peak memory (slower)")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    results = run(args.rows, args.apps, args.memory)
+    print_table(results)
+    if args.json:
+        with open(os.path.join(ROOT, args.json) if not os.path.isabs(args.json) else args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
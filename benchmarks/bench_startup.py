@@ -0,0 +1,150 @@
+"""
+Cold-start benchmark for advancedplus.app.py (run in CI on every push).
+
+Every sample runs in a fresh Python process, so imports and the first Sheets
+connection are really cold. Per sample we record:
+
+    streamlit_import_ms  importing Streamlit's test harness
+    login_page_ms        first script run, up to the login form
+    lazy                 whether the login page got by without loading gspread / google-auth
+    sheets_import_ms     loading gspread + google-auth (paid on the first Sheets call)
+    first_login_ms       first login on a cold server: connect + first reads (fake sheet)
+    warm_login_ms        a second session logging in on the same server
+
+    python benchmarks/bench_startup.py --repeat 5 --json startup.json
+    python benchmarks/bench_startup.py --require-lazy --max-first-login-ms 5000   # exit 1 if violated
+
+Run it from the repo root.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(ROOT, "advancedplus.app.py")
+SECRETS = {
+    "passwords": {"client0001": "pw", "admin": "pw"},
+    "service_account": {"type": "service_account"},
+    "storage": {"engine": "sheets"},
+}
+SHEETS_MODULES = ("gspread", "google.oauth2.service_account")
+METRICS = ("streamlit_import_ms", "login_page_ms", "sheets_import_ms", "first_login_ms", "warm_login_ms")
+
+
+def ms_since(start):
+    return round((time.perf_counter() - start) * 1000, 1)
+
+
+# --- ONE COLD SAMPLE (child process) ---
+def login(at):
+    at.text_input(key="login_user").input("client0001")
+    at.text_input(key="login_pass").input("pw")
+    return at.button(key="login_btn").click().run()
+
+
+def new_session():
+    from streamlit.testing.v1 import AppTest
+    at = AppTest.from_file(APP, default_timeout=600)
+    for key, value in SECRETS.items():
+        at.secrets[key] = value
+    return at
+
+
+def sample(rows):
+    os.chdir(tempfile.mkdtemp(prefix="bench-startup-"))
+    sys.path.insert(0, ROOT)
+    result = {}
+
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest  # noqa: F401
+    result["streamlit_import_ms"] = ms_since(start)
+
+    at = new_session()
+    start = time.perf_counter()
+    at.run()
+    result["login_page_ms"] = ms_since(start)
+    result["lazy"] = not any(m in sys.modules for m in SHEETS_MODULES)
+
+    start = time.perf_counter()
+    for module in SHEETS_MODULES:
+        __import__(module)
+    result["sheets_import_ms"] = ms_since(start)
+
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    import fake_gspread
+    fake_gspread.install(fake_gspread.make_spreadsheet(rows))
+
+    start = time.perf_counter()
+    login(at)
+    result["first_login_ms"] = ms_since(start)
+
+    second = new_session()
+    second.run()
+    start = time.perf_counter()
+    login(second)
+    result["warm_login_ms"] = ms_since(start)
+
+    for app_test in (at, second):
+        if app_test.exception:
+            raise RuntimeError(app_test.exception[0].message)
+    return result
+
+
+# --- DRIVER ---
+def run(repeat, rows):
+    samples = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--child", "--rows", str(rows)],
+            capture_output=True, text=True, cwd=ROOT,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f"startup sample failed:\n{proc.stderr[-4000:]}")
+        samples.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+    summary = {m: statistics.median(s[m] for s in samples) for m in METRICS}
+    summary["lazy"] = all(s["lazy"] for s in samples)
+    return summary, samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--require-lazy", action="store_true", help="fail if the login page loads gspread / google-auth")
+    parser.add_argument("--max-login-page-ms", type=float)
+    parser.add_argument("--max-first-login-ms", type=float)
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(sample(args.rows)))
+        return
+
+    summary, samples = run(args.repeat, args.rows)
+    print(f"median of {args.repeat} cold starts ({args.rows} sheet rows)")
+    for metric in METRICS:
+        print(f"  {metric:<22}{summary[metric]:>10}")
+    print(f"  {'lazy':<22}{str(summary['lazy']):>10}")
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"median": summary, "samples": samples}, f, indent=2)
+
+    failures = []
+    if args.require_lazy and not summary["lazy"]:
+        failures.append("the login page loaded gspread / google-auth")
+    if args.max_login_page_ms and summary["login_page_ms"] > args.max_login_page_ms:
+        failures.append(f"login page took {summary['login_page_ms']} ms (max {args.max_login_page_ms})")
+    if args.max_first_login_ms and summary["first_login_ms"] > args.max_first_login_ms:
+        failures.append(f"first login took {summary['first_login_ms']} ms (max {args.max_first_login_ms})")
+    if failures:
+        sys.exit("FAILED: " + "; ".join(failures))
+
+
+if __name__ == "__main__":
+    main()
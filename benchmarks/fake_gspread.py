@@ -0,0 +1,181 @@
+"""
+In-process stand-in for Google Sheets, used by the benchmarks.
+
+install() swaps gspread.authorize and the google-auth service-account
+credential loader for fakes, so the apps run unchanged against FakeSpreadsheet. Every worksheet
+call is counted in CALLS (method -> count) so a benchmark can report how many
+Sheets requests one interaction triggers.
+"""
+import random
+from collections import Counter
+from datetime import date, timedelta
+
+import gspread
+from gspread.utils import a1_to_rowcol
+
+CALLS = Counter()
+
+HEADER = ["Date", "Food", "Exercise", "Net_Calories", "username"]
+FEEDBACK_HEADER = ["username", "month", "note"]
+
+
+def _split_range(a1):
+    """"A2:E10" -> (2, 1, 10, 5); open-ended "A2:E" -> (2, 1, None, 5)."""
+    a1 = a1.split("!")[-1]
+    start, _, end = a1.partition(":")
+    r1, c1 = a1_to_rowcol(start)
+    end = end or start
+    if end[-1].isdigit():
+        r2, c2 = a1_to_rowcol(end)
+    else:
+        r2, c2 = None, a1_to_rowcol(end + "1")[1]
+    return r1, c1, r2, c2
+
+
+class FakeWorksheet:
+    def __init__(self, title, header, rows=None):
+        self.title = title
+        self.values = [list(header)] + [list(r) for r in rows or []]
+
+    def _count(self, method):
+        CALLS[method] += 1
+        CALLS["total"] += 1
+
+    # --- READS ---
+    def get_all_records(self, **kwargs):
+        self._count("get_all_records")
+        header = self.values[0]
+        return [dict(zip(header, row)) for row in self.values[1:]]
+
+    def get_all_values(self, **kwargs):
+        self._count("get_all_values")
+        return [list(row) for row in self.values]
+
+    def row_values(self, row, **kwargs):
+        self._count("row_values")
+        return list(self.values[row - 1]) if row <= len(self.values) else []
+
+    def col_values(self, col, **kwargs):
+        self._count("col_values")
+        return [row[col - 1] if col <= len(row) else "" for row in self.values]
+
+    def _range(self, a1):
+        r1, c1, r2, c2 = _split_range(a1)
+        r2 = min(r2 or len(self.values), len(self.values))
+        return [list(row[c1 - 1:c2]) for row in self.values[r1 - 1:r2]]
+
+    def get_values(self, range_name=None, **kwargs):
+        self._count("get_values")
+        return self._range(range_name) if range_name else [list(r) for r in self.values]
+
+    def batch_get(self, ranges, **kwargs):
+        self._count("batch_get")
+        return [self._range(a1) for a1 in ranges]
+
+    # --- WRITES ---
+    def _appended(self, first, count):
+        last = first + count - 1
+        return {"updates": {"updatedRange": f"{self.title}!A{first}:{chr(64 + len(self.values[0]))}{last}"}}
+
+    def append_row(self, row, **kwargs):
+        self._count("append_row")
+        self.values.append(list(row))
+        return self._appended(len(self.values), 1)
+
+    def append_rows(self, rows, **kwargs):
+        self._count("append_rows")
+        first = len(self.values) + 1
+        self.values.extend(list(r) for r in rows)
+        return self._appended(first, len(rows))
+
+    def update(self, range_name=None, values=None, **kwargs):
+        self._count("update")
+        r1, c1, _, _ = _split_range(range_name)
+        for i, row in enumerate(values or []):
+            while len(self.values) < r1 + i:
+                self.values.append([""] * len(self.values[0]))
+            target = self.values[r1 - 1 + i]
+            target[c1 - 1:c1 - 1 + len(row)] = row
+        return {}
+
+    def delete_rows(self, start_index, end_index=None, **kwargs):
+        self._count("delete_rows")
+        del self.values[start_index - 1:(end_index or start_index)]
+        return {}
+
+    def batch_update(self, data, **kwargs):
+        self._count("batch_update")
+        for item in data:
+            self.update(item["range"], item["values"])
+            CALLS["update"] -= 1  # counted once as batch_update
+            CALLS["total"] -= 1
+        return {}
+
+
+class FakeSpreadsheet:
+    def __init__(self, worksheets):
+        self.worksheets = list(worksheets)
+
+    def get_worksheet(self, index):
+        CALLS["get_worksheet"] += 1
+        return self.worksheets[index]
+
+    def worksheet(self, title):
+        CALLS["worksheet"] += 1
+        for ws in self.worksheets:
+            if ws.title == title:
+                return ws
+        raise gspread.WorksheetNotFound(title)
+
+    def add_worksheet(self, title, rows=1000, cols=26, **kwargs):
+        CALLS["add_worksheet"] += 1
+        ws = FakeWorksheet(title, [])
+        ws.values = []
+        self.worksheets.append(ws)
+        return ws
+
+
+class FakeClient:
+    def __init__(self, spreadsheet):
+        self.spreadsheet = spreadsheet
+
+    def open(self, title):
+        CALLS["open"] += 1
+        return self.spreadsheet
+
+
+# --- SYNTHETIC DATA ---
+def synthetic_log(n_rows, n_users=500, seed=0):
+    """n_rows daily summaries spread over n_users clients (strings are shared to keep memory down)."""
+    rng = random.Random(seed)
+    users = [f"client{i:04d}" for i in range(n_users)]
+    days = [str(date(2023, 1, 1) + timedelta(days=d)) for d in range(1000)]
+    foods = ["Breakfast: Roti Canai (1 piece + dhal) (x1.0), Lunch: Chicken Rice (Roasted - 1 plate) (x1.0)",
+             "Breakfast: Oats (3 tablespoons) (x2.0), Dinner: Fish (1 medium piece) (x1.0)"]
+    exercises = ["None", "Walking (Brisk) (30.0 mins)", "Yoga (60.0 mins)"]
+    return [[rng.choice(days), rng.choice(foods), rng.choice(exercises), rng.randint(800, 2500), rng.choice(users)]
+            for _ in range(n_rows)]
+
+
+def make_spreadsheet(n_rows, n_users=500, seed=0):
+    feedback = [[f"client{i:04d}", "2026-10", "Great week, keep it up!"] for i in range(0, n_users, 3)]
+    return FakeSpreadsheet([
+        FakeWorksheet("Sheet1", HEADER, synthetic_log(n_rows, n_users, seed)),
+        FakeWorksheet("feedback", FEEDBACK_HEADER, feedback),
+    ])
+
+
+def install(spreadsheet):
+    """Routes every gspread.authorize() in this process to the fake spreadsheet."""
+    from google.oauth2.service_account import Credentials
+
+    def authorize(credentials, *args, **kwargs):
+        CALLS["authorize"] += 1
+        return FakeClient(spreadsheet)
+
+    gspread.authorize = authorize
+    Credentials.from_service_account_info = classmethod(lambda cls, info, **kwargs: object())
+
+
+def reset_calls():
+    CALLS.clear()
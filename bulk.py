@@ -0,0 +1,235 @@
+"""
+Bulk export and import of client logs (admin tools).
+
+Export pages through the master log with storage.read_master_page, so only
+one chunk of rows is in memory at a time, and streams it into a CSV or
+Parquet file.
+
+Import takes item-level rows, one per food or exercise:
+
+    Date,username,Kind,Meal,Item,Qty
+    2025-03-01,amy,food,Breakfast,Roti Canai (1 piece + dhal),1
+    2025-03-01,amy,exercise,,Walking (Brisk),45      <- Qty is minutes for exercise
+
+Every row is checked against the food / exercise catalog before anything is
+written. Valid rows are grouped into one daily summary per (username, Date),
+built exactly like "Save Daily Summary", and written with
+save_daily_summaries in large batches. A day in the file replaces that day's
+saved summary (saves are upserts) and, with item rows on, its item rows.
+"""
+import csv
+import io
+import os
+import time
+from datetime import date
+
+from storage import SUMMARY_COLUMNS, format_log_to_string, log_item_day
+
+EXPORT_CHUNK = 5_000   # rows per read_master_page call
+IMPORT_BATCH = 500     # summary rows per save_daily_summaries call
+MAX_REPORTED_ERRORS = 200
+
+IMPORT_COLUMNS = ["Date", "username", "Kind", "Meal", "Item", "Qty"]
+MEALS = ("Breakfast", "Lunch", "Dinner", "Snack")
+EXPORT_FORMATS = ("csv", "parquet")
+KEEP_EXPORTS = 3       # newest export files kept in out_dir
+
+
+# --- EXPORT ---
+def iter_master_chunks(storage, chunk_rows=EXPORT_CHUNK):
+    """
+    Yields the master log as lists of records, chunk_rows row slots at a time.
+    Pages up to the log's size when the export starts; a chunk of blank
+    sheet rows comes back empty and is skipped, it doesn't end the export.
+    """
+    size = storage.master_size()
+    for offset in range(0, size, chunk_rows):
+        rows = storage.read_master_page(offset, chunk_rows)
+        if rows:
+            yield rows
+
+
+def export_csv(storage, out, chunk_rows=EXPORT_CHUNK):
+    """Writes the master log to a text file object. Returns the number of rows."""
+    writer = csv.writer(out)
+    writer.writerow(SUMMARY_COLUMNS)
+    count = 0
+    for rows in iter_master_chunks(storage, chunk_rows):
+        writer.writerows([record.get(c, "") for c in SUMMARY_COLUMNS] for record in rows)
+        count += len(rows)
+    return count
+
+
+def export_parquet(storage, path, chunk_rows=EXPORT_CHUNK):
+    """Writes the master log to a Parquet file, one row group per chunk. Returns the number of rows."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema([
+        ("Date", pa.string()), ("Food", pa.string()), ("Exercise", pa.string()),
+        ("Net_Calories", pa.float64()), ("username", pa.string()),
+    ])
+    count = 0
+    with pq.ParquetWriter(path, schema) as writer:
+        for rows in iter_master_chunks(storage, chunk_rows):
+            columns = {c: [str(r.get(c, "")) for r in rows] for c in ("Date", "Food", "Exercise", "username")}
+            columns["Net_Calories"] = [_number(r.get("Net_Calories")) for r in rows]
+            writer.write_table(pa.table(columns, schema=schema))
+            count += len(rows)
+    return count
+
+
+def export_file(storage, fmt, out_dir):
+    """
+    Exports into out_dir/master_log_<timestamp>.<fmt>. Returns (path, rows).
+    Only the newest KEEP_EXPORTS exports are kept on disk.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    os.makedirs(out_dir, exist_ok=True)
+    path = os.path.join(out_dir, f"master_log_{time.strftime('%Y%m%d-%H%M%S')}.{fmt}")
+    if fmt == "csv":
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            rows = export_csv(storage, f)
+    else:
+        rows = export_parquet(storage, path)
+    prune_exports(out_dir)
+    return path, rows
+
+
+def prune_exports(out_dir, keep=KEEP_EXPORTS):
+    """Deletes all but the newest `keep` export files in out_dir."""
+    exports = sorted(
+        (entry for entry in os.scandir(out_dir) if entry.is_file() and entry.name.startswith("master_log_")),
+        key=lambda entry: entry.stat().st_mtime, reverse=True,
+    )
+    for entry in exports[keep:]:
+        os.remove(entry.path)
+
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# --- IMPORT ---
+def import_template():
+    """A small example file for coaches to fill in."""
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(IMPORT_COLUMNS)
+    writer.writerow(["2025-03-01", "amy", "food", "Breakfast", "Oats (3 tablespoons)", 1])
+    writer.writerow(["2025-03-01", "amy", "exercise", "", "Walking (Brisk)", 30])
+    return out.getvalue()
+
+
+def _name_lookup(names, aliases=None):
+    """Case-insensitive name (or alias) -> catalog name."""
+    lookup = {name.lower(): name for name in names}
+    for name, alternatives in (aliases or {}).items():
+        for alias in alternatives:
+            lookup.setdefault(alias.lower(), name)
+    return lookup
+
+
+def parse_log_rows(reader, food_database, exercise_database, aliases=None, usernames=None):
+    """
+    reader yields dicts with IMPORT_COLUMNS keys (csv.DictReader).
+    Returns (days, errors, rows_read): days maps (username, date) -> (food_log, exercise_log),
+    errors is a list of (line number, message).
+    """
+    foods = _name_lookup(food_database, aliases)
+    exercises = _name_lookup(exercise_database)
+    days, errors, rows_read = {}, [], 0
+
+    for line, row in enumerate(reader, start=2):  # line 1 is the header
+        rows_read += 1
+        try:
+            entry_date = date.fromisoformat(str(row.get("Date") or "").strip()[:10])
+        except ValueError:
+            errors.append((line, f"bad Date {row.get('Date')!r} (use YYYY-MM-DD)"))
+            continue
+        username = str(row.get("username") or "").strip()
+        if not username or (usernames is not None and username not in usernames):
+            errors.append((line, f"unknown username {username!r}"))
+            continue
+        qty = _number(row.get("Qty"))
+        if qty is None or qty <= 0:
+            errors.append((line, f"bad Qty {row.get('Qty')!r}"))
+            continue
+        item = str(row.get("Item") or "").strip().lower()
+        kind = str(row.get("Kind") or "").strip().lower()
+        food_log, exercise_log = days.setdefault((username, entry_date), ([], []))
+
+        if kind == "food":
+            meal = str(row.get("Meal") or "").strip().title()
+            if meal not in MEALS:
+                errors.append((line, f"bad Meal {row.get('Meal')!r} (one of {', '.join(MEALS)})"))
+                continue
+            if item not in foods:
+                errors.append((line, f"unknown food {row.get('Item')!r}"))
+                continue
+            food = foods[item]
+            food_log.append({
+                "Meal": meal, "Food": food, "Qty": qty,
+                "Calories": food_database[food]["Cals"] * qty,
+                "Protein": food_database[food]["Prot"] * qty,
+                "Carbs": food_database[food]["Carbs"] * qty,
+                "Fat": food_database[food]["Fat"] * qty,
+            })
+        elif kind == "exercise":
+            if item not in exercises:
+                errors.append((line, f"unknown exercise {row.get('Item')!r}"))
+                continue
+            activity = exercises[item]
+            exercise_log.append({
+                "Activity": activity,
+                "Duration": qty,
+                "Calories Burned": exercise_database[activity] * qty / 30,  # catalog is kcal per 30 min
+            })
+        else:
+            errors.append((line, f"bad Kind {row.get('Kind')!r} (food or exercise)"))
+
+    # Days whose every row was rejected
+    days = {key: logs for key, logs in days.items() if logs[0] or logs[1]}
+    return days, errors, rows_read
+
+
+def import_logs(storage, fileobj, food_database, exercise_database, aliases=None, usernames=None,
+                with_items=False, dry_run=False, batch_size=IMPORT_BATCH):
+    """
+    fileobj is a text file with IMPORT_COLUMNS. Nothing is written if the file
+    has errors or dry_run is set. Returns a report dict.
+    """
+    reader = csv.DictReader(fileobj)
+    missing = [c for c in IMPORT_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+    days, errors, rows_read = parse_log_rows(reader, food_database, exercise_database, aliases, usernames)
+    report = {
+        "rows_read": rows_read,
+        "days": len(days),
+        "users": len({username for username, _ in days}),
+        "errors": errors[:MAX_REPORTED_ERRORS],
+        "error_count": len(errors),
+        "written": 0,
+    }
+    if errors or dry_run:
+        return report
+
+    summaries, items = [], []
+    for (username, entry_date), (food_log, exercise_log) in sorted(days.items(), key=lambda kv: (kv[0][1], kv[0][0])):
+        net = sum(i["Calories"] for i in food_log) - sum(i["Calories Burned"] for i in exercise_log)
+        summaries.append([str(entry_date), format_log_to_string(food_log, type="food"),
+                          format_log_to_string(exercise_log, type="exercise"), net, username])
+        if with_items:
+            items.append(log_item_day(entry_date, username, food_log, exercise_log))
+
+    for start in range(0, len(summaries), batch_size):
+        storage.save_daily_summaries(summaries[start:start + batch_size])
+        report["written"] += len(summaries[start:start + batch_size])
+    for start in range(0, len(items), batch_size):
+        storage.save_log_items(items[start:start + batch_size])
+    return report
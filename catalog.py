@@ -0,0 +1,273 @@
+"""
+Food & exercise catalog shared by app.py, advanced_app.py and advancedplus.app.py.
+
+The data below is turned into a FoodCatalog once per server process
+(load_catalog() is cached), so Streamlit reruns don't rebuild anything.
+Nutrients live in one NumPy matrix (row = food id, column = nutrient);
+catalog.foods still behaves like the old food_database dict:
+
+    food_database = load_catalog().foods
+    food_database["Rice (1/2 cup)"]["Cals"]   # -> 75.0
+
+A large food composition table can be imported once with catalog_import.py
+and used instead of the built-in list by pointing FOOD_CATALOG_DIR at the
+output folder; its columns are memory-mapped and only read when touched.
+"""
+import functools
+import hashlib
+import json
+import os
+from collections.abc import Mapping
+
+import numpy as np
+
+NUTRIENTS = ("Cals", "Prot", "Carbs", "Fat")
+
+# (name, Cals, Prot, Carbs, Fat) per serving
+FOODS = [
+    # --- CARBOHYDRATES (Standard: 15g CHO, 2g Prot, ~75 kcal) ---
+    ("Rice (1/2 cup)", 75, 2, 15, 0),
+    ("Whole Meal Bread (1 slice)", 75, 2, 15, 1),
+    ("Oats (3 tablespoons)", 75, 2, 15, 2),
+    ("Mee / Noodle (1/2 cup)", 75, 2, 15, 1),
+    ("Potato/ Carrot (1/2 cup)", 75, 2, 15, 0),
+    ("Corn / Jagung (1/2 cup)", 75, 2, 15, 1),
+    ("Yam / Keladi (1/2 cup)", 75, 2, 15, 0),
+    ("Cream Crackers (3 pieces)", 75, 2, 15, 2),
+    ("Plain Biscuits / Marie (3 pieces)", 75, 2, 15, 2),
+    ("Bun (1 small plain)", 75, 2, 15, 2),
+    ("Spaghetti (1/2 cup)", 75, 2, 15, 1),
+    ("Baked beans,canned/ Lentils (1/3 cup)", 75, 2, 15, 1),
+
+    # --- FRUITS (Standard: 15g CHO, 0g Prot, 60 kcal) ---
+    # Portions are estimates for 1 Serving (1 Exchange)
+    ("Apple (1 small)", 60, 0, 15, 0),
+    ("Orange (1 small)", 60, 0, 15, 0),
+    ("Pear (1/2 medium)", 60, 0, 15, 0),
+    ("Kiwi (1 large)", 60, 0, 15, 0),
+    ("Ciku (2 medium)", 60, 0, 15, 0),
+    ("Pineapple (1 slice)", 60, 0, 15, 0),
+    ("Honeydew (1 slice)", 60, 0, 15, 0),
+    ("Jackfruit / Nangka (4 pieces)", 60, 0, 15, 0),
+    ("Plum (2 medium)", 60, 0, 15, 0),
+    ("Mango (1/2 small)", 60, 0, 15, 0),
+    ("Guava (1/2 medium)", 60, 0, 15, 0),
+    ("Banana (1 small)", 60, 0, 15, 0),
+    ("Papaya (1 slice)", 60, 0, 15, 0),
+    ("Watermelon (1 slice)", 60, 0, 15, 0),
+
+    # --- 🥦 VEGETABLES (Sayur) ---
+    # Low Calorie (Soups / Ulam / Blanched)
+    ("Ulam (Cucumber/Raw Greens)", 0, 0, 0, 0),
+    ("Bayam Soup (Spinach)", 45, 0, 0, 5),
+    ("Sawi / Choy Sum (Blanched)", 0, 0, 0, 0),
+    ("Steamed Broccoli/ cauliflower", 0, 0, 0, 0),
+    ("Stir fry vegetables", 45, 0, 0, 5),
+
+    # --- PROTEINS (Standard: 7g Prot per exchange) ---
+    ("Chicken Drumstick (1 piece)", 130, 14, 0, 8),
+    ("Meat / Beef / Mutton (Lean - 2 matchbox size)", 130, 14, 0, 8),
+    ("Prawns (6 medium)", 50, 7, 0, 2),
+    ("Egg (1 whole)", 65, 7, 0, 5),
+    ("Fish (1 medium piece)", 70, 14, 0, 2),
+    ("Taukua (1 piece)", 130, 14, 0, 8),
+    ("Ikan Bilis (2 tbsp)", 65, 7, 0, 2),
+
+    # --- DAIRY / YOGURT ---
+    ("Yogurt (Natural - 1 cup)", 100, 8, 12, 2),
+    ("Low Fat Milk (1 glass)", 125, 8, 12, 5),
+    ("Full Cream Milk (1 glass)", 150, 8, 10, 9),
+    ("Skim Milk (1 glass)", 90, 8, 15, 0),
+
+    # --- FATS ---
+    ("Cooking Oil (1 tsp)", 45, 0, 0, 5),
+    ("Butter / Margarine / Mayonnaise (1 tsp)", 45, 0, 0, 5),
+    ("Peanut (20 small)", 45, 0, 0, 5),
+    ("Walnut (1 whole)", 45, 0, 0, 5),
+    ("Almond/ Cashew nut (6 whole)", 45, 0, 0, 5),
+    ("Sesame seed (1 level tablespoon)", 45, 0, 0, 5),
+    ("Coconut milk (santan) (2 level tablespoons)", 45, 0, 0, 5),
+
+    # --- LOCAL FAVORITES (MEALS) ---
+    ("Nasi Lemak (Standard Hawker)", 440, 11, 30, 25),
+    ("Chicken Rice (Roasted - 1 plate)", 600, 25, 60, 28),
+    ("Mee Goreng / Fried Mee (1 plate)", 500, 15, 60, 22),
+    ("Noodle Soup / Mee Soup (1 bowl)", 350, 15, 45, 12),
+    ("Curry Mee (1 bowl)", 550, 18, 50, 30),
+    ("Char Kuey Teow (1 plate)", 740, 15, 70, 40),
+    ("Roti Canai (1 piece + dhal)", 300, 6, 35, 15),
+    ("Tosai (1 piece)", 200, 4, 35, 4),
+    ("Sandwich (Egg Mayo - 2 slices)", 300, 10, 30, 15),
+    ("Satay (Chicken - 5 sticks)", 185, 15, 5, 12),
+
+    # --- LOCAL DRINKS ---
+    ("Teh Tarik (1 glass)", 180, 4, 25, 6),
+    ("Kopi O (Black with Sugar)", 60, 0, 15, 0),
+    ("Kopi Susu (Coffee with Milk)", 140, 3, 20, 5),
+    ("Milo (1 cup)", 150, 3, 25, 4),
+    ("Syrup Bandung (1 glass)", 150, 2, 25, 5),
+    ("Plain Water", 0, 0, 0, 0),
+]
+
+# Extra search words (mostly Malay <-> English) for names that don't already carry both
+FOOD_ALIASES = {
+    "Rice (1/2 cup)": ["Nasi"],
+    "Whole Meal Bread (1 slice)": ["Roti"],
+    "Potato/ Carrot (1/2 cup)": ["Kentang", "Lobak Merah"],
+    "Baked beans,canned/ Lentils (1/3 cup)": ["Kacang", "Dhal"],
+    "Apple (1 small)": ["Epal"],
+    "Orange (1 small)": ["Oren", "Limau"],
+    "Pineapple (1 slice)": ["Nanas"],
+    "Mango (1/2 small)": ["Mangga"],
+    "Guava (1/2 medium)": ["Jambu"],
+    "Banana (1 small)": ["Pisang"],
+    "Papaya (1 slice)": ["Betik"],
+    "Watermelon (1 slice)": ["Tembikai"],
+    "Bayam Soup (Spinach)": ["Sup"],
+    "Chicken Drumstick (1 piece)": ["Ayam"],
+    "Meat / Beef / Mutton (Lean - 2 matchbox size)": ["Daging", "Kambing"],
+    "Prawns (6 medium)": ["Udang"],
+    "Egg (1 whole)": ["Telur"],
+    "Fish (1 medium piece)": ["Ikan"],
+    "Taukua (1 piece)": ["Tofu", "Tauhu"],
+    "Ikan Bilis (2 tbsp)": ["Anchovies"],
+    "Low Fat Milk (1 glass)": ["Susu"],
+    "Full Cream Milk (1 glass)": ["Susu"],
+    "Skim Milk (1 glass)": ["Susu"],
+    "Cooking Oil (1 tsp)": ["Minyak"],
+    "Peanut (20 small)": ["Kacang Tanah"],
+    "Sesame seed (1 level tablespoon)": ["Bijan"],
+    "Chicken Rice (Roasted - 1 plate)": ["Nasi Ayam"],
+    "Noodle Soup / Mee Soup (1 bowl)": ["Mee Sup"],
+    "Curry Mee (1 bowl)": ["Kari Mee", "Curry Laksa"],
+    "Tosai (1 piece)": ["Thosai", "Dosa"],
+    "Satay (Chicken - 5 sticks)": ["Sate"],
+    "Teh Tarik (1 glass)": ["Tea"],
+    "Kopi O (Black with Sugar)": ["Coffee"],
+    "Kopi Susu (Coffee with Milk)": ["Kopi"],
+    "Plain Water": ["Air Kosong"],
+}
+
+# kcal burned per 30 minutes
+EXERCISES = [
+    # High Intensity
+    ("Zumba / Aerobics", 250),
+    ("Pound (Cardio Drumming)", 240),
+    ("Jogging", 240),
+    ("Swimming (Laps)", 230),
+    ("Badminton (Competitive)", 220),
+    ("Cycling", 200),
+
+    # Moderate Intensity
+    ("Badminton / Pickleball (Casual)", 150),
+    ("Walking (Brisk)", 130),
+    ("Gardening", 140),
+
+    # Low Intensity / Strength
+    ("Yoga", 100),
+    ("Pilates", 110),
+    ("House Chores", 90),
+]
+
+
+class FoodTable(Mapping):
+    """Read-only dict view over the nutrient matrix: name -> {"Cals": .., "Prot": .., ...}."""
+
+    def __init__(self, catalog):
+        self._catalog = catalog
+
+    def __getitem__(self, name):
+        return self._catalog.nutrients(name)
+
+    def __iter__(self):
+        return iter(self._catalog.names)
+
+    def __len__(self):
+        return len(self._catalog.names)
+
+    def __contains__(self, name):
+        return name in self._catalog.ids
+
+
+class FoodCatalog:
+    def __init__(self, names, matrix, exercises, columns=NUTRIENTS, version=None):
+        self.names = list(names)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.matrix = matrix           # shape (n_foods, n_nutrients)
+        self.columns = tuple(columns)
+        self.exercises = dict(exercises)
+        self.version = version or catalog_version(self.names, matrix)
+        self.foods = FoodTable(self)
+
+    @classmethod
+    def from_rows(cls, food_rows, exercise_rows):
+        names = [row[0] for row in food_rows]
+        matrix = np.array([row[1:] for row in food_rows], dtype=np.float64).reshape(len(names), len(NUTRIENTS))
+        return cls(names, matrix, exercise_rows)
+
+    def column(self, nutrient):
+        return self.matrix[:, self.columns.index(nutrient)]
+
+    def nutrients(self, name):
+        return dict(zip(self.columns, self.matrix[self.ids[name]].tolist()))
+
+
+class MappedFoodCatalog(FoodCatalog):
+    """
+    Catalog backed by a folder written by catalog_import.py:
+        meta.json      columns, row count, version
+        names.json     food names (row order)
+        <column>.npy   one float64 array per nutrient, opened with mmap_mode="r"
+    Columns (including micronutrients) are mapped on first use, so a page that
+    only needs calories never pages in the rest of the table.
+    """
+
+    def __init__(self, folder, exercises=EXERCISES):
+        self.folder = folder
+        with open(os.path.join(folder, "meta.json"), encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(os.path.join(folder, "names.json"), encoding="utf-8") as f:
+            self.names = json.load(f)
+        self.ids = {name: i for i, name in enumerate(self.names)}
+        self.columns = NUTRIENTS
+        self.all_columns = tuple(meta["columns"])
+        self.exercises = dict(exercises)
+        self.version = meta["version"]
+        self.foods = FoodTable(self)
+        self._mapped = {}
+        self._matrix = None
+
+    def column(self, nutrient):
+        if nutrient not in self._mapped:
+            self._mapped[nutrient] = np.load(os.path.join(self.folder, f"{nutrient}.npy"), mmap_mode="r")
+        return self._mapped[nutrient]
+
+    @property
+    def matrix(self):
+        # Only the four core nutrients; built on first use (e.g. by the recommender)
+        if self._matrix is None:
+            self._matrix = np.column_stack([self.column(c) for c in self.columns])
+        return self._matrix
+
+    def nutrients(self, name):
+        i = self.ids[name]
+        return {c: float(self.column(c)[i]) for c in self.columns}
+
+
+def catalog_version(names, matrix):
+    """Short content hash, so caches keyed on the catalog notice when the data changes."""
+    digest = hashlib.sha1("\n".join(names).encode("utf-8"))
+    digest.update(np.ascontiguousarray(matrix).tobytes())
+    return digest.hexdigest()[:12]
+
+
+@functools.lru_cache(maxsize=None)
+def load_catalog(folder=None):
+    """
+    The process-wide catalog (built on first call, then reused).
+    Uses an imported table from `folder` / $FOOD_CATALOG_DIR if set, else the built-in list.
+    """
+    folder = folder or os.environ.get("FOOD_CATALOG_DIR")
+    if folder:
+        return MappedFoodCatalog(folder)
+    return FoodCatalog.from_rows(FOODS, EXERCISES)
@@ -0,0 +1,123 @@
+"""
+One-off importer: food composition CSV -> memory-mappable catalog folder.
+
+    python catalog_import.py foods.csv local_data/food_catalog \
+        --name-column "Food Name" \
+        --map Cals=energy_kcal --map Prot=protein_g --map Carbs=carbohydrate_g --map Fat=fat_g \
+        --with-builtin
+
+Every other numeric column (vitamins, minerals, ...) is kept as well. The CSV
+is streamed in chunks and written straight into .npy memmaps, so importing
+tens of thousands of rows never needs the whole table in memory. Then run
+the app with FOOD_CATALOG_DIR=local_data/food_catalog.
+"""
+import argparse
+import hashlib
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from catalog import FOODS, NUTRIENTS
+
+CHUNK_ROWS = 10_000
+
+
+def safe_column_name(name):
+    return "".join(ch if ch.isalnum() or ch in "_-" else "_" for ch in str(name)).strip("_")
+
+
+def import_csv(csv_path, out_dir, name_column, nutrient_map, with_builtin=False, chunk_rows=CHUNK_ROWS):
+    """
+    nutrient_map maps our core nutrients to CSV columns, e.g. {"Cals": "energy_kcal", ...}.
+    Returns the catalog version written to meta.json.
+    """
+    missing = [n for n in NUTRIENTS if n not in nutrient_map]
+    if missing:
+        raise ValueError(f"No CSV column given for: {', '.join(missing)}")
+
+    # --- PASS 1: names + which extra columns are numeric ---
+    names, seen = [], set()
+    if with_builtin:
+        for row in FOODS:
+            names.append(row[0])
+            seen.add(row[0])
+    extra_columns = None
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+        if extra_columns is None:
+            core = set(nutrient_map.values()) | {name_column}
+            extra_columns = [c for c in chunk.columns if c not in core]
+        numeric = chunk[extra_columns].apply(pd.to_numeric, errors="coerce")
+        extra_columns = [c for c in extra_columns if numeric[c].notna().any() or chunk[c].isna().all()]
+        for name in chunk[name_column].astype(str).str.strip():
+            if name in seen:  # first occurrence wins, like a dict literal would
+                name = None
+            else:
+                seen.add(name)
+            names.append(name)
+
+    # --- PASS 2: stream values into the memmaps ---
+    os.makedirs(out_dir, exist_ok=True)
+    keep = [n is not None for n in names]
+    total = sum(keep)
+    out_columns = list(NUTRIENTS) + [safe_column_name(c) for c in extra_columns]
+    source = {**nutrient_map, **{safe_column_name(c): c for c in extra_columns}}
+    arrays = {
+        c: np.lib.format.open_memmap(os.path.join(out_dir, f"{c}.npy"), mode="w+", dtype=np.float64, shape=(total,))
+        for c in out_columns
+    }
+
+    pos = 0
+    if with_builtin:
+        builtin = np.array([row[1:] for row in FOODS], dtype=np.float64)
+        for j, c in enumerate(NUTRIENTS):
+            arrays[c][:len(FOODS)] = builtin[:, j]
+        for c in out_columns[len(NUTRIENTS):]:
+            arrays[c][:len(FOODS)] = np.nan
+        pos = len(FOODS)
+
+    row_cursor = len(FOODS) if with_builtin else 0
+    for chunk in pd.read_csv(csv_path, chunksize=chunk_rows):
+        mask = np.array(keep[row_cursor:row_cursor + len(chunk)])
+        row_cursor += len(chunk)
+        chunk = chunk[mask]
+        for c in out_columns:
+            values = pd.to_numeric(chunk[source[c]], errors="coerce").to_numpy(dtype=np.float64)
+            if c in NUTRIENTS:
+                values = np.nan_to_num(values)  # core nutrients must be usable in sums
+            arrays[c][pos:pos + len(chunk)] = values
+        pos += len(chunk)
+
+    digest = hashlib.sha1()
+    for c in out_columns:
+        arrays[c].flush()
+        digest.update(np.asarray(arrays[c]).tobytes())
+    kept_names = [n for n in names if n is not None]
+    digest.update("\n".join(kept_names).encode("utf-8"))
+    version = digest.hexdigest()[:12]
+
+    with open(os.path.join(out_dir, "names.json"), "w", encoding="utf-8") as f:
+        json.dump(kept_names, f, ensure_ascii=False)
+    with open(os.path.join(out_dir, "meta.json"), "w", encoding="utf-8") as f:
+        json.dump({"columns": out_columns, "rows": total, "version": version, "source": os.path.basename(csv_path)}, f)
+    return version
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import a food composition CSV as a memory-mapped catalog.")
+    parser.add_argument("csv_path")
+    parser.add_argument("out_dir")
+    parser.add_argument("--name-column", default="name")
+    parser.add_argument("--map", action="append", default=[], metavar="NUTRIENT=COLUMN",
+                        help="e.g. Cals=energy_kcal (needed for Cals, Prot, Carbs and Fat)")
+    parser.add_argument("--with-builtin", action="store_true", help="keep the built-in Malaysian exchange list too")
+    args = parser.parse_args()
+
+    nutrient_map = dict(item.split("=", 1) for item in args.map)
+    version = import_csv(args.csv_path, args.out_dir, args.name_column, nutrient_map, args.with_builtin)
+    print(f"Catalog written to {args.out_dir} (version {version})")
+
+
+if __name__ == "__main__":
+    main()
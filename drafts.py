@@ -0,0 +1,101 @@
+"""
+Server-side drafts of in-progress day logs.
+
+Every add / undo / clear on the food or exercise log is mirrored into a local
+SQLite table keyed by (username, entry_date, kind, seq), one small write per
+change. When a user logs in again (new browser tab, dropped connection, after
+Log Out) or switches the entry date, their draft for that day comes back with
+a single primary-key range read.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+FOOD = "food"
+EXERCISE = "exercise"
+
+
+class DraftStore:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._db() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS draft_entries (
+                    username TEXT NOT NULL,
+                    entry_date TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    seq INTEGER NOT NULL,
+                    entry_json TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (username, entry_date, kind, seq)
+                ) WITHOUT ROWID
+            """)
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            self._local.db = db
+        return db
+
+    def append(self, username, entry_date, kind, entry):
+        with self._db() as db:
+            db.execute(
+                "INSERT INTO draft_entries (username, entry_date, kind, seq, entry_json, updated_at) "
+                "SELECT ?, ?, ?, COALESCE(MAX(seq), 0) + 1, ?, ? FROM draft_entries "
+                "WHERE username = ? AND entry_date = ? AND kind = ?",
+                (username, str(entry_date), kind, json.dumps(entry), time.time(),
+                 username, str(entry_date), kind),
+            )
+
+    def extend(self, username, entry_date, kind, entries):
+        """Appends several entries in one transaction (e.g. a saved meal)."""
+        with self._db() as db:
+            last = db.execute(
+                "SELECT COALESCE(MAX(seq), 0) FROM draft_entries WHERE username = ? AND entry_date = ? AND kind = ?",
+                (username, str(entry_date), kind),
+            ).fetchone()[0]
+            now = time.time()
+            db.executemany(
+                "INSERT INTO draft_entries (username, entry_date, kind, seq, entry_json, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [(username, str(entry_date), kind, last + i, json.dumps(entry), now)
+                 for i, entry in enumerate(entries, start=1)],
+            )
+
+    def pop(self, username, entry_date, kind):
+        """Drops the newest entry of one kind (Undo)."""
+        with self._db() as db:
+            db.execute(
+                "DELETE FROM draft_entries WHERE username = ? AND entry_date = ? AND kind = ? AND seq = "
+                "(SELECT MAX(seq) FROM draft_entries WHERE username = ? AND entry_date = ? AND kind = ?)",
+                (username, str(entry_date), kind, username, str(entry_date), kind),
+            )
+
+    def clear(self, username, entry_date, kind=None):
+        """Drops one kind of entries for the day, or the whole day's draft."""
+        with self._db() as db:
+            if kind is None:
+                db.execute("DELETE FROM draft_entries WHERE username = ? AND entry_date = ?",
+                           (username, str(entry_date)))
+            else:
+                db.execute("DELETE FROM draft_entries WHERE username = ? AND entry_date = ? AND kind = ?",
+                           (username, str(entry_date), kind))
+
+    def load(self, username, entry_date):
+        """{kind: [entry, ...]} in the order they were added."""
+        with self._db() as db:
+            rows = db.execute(
+                "SELECT kind, entry_json FROM draft_entries WHERE username = ? AND entry_date = ? "
+                "ORDER BY kind, seq",
+                (username, str(entry_date)),
+            ).fetchall()
+        draft = {}
+        for kind, entry_json in rows:
+            draft.setdefault(kind, []).append(json.loads(entry_json))
+        return draft
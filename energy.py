@@ -0,0 +1,83 @@
+"""
+Energy-needs engine (no Streamlit in here).
+
+    assess(160, 70, "Sedentary (x25)")          -> one client
+    assess_batch(heights, weights, activities)  -> whole cohort, vectorized
+
+Rules (same for every app):
+  * BMI with Asian-Pacific cutoffs: <18.5 Underweight, <23 Normal,
+    <25 Overweight, otherwise Obese
+  * Obese clients use Adjusted Body Weight: ideal (BMI 22) + 25% of the excess
+  * Daily needs = weight used x 25 (Sedentary) or x 30 (Active)
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+BMI_CUTOFFS = [18.5, 23, 25]
+STATUSES = ["Underweight", "Normal", "Overweight", "Obese"]
+INCOMPLETE = "Incomplete"  # assess_batch: profile without a usable height / weight
+IDEAL_BMI = 22
+ADJUSTED_FRACTION = 0.25
+SEDENTARY_FACTOR = 25
+ACTIVE_FACTOR = 30
+
+EnergyAssessment = namedtuple("EnergyAssessment", ["bmi", "status", "calc_weight", "adjusted", "daily_needs"])
+
+
+def activity_factor(activity):
+    """"Sedentary (x25)" -> 25, anything else (e.g. "Active (x30)") -> 30."""
+    return SEDENTARY_FACTOR if "Sedentary" in str(activity) else ACTIVE_FACTOR
+
+
+def assess(height_cm, weight_kg, activity):
+    height_m = height_cm / 100
+    bmi = weight_kg / (height_m ** 2)
+    status = STATUSES[int(np.searchsorted(BMI_CUTOFFS, bmi, side="right"))]
+
+    adjusted = status == "Obese"
+    if adjusted:
+        ideal_weight = IDEAL_BMI * (height_m ** 2)
+        calc_weight = ideal_weight + ADJUSTED_FRACTION * (weight_kg - ideal_weight)
+    else:
+        calc_weight = weight_kg
+
+    return EnergyAssessment(bmi, status, calc_weight, adjusted, calc_weight * activity_factor(activity))
+
+
+def _numbers(values):
+    """Any sequence -> float array; cells that aren't numbers become NaN."""
+    return pd.to_numeric(pd.Series(np.asarray(values, dtype=object)), errors="coerce").to_numpy(dtype=np.float64)
+
+
+def assess_batch(height_cm, weight_kg, activity):
+    """
+    Array / Series inputs of equal length -> DataFrame with
+    bmi, status, calc_weight, adjusted, daily_needs (one row per client).
+    Blank, non-numeric or non-positive height / weight cells (common in a
+    hand-kept profiles tab) give status "Incomplete" and NaN numbers.
+    """
+    height_m = _numbers(height_cm) / 100
+    weight_kg = _numbers(weight_kg)
+    complete = (height_m > 0) & (weight_kg > 0)
+    height_m = np.where(complete, height_m, np.nan)
+    weight_kg = np.where(complete, weight_kg, np.nan)
+    bmi = weight_kg / height_m ** 2
+
+    status_idx = np.where(complete, np.searchsorted(BMI_CUTOFFS, np.nan_to_num(bmi), side="right"), len(STATUSES))
+    adjusted = status_idx == len(STATUSES) - 1
+    ideal_weight = IDEAL_BMI * height_m ** 2
+    calc_weight = np.where(adjusted, ideal_weight + ADJUSTED_FRACTION * (weight_kg - ideal_weight), weight_kg)
+
+    sedentary = pd.Series(np.asarray(activity, dtype=object)).astype(str).str.contains("Sedentary").to_numpy()
+    factor = np.where(sedentary, SEDENTARY_FACTOR, ACTIVE_FACTOR)
+
+    index = height_cm.index if isinstance(height_cm, pd.Series) else None
+    return pd.DataFrame({
+        "bmi": bmi,
+        "status": np.array(STATUSES + [INCOMPLETE], dtype=object)[status_idx],
+        "calc_weight": calc_weight,
+        "adjusted": adjusted,
+        "daily_needs": calc_weight * factor,
+    }, index=index)
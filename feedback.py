@@ -0,0 +1,124 @@
+"""
+Coach feedback lookups.
+
+FeedbackIndex keeps {username: latest note} in memory for the whole process
+and re-reads the feedback store at most once per FEEDBACK_TTL seconds, so
+showing a client's note on a rerun is a dict lookup. If a refresh fails we
+keep serving the last good index and count the failure in stats() instead
+of hiding it. With a shared cache (shared_cache.py) the feedback rows are
+read from the store once per TTL for all app processes, not once per process,
+and notes published from one process show up in the others on their next
+lookup.
+"""
+import threading
+import time
+
+from shared_cache import NullCache
+
+FEEDBACK_TTL = 120  # seconds
+
+
+class FeedbackIndex:
+    def __init__(self, storage, ttl=FEEDBACK_TTL, shared=None):
+        self.storage = storage
+        self.ttl = ttl
+        self.shared = shared or NullCache()
+        self._latest = {}
+        self._fingerprint = None
+        self._loaded_at = None
+        self._lock = threading.Lock()
+        self._seen = self.shared.last_seq()  # shared events already replayed
+
+        # --- STATS ---
+        self.refreshes = 0
+        self.changes = 0
+        self.errors = 0
+        self.last_error = None
+        self.last_error_at = None
+        self.lookups = 0
+        self.published = 0
+
+    def _build(self, records):
+        latest = {}
+        for record in records:  # later rows win, same as iloc[-1] on the sheet
+            username = record.get("username")
+            if username:
+                latest[username] = {"month": record.get("month", ""), "note": record.get("note", "")}
+        return latest
+
+    def refresh(self, force=False):
+        with self._lock:
+            fresh = self._loaded_at is not None and time.monotonic() - self._loaded_at < self.ttl
+            if fresh and not force:
+                return
+            try:
+                records = self.shared.get_or_load("feedback", self.ttl, self.storage.read_feedback)
+            except Exception as e:
+                self.errors += 1
+                self.last_error = str(e)
+                self.last_error_at = time.time()
+                # Try again on the next TTL instead of on every rerun
+                self._loaded_at = time.monotonic()
+                return
+            self.refreshes += 1
+            # Change detection: only rebuild when the feedback rows actually changed
+            fingerprint = hash(tuple((r.get("username"), r.get("month"), r.get("note")) for r in records))
+            if fingerprint != self._fingerprint:
+                self._latest = self._build(records)
+                self._fingerprint = fingerprint
+                self.changes += 1
+            self._loaded_at = time.monotonic()
+
+    def _sync(self):
+        """Applies notes other app processes published since the last call."""
+        last = self.shared.last_seq()
+        if last == self._seen:
+            return
+        events = self.shared.events("feedback", self._seen, upto=last, skip_own=True)
+        self._seen = last
+        with self._lock:
+            if events is None:  # fell too far behind: re-read the store
+                self._loaded_at = None
+                return
+            for _, event in events:
+                self._apply(event["notes"])
+
+    def _apply(self, notes):
+        for username, month, note in notes:
+            self._latest[username] = {"month": month, "note": note}
+        self._fingerprint = None  # next refresh rebuilds from the store
+
+    def latest(self, username):
+        """{"month": ..., "note": ...} or None."""
+        self._sync()
+        self.refresh()
+        self.lookups += 1
+        return self._latest.get(username)
+
+    def publish(self, notes):
+        """
+        Writes [username, month, note] rows to the store in one call and makes
+        them visible right away, here and in the other app processes.
+        Returns the number of notes written.
+        """
+        notes = [[username, month, note] for username, month, note in notes]
+        if not notes:
+            return 0
+        self.storage.save_feedback(notes)
+        with self._lock:
+            self._apply(notes)
+            self.shared.delete("feedback")
+        self.shared.publish("feedback", {"notes": notes})
+        self.published += len(notes)
+        return len(notes)
+
+    def stats(self):
+        return {
+            "users_with_notes": len(self._latest),
+            "lookups": self.lookups,
+            "published": self.published,
+            "refreshes": self.refreshes,
+            "changes": self.changes,
+            "errors": self.errors,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,115 @@
+"""
+Type-ahead food search.
+
+FoodSearchIndex is built once per catalog (search_index() is cached) and
+answers a query with the top-k food names, so the picker only ever sends a
+handful of options to the browser instead of the whole catalog.
+
+Two signals are combined:
+  * word-prefix matches ("jag" -> "Corn / Jagung (1/2 cup)"), via a sorted
+    token list + bisect, and
+  * trigram overlap for typos ("jaggung", "chiken"), via an inverted index
+    whose posting lists are NumPy arrays, counted with one bincount.
+
+1- and 2-character queries (the first keystrokes, matching the most foods)
+are answered from a table of their top SHORT_K results, filled on first use
+or all at once by warm().
+
+Names already carry most English/Malay pairs ("Corn / Jagung"); FOOD_ALIASES
+in catalog.py adds the rest.
+"""
+import bisect
+import functools
+import re
+
+import numpy as np
+
+from catalog import FOOD_ALIASES
+
+PREFIX_WEIGHT = 2.0
+SHORT_QUERY = 2   # queries up to this many characters come from the precomputed table
+SHORT_K = 50      # results kept per short query
+
+
+def normalize(text):
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FoodSearchIndex:
+    def __init__(self, names, aliases=None):
+        aliases = aliases or {}
+        self.names = list(names)
+        self._name_lengths = np.array([len(name) for name in self.names])
+
+        # --- WORD PREFIX INDEX ---
+        tokens = []
+        searchable = []
+        for food_id, name in enumerate(self.names):
+            text = normalize(" ".join([name, *aliases.get(name, [])]))
+            searchable.append(text)
+            tokens.extend((token, food_id) for token in set(text.split()))
+        tokens.sort()
+        self._tokens = [token for token, _ in tokens]
+        self._token_ids = np.array([food_id for _, food_id in tokens], dtype=np.int32)
+
+        # --- TRIGRAM INDEX ---
+        postings = {}
+        for food_id, text in enumerate(searchable):
+            for gram in trigrams(text):
+                postings.setdefault(gram, []).append(food_id)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._short = {}  # short query -> top SHORT_K names
+
+    def __len__(self):
+        return len(self.names)
+
+    def _prefix_ids(self, token):
+        start = bisect.bisect_left(self._tokens, token)
+        end = bisect.bisect_left(self._tokens, token + "\uffff", lo=start)
+        return self._token_ids[start:end]
+
+    def warm(self):
+        """Fills the short-query table for every 1-2 character prefix of a token (~1s for 50k foods)."""
+        for prefix in sorted({token[:n] for token in self._tokens for n in range(1, SHORT_QUERY + 1)}):
+            self.search(prefix)
+
+    def search(self, query, k=20):
+        """Top-k food names for the query (the first k names if the query is empty)."""
+        query = normalize(query)
+        if not query:
+            return self.names[:k]
+        if len(query) <= SHORT_QUERY and k <= SHORT_K:
+            hit = self._short.get(query)
+            if hit is None:
+                hit = self._short[query] = self._search(query, SHORT_K)
+            return hit[:k]
+        return self._search(query, k)
+
+    def _search(self, query, k):
+        scores = np.zeros(len(self.names), dtype=np.float32)
+        for token in query.split():
+            scores[self._prefix_ids(token)] += PREFIX_WEIGHT  # a repeated id is only added once
+
+        grams = trigrams(query)
+        hits = [self._postings[g] for g in grams if g in self._postings]
+        if hits:
+            scores += np.bincount(np.concatenate(hits), minlength=len(self.names)) / len(grams)
+
+        # Weak trigram-only matches are noise
+        candidates = np.flatnonzero(scores >= 0.35)
+        if len(candidates) > k:
+            candidates = candidates[np.argpartition(-scores[candidates], k - 1)[:k]]
+        # Best score first, shorter (more specific) names break ties
+        order = np.lexsort((self._name_lengths[candidates], -scores[candidates]))
+        return [self.names[i] for i in candidates[order]]
+
+
+@functools.lru_cache(maxsize=4)
+def search_index(catalog):
+    """The process-wide index for a catalog (rebuilt only if the catalog object changes)."""
+    return FoodSearchIndex(catalog.names, FOOD_ALIASES)
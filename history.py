@@ -0,0 +1,303 @@
+"""
+Per-user history reads for the main log tab.
+
+Instead of get_all_records() on the whole sheet, we keep a small index of
+username -> row numbers (built from the username and Date columns only) and
+fetch just that user's rows with one batch_get of contiguous ranges. Results
+are cached per user for HISTORY_TTL seconds and dropped as soon as that user
+saves. The same index maps (username, date) -> row, so a save for a day that
+already has a row can overwrite it in place.
+
+With a shared cache (shared_cache.py) fetched rows are shared between app
+processes, and index changes made here are published so other processes
+replay them instead of rebuilding their index from the sheet.
+"""
+import re
+import threading
+import time
+
+from shared_cache import NullCache
+from sheets import rowcol_to_a1
+
+HISTORY_TTL = 300   # seconds a user's rows stay cached
+INDEX_TTL = 600     # seconds before the username index is rebuilt from the sheet
+
+
+def row_runs(rows):
+    """[2, 3, 4, 9, 10] -> [(2, 4), (9, 10)]"""
+    runs = []
+    for r in sorted(rows):
+        if runs and r == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], r)
+        else:
+            runs.append((r, r))
+    return runs
+
+
+def column_range(col, first_row=2):
+    """col 5 -> "E2:E" (open-ended, to the last used row)"""
+    a1 = rowcol_to_a1(first_row, col)
+    return f"{a1}:{re.sub(r'[0-9]', '', a1)}"
+
+
+def appended_first_row(response):
+    """Row number of the first row written by append_row/append_rows, or None."""
+    try:
+        updated = response["updates"]["updatedRange"]   # e.g. "Sheet1!A12:E13"
+    except (KeyError, TypeError):
+        return None
+    match = re.search(r"![A-Z]+(\d+)", updated)
+    return int(match.group(1)) if match else None
+
+
+class HistoryStore:
+    def __init__(self, conn, tab=0, user_column="username", date_column="Date", ttl=HISTORY_TTL, index_ttl=INDEX_TTL,
+                 shared=None):
+        self.conn = conn
+        self.tab = tab
+        self.user_column = user_column
+        self.date_column = date_column
+        self.ttl = ttl
+        self.index_ttl = index_ttl
+        self.shared = shared or NullCache()
+        self.channel = f"history:{tab}"
+
+        self._lock = threading.RLock()        # guards the state below; never held during a Sheets call
+        self._build_lock = threading.Lock()   # one index build at a time
+        self._building = None     # appends seen while an index build is reading the sheet
+        self._drops = {}          # username -> times their cached rows were dropped
+        self._epoch = 0           # times every cached user was dropped
+        self._header = None
+        self._index = None        # username -> [row numbers]
+        self._days = {}           # (username, date) -> row number of that day's latest row
+        self._row_days = {}       # row number -> Date it held when indexed
+        self._last_row = 1        # last used row (1 = header only)
+        self._index_built_at = 0.0
+        self._cache = {}          # username -> (fetched_at, records)
+        self._seen = self.shared.last_seq()  # shared events already replayed
+
+    # --- INDEX ---
+    def _read_index(self):
+        header = self.conn.call(self.tab, "row_values", 1)
+        user_col = header.index(self.user_column) + 1
+        date_col = header.index(self.date_column) + 1
+        days, names = self.conn.call(self.tab, "batch_get", [column_range(date_col), column_range(user_col)])
+
+        index = {}
+        day_rows = {}
+        row_days = {}
+        for offset, name in enumerate(names):
+            name = name[0] if name else ""
+            if not name:
+                continue
+            row_number = offset + 2
+            index.setdefault(name, []).append(row_number)
+            day = days[offset][0] if offset < len(days) and days[offset] else ""
+            if day:
+                day_rows[(name, str(day))] = row_number  # later duplicates win
+                row_days[row_number] = str(day)
+
+        return header, index, day_rows, row_days, max(len(names), len(days)) + 1
+
+    def _index_fresh(self):
+        return self._index is not None and time.monotonic() - self._index_built_at <= self.index_ttl
+
+    def _ensure_index(self):
+        """
+        Builds the index if it is missing or old. The sheet is read without
+        holding self._lock, so other users' reads and the spool worker's
+        row_for() don't queue behind it; appends noted meanwhile are replayed
+        onto the new index, and a reset meanwhile throws the build away.
+        """
+        with self._lock:
+            if self._index_fresh():
+                return
+        with self._build_lock:
+            with self._lock:
+                if self._index_fresh():
+                    return
+                building = self._building = []
+            header, index, day_rows, row_days, last_row = self._read_index()
+            with self._lock:
+                if self._building is building:
+                    self._header, self._index, self._days, self._row_days = header, index, day_rows, row_days
+                    self._last_row = last_row
+                    self._index_built_at = time.monotonic()
+                    for append in building:
+                        self._record_append(*append)
+                self._building = None
+
+    def _indexed(self, read):
+        """Runs read() under the lock once there is an index (it can be reset while we build it)."""
+        while True:
+            self._ensure_index()
+            with self._lock:
+                if self._index is not None:
+                    return read()
+
+    def _note_append(self, username, start, count, day):
+        if self._building is not None:
+            self._building.append((username, start, count, day))
+        if self._index is not None:
+            self._record_append(username, start, count, day)
+
+    def _record_append(self, username, start, count, day):
+        rows = self._index.setdefault(username, [])
+        for row in range(start, start + count):
+            if row not in rows:  # the same append can arrive twice (own write + replayed event)
+                rows.append(row)
+        self._last_row = max(self._last_row, start + count - 1)
+        if day is not None and count == 1:
+            self._days[(username, str(day))] = start
+            self._row_days[start] = str(day)
+
+    def _key(self, username):
+        return f"history:{self.tab}:{username}"
+
+    # --- SHARED EVENTS ---
+    def _sync(self):
+        """Replays index changes published by other app processes since the last call."""
+        last = self.shared.last_seq()
+        events = self.shared.events(self.channel, self._seen, upto=last, skip_own=True)
+        self._seen = last
+        if events is None:  # we fell too far behind: start from the sheet again
+            self._reset_local()
+            return
+        for _, event in events:
+            if event["op"] == "append":
+                self._note_append(event["username"], event["first_row"], event["count"], event["day"])
+                self._drop(event["username"])
+            elif event["op"] == "invalidate":
+                self._drop(event["username"])
+            elif event["op"] == "reset":
+                self._reset_local()
+
+    def _touched_since(self, seq, username):
+        events = self.shared.events(self.channel, seq, skip_own=True)
+        return events is None or any(e.get("username") in (username, None) for _, e in events)
+
+    # --- READS ---
+    def _fetch_rows(self, header, rows):
+        """[(row number, record)]; a row the sheet no longer has comes back as (row, None)."""
+        if not rows:
+            return []
+        width = len(header)
+        runs = row_runs(rows)
+        ranges = [f"{rowcol_to_a1(a, 1)}:{rowcol_to_a1(b, width)}" for a, b in runs]
+        blocks = self.conn.call(self.tab, "batch_get", ranges, value_render_option="UNFORMATTED_VALUE",
+                                date_time_render_option="FORMATTED_STRING", stale_ok=True)
+
+        fetched = []
+        for (first, last), block in zip(runs, blocks):
+            for row in range(first, last + 1):
+                if row - first >= len(block):  # Sheets trims blank rows at the end
+                    fetched.append((row, None))
+                    continue
+                values = list(block[row - first]) + [""] * (width - len(block[row - first]))
+                fetched.append((row, dict(zip(header, values))))
+        return fetched
+
+    def _owned(self, username, day, record):
+        """True if the fetched row still is this user's row (and holds the day the index has for it)."""
+        if record is None or str(record.get(self.user_column, "")) != username:
+            return False
+        return day is None or str(record.get(self.date_column, "")) == day
+
+    def _read_user(self, username):
+        """
+        Fetches this user's rows through the index. If any row is not theirs any
+        more (rows deleted by hand, or compacted by another process) the index is
+        rebuilt and the rows fetched again; rows of other users are never returned.
+        """
+        for attempt in range(2):
+            header, rows, row_days = self._indexed(
+                lambda: (self._header, list(self._index.get(username, [])), self._row_days))
+            fetched = self._fetch_rows(header, rows)
+            if all(self._owned(username, row_days.get(row), record) for row, record in fetched):
+                break
+            if not attempt:
+                self.reset()
+        return [record for _, record in fetched if self._owned(username, None, record)]
+
+    def get(self, username):
+        """Returns this user's rows as a list of dicts (same shape as get_all_records)."""
+        with self._lock:
+            self._sync()
+            hit = self._cache.get(username)
+            if hit and time.monotonic() - hit[0] < self.ttl:
+                return hit[1]
+            version = (self._epoch, self._drops.get(username, 0))
+
+        records = self.shared.get(self._key(username))
+        if records is None:
+            before = self.shared.last_seq()
+            records = self._read_user(username)
+            # Don't share rows another process changed while we were reading them
+            if not self._touched_since(before, username):
+                self.shared.set(self._key(username), records, self.ttl)
+        with self._lock:
+            # ...nor keep rows a save here dropped while we were reading them
+            if version == (self._epoch, self._drops.get(username, 0)):
+                self._cache[username] = (time.monotonic(), records)
+        return records
+
+    def row_for(self, username, day):
+        """Sheet row holding this user's summary for `day`, or None if there is none yet."""
+        with self._lock:
+            self._sync()
+        return self._indexed(lambda: self._days.get((username, str(day))))
+
+    # --- WRITES ---
+    def note_append(self, username, count=1, first_row=None, day=None):
+        """
+        Call after appending rows for a user so the index stays correct without a rebuild.
+        first_row comes from the append response; if it is missing we assume the rows
+        landed right after the last row we know about. day is the Date of a single row.
+        """
+        with self._lock:
+            self._sync()
+            if self._index is not None:
+                first_row = first_row or self._last_row + 1
+            if first_row:
+                self._note_append(username, first_row, count, day)
+            else:
+                self._building = None  # an index build in progress can't place these rows: it starts over
+            self._drop(username)
+            self.shared.delete(self._key(username))
+            if first_row:
+                self.shared.publish(self.channel, {"op": "append", "username": username, "first_row": first_row,
+                                                   "count": count, "day": None if day is None else str(day)})
+            else:
+                self.shared.publish(self.channel, {"op": "invalidate", "username": username})
+
+    def _drop(self, username):
+        """Forgets the cached rows of one user (None = everyone)."""
+        if username is None:
+            self._cache.clear()
+            self._epoch += 1
+        else:
+            self._cache.pop(username, None)
+            self._drops[username] = self._drops.get(username, 0) + 1
+
+    def _reset_local(self):
+        self._index = None
+        self._days = {}
+        self._row_days = {}
+        self._building = None
+        self._drop(None)
+
+    def reset(self):
+        """Forgets the index and every cached user (after rows were moved or deleted), in every process."""
+        with self._lock:
+            self._reset_local()
+            self.shared.publish(self.channel, {"op": "reset"})
+
+    def invalidate(self, username=None):
+        with self._lock:
+            self._drop(username)
+            if username is None:
+                self.shared.delete_prefix(self._key(""))
+                self.shared.publish(self.channel, {"op": "invalidate", "username": None})
+            else:
+                self.shared.delete(self._key(username))
+                self.shared.publish(self.channel, {"op": "invalidate", "username": username})
@@ -0,0 +1,146 @@
+"""
+Opt-in rerun profiling for the Ops panel.
+
+Turn it on in .streamlit/secrets.toml:
+
+    [ops]
+    profiling = true
+
+The app wraps the interesting parts in profiler.section("..."), and the shared
+SheetsConnection reports every API call (method, time, response size estimated
+from its shape) through on_sheets_call(). Each call is attributed to the
+session + user whose rerun made it, looked up when the call is recorded, so
+fragment reruns (which run on their own thread) count for their session too.
+Timings are kept in rolling windows so p50/p95/p99 reflect recent traffic.
+"""
+import contextlib
+import functools
+import json
+import threading
+import time
+from collections import defaultdict, deque
+
+import numpy as np
+
+WINDOW = 1000  # samples kept per section
+CELL_BYTES = 12  # rough JSON size of one cell, for response size estimates
+
+def approx_cells(result):
+    """Cell count of a Sheets response from its shape (rows x columns), without walking every row."""
+    if isinstance(result, dict):
+        return len(result)
+    if not isinstance(result, (list, tuple)):
+        return 1
+    if not result:
+        return 0
+    first = result[0]
+    if isinstance(first, (list, tuple)) and first and isinstance(first[0], (list, tuple)):
+        return sum(approx_cells(block) for block in result)  # batch_get: a few blocks of rows
+    if isinstance(first, (list, tuple, dict)):
+        return len(result) * max(1, len(first))  # rows x columns of the first row
+    return len(result)
+
+
+def approx_bytes(result):
+    """Rough size of a Sheets response, good enough to spot heavy reads (O(1) per call, no serializing)."""
+    return approx_cells(result) * CELL_BYTES
+
+
+class Profiler:
+    """
+    context() returns (session id, username) of the rerun running on the calling
+    thread, or None outside of one (the save spool worker, warm-up).
+    """
+
+    def __init__(self, enabled=False, window=WINDOW, context=None):
+        self.enabled = enabled
+        self.window = window
+        self.context = context
+        self._lock = threading.Lock()
+        self._timings = defaultdict(lambda: deque(maxlen=self.window))  # section -> ms
+        self._sheets = {
+            "session": defaultdict(lambda: {"calls": 0, "bytes": 0}),
+            "user": defaultdict(lambda: {"calls": 0, "bytes": 0}),
+            "method": defaultdict(lambda: {"calls": 0, "bytes": 0}),
+        }
+        self.started_at = time.time()
+
+    # --- RERUN CONTEXT ---
+    def _caller(self):
+        """(session, user) of the rerun running on this thread; "(background)" outside of one."""
+        run = self.context() if self.context else None
+        if run is None:
+            return "(background)", "(background)"
+        session_id, username = run
+        return session_id or "(unknown)", username or "(anonymous)"
+
+    # --- TIMINGS ---
+    def record(self, name, ms):
+        with self._lock:
+            self._timings[name].append(ms)
+
+    @contextlib.contextmanager
+    def section(self, name):
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def timed(self, name):
+        """Decorator version of section(), e.g. for fragment functions."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.section(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    # --- SHEETS CALLS ---
+    def on_sheets_call(self, method, elapsed, result):
+        if not self.enabled:
+            return
+        nbytes = approx_bytes(result)
+        session, user = self._caller()
+        with self._lock:
+            for scope, key in (("session", session), ("user", user), ("method", method)):
+                counters = self._sheets[scope][key]
+                counters["calls"] += 1
+                counters["bytes"] += nbytes
+        self.record(f"sheets.{method}", elapsed * 1000)
+
+    # --- REPORTING ---
+    def percentiles(self):
+        with self._lock:
+            samples = {name: list(values) for name, values in self._timings.items()}
+        rows = []
+        for name, values in sorted(samples.items()):
+            p50, p95, p99 = np.percentile(values, [50, 95, 99])
+            rows.append({"section": name, "count": len(values),
+                         "p50_ms": round(p50, 1), "p95_ms": round(p95, 1), "p99_ms": round(p99, 1)})
+        return rows
+
+    def sheets_usage(self, scope):
+        """scope = "session" | "user" | "method" -> list of {key, calls, bytes}."""
+        with self._lock:
+            return [{scope: key, **counters} for key, counters in sorted(self._sheets[scope].items())]
+
+    def snapshot(self):
+        return {
+            "taken_at": time.time(),
+            "since": self.started_at,
+            "sections": self.percentiles(),
+            "sheets_by_user": self.sheets_usage("user"),
+            "sheets_by_session": self.sheets_usage("session"),
+            "sheets_by_method": self.sheets_usage("method"),
+        }
+
+    def export(self, path):
+        """Appends one JSON snapshot per line, for offline analysis."""
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.snapshot()) + "\n")
+        return path
@@ -0,0 +1,98 @@
+"""
+Saved meals ("My usual breakfast" = Kopi O + 2x Roti Canai).
+
+A template is kept per user in a local SQLite table with its entries already
+priced against the food catalog (calories and macros per item, plus totals),
+so adding it to the day is one SessionLog.extend and one draft write, with no
+catalog lookups. If the catalog changes (new version), the stored entries are
+re-priced the next time the user's templates are loaded.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+NUTRIENTS = [("Calories", "Cals"), ("Protein", "Prot"), ("Carbs", "Carbs"), ("Fat", "Fat")]
+
+
+def price_entries(items, food_database):
+    """[(meal, food, qty), ...] -> food log entries. Foods no longer in the catalog are dropped."""
+    entries = []
+    for meal, food, qty in items:
+        if food not in food_database:
+            continue
+        nutrients = food_database[food]
+        entries.append({"Meal": meal, "Food": food, "Qty": float(qty),
+                        **{column: nutrients[key] * qty for column, key in NUTRIENTS}})
+    return entries
+
+
+def entry_totals(entries):
+    return {column: round(sum(e[column] for e in entries), 1) for column, _ in NUTRIENTS}
+
+
+class TemplateStore:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._db() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS meal_templates (
+                    username TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    entries_json TEXT NOT NULL,
+                    totals_json TEXT NOT NULL,
+                    catalog_version TEXT NOT NULL,
+                    updated_at REAL NOT NULL,
+                    PRIMARY KEY (username, name)
+                ) WITHOUT ROWID
+            """)
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            self._local.db = db
+        return db
+
+    def _write(self, db, username, name, entries, catalog_version):
+        db.execute(
+            "INSERT INTO meal_templates (username, name, entries_json, totals_json, catalog_version, updated_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT (username, name) DO UPDATE SET "
+            "entries_json = excluded.entries_json, totals_json = excluded.totals_json, "
+            "catalog_version = excluded.catalog_version, updated_at = excluded.updated_at",
+            (username, name, json.dumps(entries), json.dumps(entry_totals(entries)), catalog_version, time.time()),
+        )
+
+    def save(self, username, name, entries, catalog):
+        """Saves (or replaces) a template from food log entries; they are re-priced against the catalog."""
+        items = [(e["Meal"], e["Food"], e["Qty"]) for e in entries]
+        with self._db() as db:
+            self._write(db, username, name, price_entries(items, catalog.foods), catalog.version)
+
+    def delete(self, username, name):
+        with self._db() as db:
+            db.execute("DELETE FROM meal_templates WHERE username = ? AND name = ?", (username, name))
+
+    def load(self, username, catalog):
+        """{name: {"entries": [...], "totals": {...}}} sorted by name, priced for this catalog version."""
+        with self._db() as db:
+            rows = db.execute(
+                "SELECT name, entries_json, totals_json, catalog_version FROM meal_templates "
+                "WHERE username = ? ORDER BY name",
+                (username,),
+            ).fetchall()
+            templates = {}
+            for name, entries_json, totals_json, version in rows:
+                entries = json.loads(entries_json)
+                if version != catalog.version:
+                    items = [(e["Meal"], e["Food"], e["Qty"]) for e in entries]
+                    entries = price_entries(items, catalog.foods)
+                    self._write(db, username, name, entries, catalog.version)
+                    templates[name] = {"entries": entries, "totals": entry_totals(entries)}
+                else:
+                    templates[name] = {"entries": entries, "totals": json.loads(totals_json)}
+        return templates
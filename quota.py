@@ -0,0 +1,214 @@
+"""
+Process-wide Sheets quota governor.
+
+Google allows roughly 60 read and 60 write requests per minute per service
+account, and every session shares that one account. QuotaGovernor sits in
+front of SheetsConnection.call():
+
+- identical reads that are already in flight are coalesced, so 50 sessions
+  opening History at once make one request, not 50;
+- reads and writes each draw from a token bucket that refills at the
+  per-minute budget;
+- when the read budget is spent (or Google answers 429) a display-only read
+  (stale_ok=True) may get the last result for the same request if it is a
+  few seconds old; everything else queues for a token and only gives up
+  after max_wait seconds. Reads that decide what to write (index builds,
+  compaction) are never served stale, and a write to a tab drops the
+  remembered results for that tab.
+
+Results handed to coalesced callers are shared objects - treat them as read-only.
+"""
+import threading
+import time
+from collections import OrderedDict
+
+READS_PER_MINUTE = 60
+WRITES_PER_MINUTE = 60
+BURST = 10          # requests allowed back to back before the bucket throttles
+STALE_TTL = 15      # seconds a previous result may stand in for a fresh display-only read
+STALE_ENTRIES = 256
+MAX_READ_WAIT = 10  # a rerun waits at most this long for a read token
+MAX_WRITE_WAIT = 60  # the save worker runs in the background, so it can wait longer
+
+
+class QuotaExceeded(TimeoutError):
+    """No token became available in time. Retryable, like a 429."""
+
+
+class TokenBucket:
+    def __init__(self, per_minute, capacity=BURST):
+        self.rate = per_minute / 60.0
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def try_acquire(self):
+        with self._lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+    def acquire(self, timeout):
+        """Waits up to timeout seconds for a token. Returns False if none came."""
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return True
+                wait = (1 - self.tokens) / self.rate
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(wait, remaining))
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return int(self.tokens)
+
+
+class _Flight:
+    """One in-flight read that later callers can wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self):
+        self.done.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def is_quota_error(error):
+    return getattr(getattr(error, "response", None), "status_code", None) == 429
+
+
+class QuotaGovernor:
+    def __init__(self, reads_per_minute=READS_PER_MINUTE, writes_per_minute=WRITES_PER_MINUTE,
+                 burst=BURST, stale_ttl=STALE_TTL, max_read_wait=MAX_READ_WAIT, max_write_wait=MAX_WRITE_WAIT):
+        self.reads = TokenBucket(reads_per_minute, burst)
+        self.writes = TokenBucket(writes_per_minute, burst)
+        self.stale_ttl = stale_ttl
+        self.max_read_wait = max_read_wait
+        self.max_write_wait = max_write_wait
+
+        self._lock = threading.Lock()
+        self._inflight = {}             # key -> _Flight
+        self._last = OrderedDict()      # key -> (result, monotonic time), for stale fallback
+
+        # --- STATS ---
+        self.read_calls = 0
+        self.write_calls = 0
+        self.coalesced = 0
+        self.stale_served = 0
+        self.queued = 0
+        self.rejected = 0
+
+    # --- READS ---
+    def read(self, key, fetch, stale_ok=False):
+        """
+        key identifies the request (key[0] is the tab); fetch() performs it.
+        Concurrent callers with the same key share one fetch(). stale_ok lets
+        a display-only read fall back to a result up to stale_ttl seconds old.
+        """
+        key = key + (stale_ok,)  # a fresh read never joins one that may come back stale
+        with self._lock:
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._inflight[key] = _Flight()
+            else:
+                self.coalesced += 1
+        if not leader:
+            return flight.wait()
+
+        try:
+            flight.result = self._read(key, fetch, stale_ok)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._inflight.get(key) is flight:
+                    del self._inflight[key]
+            flight.done.set()
+        return flight.result
+
+    def _read(self, key, fetch, stale_ok):
+        if not self.reads.try_acquire():
+            stale = self._stale(key) if stale_ok else None
+            if stale is not None:
+                return stale
+            self.queued += 1
+            if not self.reads.acquire(self.max_read_wait):
+                self.rejected += 1
+                raise QuotaExceeded(f"Sheets read quota exhausted (waited {self.max_read_wait}s)")
+        try:
+            result = fetch()
+        except Exception as e:
+            if stale_ok and is_quota_error(e):
+                stale = self._stale(key)
+                if stale is not None:
+                    return stale
+            raise
+        self.read_calls += 1
+        if stale_ok:
+            self._remember(key, result)
+        return result
+
+    def _stale(self, key):
+        with self._lock:
+            entry = self._last.get(key)
+            if entry is None or time.monotonic() - entry[1] > self.stale_ttl:
+                return None
+            self.stale_served += 1
+            return entry[0]
+
+    def _remember(self, key, result):
+        with self._lock:
+            self._last[key] = (result, time.monotonic())
+            self._last.move_to_end(key)
+            while len(self._last) > STALE_ENTRIES:
+                self._last.popitem(last=False)
+
+    # --- WRITES ---
+    def write(self, tab, fetch):
+        if not self.writes.try_acquire():
+            self.queued += 1
+            if not self.writes.acquire(self.max_write_wait):
+                self.rejected += 1
+                raise QuotaExceeded(f"Sheets write quota exhausted (waited {self.max_write_wait}s)")
+        result = fetch()
+        self.write_calls += 1
+        # Reads of this tab from before the write must not be joined by new callers or served stale
+        with self._lock:
+            for key in [k for k in self._inflight if k[0] == tab]:
+                del self._inflight[key]
+            for key in [k for k in self._last if k[0] == tab]:
+                del self._last[key]
+        return result
+
+    def stats(self):
+        return {
+            "reads": self.read_calls,
+            "writes": self.write_calls,
+            "coalesced": self.coalesced,
+            "stale_served": self.stale_served,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "read_tokens": self.reads.available(),
+            "write_tokens": self.writes.available(),
+        }
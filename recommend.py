@@ -0,0 +1,121 @@
+"""
+"What fits my remaining budget?" suggestions.
+
+FoodRecommender is built once per catalog (recommender() is cached). It keeps
+the food ids sorted by calories plus the nutrient columns in that order, so
+"everything that fits" is one searchsorted and scoring is a few vectorized
+NumPy operations, even for a 50k-food imported catalog. Pairs are scored the
+same way with one broadcast over PAIR_CANDIDATES foods: the best singles
+plus the best foods for half the budget, so pairs exist for every ranking.
+
+Answers are memoized per (budget bucket, protein bucket, ranking) inside the
+recommender, i.e. per catalog version. The budget is rounded down to its
+bucket, so a suggestion never goes over what is left.
+"""
+import functools
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+BUDGET_BUCKET = 50     # kcal
+PROTEIN_BUCKET = 5     # g
+PAIR_CANDIDATES = 300  # best singles combined into pairs (300 -> ~45k pairs)
+MEMO_SIZE = 512
+
+RANKINGS = {
+    "protein": "Most protein per kcal",
+    "closest": "Closest to what's left",
+}
+
+
+def top_k(scores, k):
+    """Indices of the k highest scores, best first (ignores -inf)."""
+    k = min(k, int(np.isfinite(scores).sum()))
+    if k <= 0:
+        return np.array([], dtype=np.int64)
+    idx = np.argpartition(-scores, k - 1)[:k]
+    return idx[np.argsort(-scores[idx], kind="stable")]
+
+
+class FoodRecommender:
+    def __init__(self, catalog):
+        self.names = catalog.names
+        self.version = catalog.version
+        columns = [np.asarray(catalog.column(c), dtype=np.float64) for c in ("Cals", "Prot", "Carbs", "Fat")]
+        usable = np.flatnonzero(columns[0] > 0)
+        # --- CALORIE-SORTED INDEX ---
+        self.order = usable[np.argsort(columns[0][usable], kind="stable")]
+        self.matrix = np.column_stack([c[self.order] for c in columns])  # rows in calorie order
+        self._memo = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _score(self, cals, prot, budget, protein_gap, rank):
+        if rank == "protein":
+            return prot / cals
+        distance = np.abs(budget - cals) / budget
+        if protein_gap > 0:
+            distance = distance + np.abs(protein_gap - prot) / protein_gap
+        return -distance
+
+    def _row(self, positions):
+        return {
+            "Food": " + ".join(self.names[self.order[p]] for p in positions),
+            **{c: round(float(v), 1) for c, v in zip(("Cals", "Prot", "Carbs", "Fat"), self.matrix[list(positions)].sum(axis=0))},
+        }
+
+    def suggest(self, remaining_kcal, protein_gap=0.0, rank="protein", k=5):
+        """
+        {"budget": kcal used, "singles": [...], "pairs": [...]}: the best k single
+        foods and k two-food combinations whose calories fit the remaining budget.
+        protein_gap (g still wanted today) only matters for rank="closest".
+        """
+        budget = int(remaining_kcal // BUDGET_BUCKET) * BUDGET_BUCKET
+        protein_gap = max(0, int(protein_gap // PROTEIN_BUCKET) * PROTEIN_BUCKET)
+        key = (budget, protein_gap, rank, k)
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+
+        result = self._suggest(budget, protein_gap, rank, k)
+        with self._lock:
+            self._memo[key] = result
+            while len(self._memo) > MEMO_SIZE:
+                self._memo.popitem(last=False)
+        return result
+
+    def _suggest(self, budget, protein_gap, rank, k):
+        result = {"budget": budget, "singles": [], "pairs": []}
+        if budget <= 0:
+            return result
+        n = int(np.searchsorted(self.matrix[:, 0], budget, side="right"))
+        if n == 0:
+            return result
+        cals, prot = self.matrix[:n, 0], self.matrix[:n, 1]
+        scores = self._score(cals, prot, budget, protein_gap, rank)
+        result["singles"] = [self._row([p]) for p in top_k(scores, k)]
+
+        # --- PAIRS ---
+        # The best singles are often too big to combine ("closest" picks foods near the whole
+        # budget), so half of the candidates are the best foods for half the budget
+        half = int(np.searchsorted(cals, budget / 2, side="right"))
+        halves = top_k(self._score(cals[:half], prot[:half], budget / 2, protein_gap / 2, rank), PAIR_CANDIDATES // 2)
+        candidates = np.union1d(halves, top_k(scores, PAIR_CANDIDATES // 2))
+        if len(candidates) < 2:
+            return result
+        pair_cals = cals[candidates][:, None] + cals[candidates][None, :]
+        pair_prot = prot[candidates][:, None] + prot[candidates][None, :]
+        pair_scores = self._score(pair_cals, pair_prot, budget, protein_gap, rank)
+        valid = np.triu(np.ones(pair_cals.shape, dtype=bool), 1) & (pair_cals <= budget)
+        pair_scores = np.where(valid, pair_scores, -np.inf).ravel()
+        for flat in top_k(pair_scores, k):
+            i, j = divmod(int(flat), len(candidates))
+            result["pairs"].append(self._row([candidates[i], candidates[j]]))
+        return result
+
+
+@functools.lru_cache(maxsize=4)
+def recommender(catalog):
+    """The process-wide recommender for a catalog (rebuilt only if the catalog object changes)."""
+    return FoodRecommender(catalog)
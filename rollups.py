@@ -0,0 +1,143 @@
+"""
+Per-client rollups for the admin dashboard.
+
+ClientRollups keeps running per-client daily / weekly / monthly net calories,
+entry counts and last-seen dates. refresh() only reads the log rows added
+since the last refresh (storage.read_master_since), so the admin landing page
+costs the same however many rows the log has. Days re-saved in place come in
+through storage.read_master_changes and replace that day's value; a
+compaction makes the next refresh start over from the first row. Each refresh
+re-reads the last row it already has, so a compaction this process never heard
+about (another replica, no shared cache) is caught as well.
+"""
+import threading
+import time
+from datetime import date
+
+REFRESH_INTERVAL = 30  # seconds between delta reads
+
+
+def parse_day(value):
+    try:
+        return date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+def to_number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class ClientStats:
+    def __init__(self):
+        self.undated = 0   # rows without a readable Date
+        self.last_seen = None
+        self.daily = {}    # date -> net kcal
+        self.weekly = {}   # (iso year, iso week) -> net kcal
+        self.monthly = {}  # "YYYY-MM" -> net kcal
+
+    @property
+    def entries(self):
+        return len(self.daily) + self.undated
+
+    def set_day(self, day, net):
+        """One summary per day: a later row for the same day replaces the earlier one."""
+        if day is None:
+            self.undated += 1
+            return
+        delta = net - self.daily.get(day, 0.0)
+        iso = day.isocalendar()
+        self.daily[day] = net
+        self.weekly[(iso[0], iso[1])] = self.weekly.get((iso[0], iso[1]), 0.0) + delta
+        self.monthly[day.strftime("%Y-%m")] = self.monthly.get(day.strftime("%Y-%m"), 0.0) + delta
+        if self.last_seen is None or day > self.last_seen:
+            self.last_seen = day
+
+
+class ClientRollups:
+    def __init__(self, refresh_interval=REFRESH_INTERVAL):
+        self.refresh_interval = refresh_interval
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self):
+        self.clients = {}
+        self.total_entries = 0   # summary rows ingested (duplicate days included)
+        self.rows = 0            # row slots consumed == read cursor (blank sheet rows included)
+        self._last = None        # (username, Date) of the last row slot consumed
+        self.latest_date = None
+        self._revision = 0       # storage change log position already applied
+        self._refreshed_at = 0.0
+
+    @property
+    def entries(self):
+        """Distinct (client, day) summaries, whatever duplicates the log still holds."""
+        with self._lock:
+            return sum(stats.entries for stats in self.clients.values())
+
+    def _apply(self, record):
+        day = parse_day(record.get("Date"))
+        username = record.get("username") or "(unknown)"
+        self.clients.setdefault(username, ClientStats()).set_day(day, to_number(record.get("Net_Calories")))
+
+    def ingest(self, records):
+        """Adds new log records (dicts with Date, Net_Calories, username)."""
+        with self._lock:
+            for record in records:
+                self._apply(record)
+                self.total_entries += 1
+                if record.get("Date"):
+                    self.latest_date = record.get("Date")
+
+    def refresh(self, storage, force=False):
+        """Pulls only the rows appended (or updated in place) since the last refresh."""
+        with self._lock:
+            if not force and time.monotonic() - self._refreshed_at < self.refresh_interval:
+                return 0
+            revision, updated = storage.read_master_changes(self._revision)
+            new_records, rows = storage.read_master_since(max(self.rows - 1, 0))
+            if self.rows:
+                # The row under the cursor must still be the one we read last time
+                if rows < self.rows or not new_records or self._key(new_records[0]) != self._last:
+                    updated = None
+                new_records = new_records[1:]
+            if updated is None:
+                self._reset()
+                new_records, rows = storage.read_master_since(0)
+            else:
+                for record in updated:
+                    self._apply(record)
+            self._revision = revision
+            self.rows = rows
+            self.ingest(new_records)
+            if new_records:
+                self._last = self._key(new_records[-1])
+            self._refreshed_at = time.monotonic()
+            return len(new_records)
+
+    @staticmethod
+    def _key(record):
+        return str(record.get("username", "")), str(record.get("Date", ""))
+
+    def summary(self, today=None):
+        """One row per client for the landing page."""
+        today = today or date.today()
+        iso = today.isocalendar()
+        this_week = (iso[0], iso[1])
+        this_month = today.strftime("%Y-%m")
+        with self._lock:
+            rows = []
+            for username, stats in sorted(self.clients.items()):
+                rows.append({
+                    "username": username,
+                    "entries": stats.entries,
+                    "last_seen": str(stats.last_seen) if stats.last_seen else "",
+                    "last_day_net": stats.daily.get(stats.last_seen, 0.0),
+                    "today_net": stats.daily.get(today, 0.0),
+                    "week_net": stats.weekly.get(this_week, 0.0),
+                    "month_net": stats.monthly.get(this_month, 0.0),
+                })
+            return rows
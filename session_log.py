@@ -0,0 +1,98 @@
+"""
+Columnar food / exercise log kept in st.session_state.
+
+Entries go into preallocated typed columns (NumPy arrays for numbers, plain
+lists for text) and the running totals are updated on append / pop / clear,
+so the dashboard reads its totals in O(1) instead of building a DataFrame.
+to_frame() is only called when a table is actually shown.
+
+It keeps the list-of-dicts API the apps already use: append({...}), pop(),
+clear(), len(), truthiness and iteration over dict entries.
+"""
+import numpy as np
+import pandas as pd
+
+FOOD_COLUMNS = [("Meal", str), ("Food", str), ("Qty", float),
+                ("Calories", float), ("Protein", float), ("Carbs", float), ("Fat", float)]
+EXERCISE_COLUMNS = [("Activity", str), ("Duration", float), ("Calories Burned", float)]
+
+
+class SessionLog:
+    def __init__(self, columns, capacity=16):
+        self.columns = [name for name, _ in columns]
+        self.text_columns = [name for name, kind in columns if kind is str]
+        self.number_columns = [name for name, kind in columns if kind is not str]
+        self._text = {name: [] for name in self.text_columns}
+        self._numbers = np.zeros((capacity, len(self.number_columns)), dtype=np.float64)
+        self._totals = np.zeros(len(self.number_columns), dtype=np.float64)
+        self._size = 0
+
+    # --- WRITES ---
+    def append(self, entry):
+        if self._size == len(self._numbers):
+            grown = np.zeros((max(16, 2 * len(self._numbers)), len(self.number_columns)), dtype=np.float64)
+            grown[:self._size] = self._numbers[:self._size]
+            self._numbers = grown
+        for name in self.text_columns:
+            self._text[name].append(entry[name])
+        row = [float(entry[name]) for name in self.number_columns]
+        self._numbers[self._size] = row
+        self._totals += row
+        self._size += 1
+
+    def extend(self, entries):
+        for entry in entries:
+            self.append(entry)
+
+    def pop(self):
+        if not self._size:
+            raise IndexError("pop from empty log")
+        entry = self[self._size - 1]
+        self._size -= 1
+        for name in self.text_columns:
+            self._text[name].pop()
+        if self._size:
+            self._totals -= self._numbers[self._size]
+        else:
+            self._totals[:] = 0  # no float drift left over once empty
+        return entry
+
+    def clear(self):
+        for name in self.text_columns:
+            self._text[name].clear()
+        self._totals[:] = 0
+        self._size = 0
+
+    # --- READS ---
+    def total(self, column):
+        return float(self._totals[self.number_columns.index(column)])
+
+    def __len__(self):
+        return self._size
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError(i)
+        entry = {name: self._text[name][i] for name in self.text_columns}
+        entry.update(zip(self.number_columns, self._numbers[i].tolist()))
+        return {name: entry[name] for name in self.columns}
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def to_frame(self):
+        """DataFrame view for st.dataframe (built on demand only)."""
+        data = {name: self._text[name] for name in self.text_columns}
+        data.update({name: self._numbers[:self._size, j] for j, name in enumerate(self.number_columns)})
+        return pd.DataFrame(data, columns=self.columns)
+
+
+def new_food_log(columns=FOOD_COLUMNS):
+    return SessionLog(columns)
+
+
+def new_exercise_log():
+    return SessionLog(EXERCISE_COLUMNS)
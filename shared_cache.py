@@ -0,0 +1,200 @@
+"""
+Cache tier shared by every app process on one host.
+
+When several Streamlit replicas run behind a load balancer, each one would
+otherwise keep its own copy of feedback notes, profiles and per-user history
+and make its own Sheets calls for them. SharedCache keeps them in one SQLite
+file that every replica opens (put it on tmpfs, e.g. /dev/shm, to keep it in
+memory):
+
+    [cache]
+    shared_path = "/dev/shm/maybloom-cache.db"
+
+It has two parts:
+- a key/value store with a TTL per key (values are JSON);
+- an append-only event log per channel. A replica that writes to Sheets
+  publishes what changed (e.g. "rows 812-813 are amy's, 2025-03-01"), and the
+  other replicas replay those events into their in-process indexes instead of
+  re-reading the sheet.
+
+Without a [cache] section the app uses NullCache, which shares nothing.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+EVENT_RETENTION = 3600  # seconds events are kept for slow readers
+PURGE_INTERVAL = 60     # seconds between clean-ups of expired keys / old events
+
+
+class NullCache:
+    """Same interface as SharedCache for a single process: nothing is shared."""
+
+    enabled = False
+
+    def get(self, key):
+        return None
+
+    def set(self, key, value, ttl):
+        pass
+
+    def delete(self, *keys):
+        pass
+
+    def delete_prefix(self, prefix):
+        pass
+
+    def get_or_load(self, key, ttl, loader):
+        return loader()
+
+    def publish(self, channel, event):
+        pass
+
+    def last_seq(self):
+        return 0
+
+    def events(self, channel, since, upto=None, skip_own=False):
+        return []
+
+    def stats(self):
+        return {}
+
+
+class SharedCache:
+    enabled = True
+
+    def __init__(self, path):
+        self.path = path
+        self.origin = uuid.uuid4().hex  # tells our own events apart from other replicas'
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        self._purged_at = 0.0
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        """)
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS events (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                channel TEXT NOT NULL,
+                origin TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS events_channel ON events (channel, seq)")
+        # Highest seq deleted by a purge; readers behind it have missed events
+        db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL)")
+        db.execute("INSERT OR IGNORE INTO meta (name, value) VALUES ('purged_upto', 0)")
+        db.commit()
+
+        # --- STATS ---
+        self.hits = 0
+        self.misses = 0
+        self.published = 0
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            self._local.db = db
+        return db
+
+    # --- KEY / VALUE ---
+    def get(self, key):
+        """The cached value, or None if it is missing or expired."""
+        row = self._db().execute(
+            "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return json.loads(row[0])
+
+    def set(self, key, value, ttl):
+        db = self._db()
+        with db:
+            db.execute(
+                "INSERT INTO entries (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at",
+                (key, json.dumps(value, default=str), time.time() + ttl),
+            )
+        self._maybe_purge()
+
+    def delete(self, *keys):
+        if not keys:
+            return
+        db = self._db()
+        with db:
+            db.execute(f"DELETE FROM entries WHERE key IN ({','.join('?' * len(keys))})", keys)
+
+    def delete_prefix(self, prefix):
+        db = self._db()
+        with db:
+            db.execute("DELETE FROM entries WHERE substr(key, 1, ?) = ?", (len(prefix), prefix))
+
+    def get_or_load(self, key, ttl, loader):
+        value = self.get(key)
+        if value is None:
+            value = loader()
+            self.set(key, value, ttl)
+        return value
+
+    # --- EVENTS ---
+    def publish(self, channel, event):
+        db = self._db()
+        with db:
+            db.execute(
+                "INSERT INTO events (channel, origin, payload, created_at) VALUES (?, ?, ?, ?)",
+                (channel, self.origin, json.dumps(event, default=str), time.time()),
+            )
+        self.published += 1
+        self._maybe_purge()
+
+    def last_seq(self):
+        row = self._db().execute(
+            "SELECT MAX(COALESCE((SELECT MAX(seq) FROM events), 0), (SELECT value FROM meta WHERE name = 'purged_upto'))"
+        ).fetchone()
+        return row[0]
+
+    def events(self, channel, since, upto=None, skip_own=False):
+        """
+        [(seq, event), ...] published on `channel` after seq `since` (up to `upto`),
+        or None if some of them were already purged and the reader has to start over.
+        """
+        db = self._db()
+        if since < db.execute("SELECT value FROM meta WHERE name = 'purged_upto'").fetchone()[0]:
+            return None
+        rows = db.execute(
+            "SELECT seq, origin, payload FROM events WHERE channel = ? AND seq > ? AND seq <= ? ORDER BY seq",
+            (channel, since, upto if upto is not None else 2 ** 62),
+        ).fetchall()
+        return [(seq, json.loads(payload)) for seq, origin, payload in rows
+                if not (skip_own and origin == self.origin)]
+
+    def _maybe_purge(self):
+        now = time.time()
+        if now - self._purged_at < PURGE_INTERVAL:
+            return
+        self._purged_at = now
+        db = self._db()
+        with db:
+            db.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+            last_old = db.execute(
+                "SELECT MAX(seq) FROM events WHERE created_at < ?", (now - EVENT_RETENTION,)
+            ).fetchone()[0]
+            if last_old:
+                db.execute("DELETE FROM events WHERE seq <= ?", (last_old,))
+                db.execute("UPDATE meta SET value = MAX(value, ?) WHERE name = 'purged_upto'", (last_old,))
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "published": self.published}
@@ -0,0 +1,160 @@
+"""
+Shared Google Sheets connection.
+
+One SheetsConnection lives for the whole server process (the app wraps it in
+st.cache_resource), so every session and every rerun reuses the same
+authorized client and spreadsheet handle instead of doing a fresh OAuth
+handshake + client.open() on each call.
+
+Credentials come from google-auth: the access token is cached on the
+credentials object and refreshed in place shortly before it expires, so the
+client and spreadsheet handle never need to be rebuilt for that. gspread and
+google-auth are imported on the first connect, so sessions that never touch
+Sheets (e.g. the SQLite engine) don't pay for loading them.
+"""
+import threading
+import time
+
+SCOPE = ["https://www.googleapis.com/auth/spreadsheets", "https://www.googleapis.com/auth/drive"]
+
+# Worksheet methods that spend write quota; everything else counts as a read
+WRITE_METHODS = {"append_row", "append_rows", "update", "batch_update", "insert_row", "insert_rows",
+                 "delete_rows", "clear", "batch_clear"}
+
+
+class SheetsConnection:
+    def __init__(self, service_account_info, sheet_name, scope=SCOPE, observer=None, governor=None):
+        self.service_account_info = dict(service_account_info)
+        self.sheet_name = sheet_name
+        self.scope = scope
+        # observer(method, elapsed_seconds, result) is told about every API call (for profiling)
+        self.observer = observer
+        # governor (quota.QuotaGovernor) rate-limits and coalesces calls across all sessions
+        self.governor = governor
+
+        self._lock = threading.RLock()
+        self._spreadsheet = None
+        self._worksheets = {}
+
+        # --- STATS ---
+        self.handshakes = 0       # real authorize + open round trips
+        self.reuses = 0           # calls served from the cached handle
+        self.auth_reconnects = 0  # reconnects forced by a 401
+
+    # --- CONNECTING ---
+    def _connect(self):
+        import gspread
+        from google.oauth2.service_account import Credentials
+
+        start = time.perf_counter()
+        creds = Credentials.from_service_account_info(self.service_account_info, scopes=self.scope)
+        client = gspread.authorize(creds)
+        self._spreadsheet = client.open(self.sheet_name)
+        self._worksheets = {}
+        self.handshakes += 1
+        self._observe("connect", start, None)
+
+    def _observe(self, method, start, result):
+        if self.observer:
+            self.observer(method, time.perf_counter() - start, result)
+
+    def reconnect(self):
+        with self._lock:
+            self._spreadsheet = None
+            self._connect()
+
+    def spreadsheet(self):
+        """Returns the shared spreadsheet handle (connecting on first use)."""
+        with self._lock:
+            if self._spreadsheet is None:
+                self._connect()
+            else:
+                self.reuses += 1
+            return self._spreadsheet
+
+    def worksheet(self, tab=0):
+        """
+        tab=0 (or any int) -> worksheet by position
+        tab="feedback"     -> worksheet by title (raises gspread.WorksheetNotFound)
+        """
+        spreadsheet = self.spreadsheet()
+        with self._lock:
+            if tab not in self._worksheets:
+                if isinstance(tab, int):
+                    self._worksheets[tab] = spreadsheet.get_worksheet(tab)
+                else:
+                    self._worksheets[tab] = spreadsheet.worksheet(tab)
+            return self._worksheets[tab]
+
+    def add_worksheet(self, title, rows=1000, cols=26):
+        """Creates a tab. Goes through the governor and observer like any other write."""
+        def fetch():
+            start = time.perf_counter()
+            worksheet = self.spreadsheet().add_worksheet(title, rows=rows, cols=cols)
+            self._observe("add_worksheet", start, None)
+            with self._lock:
+                self._worksheets[title] = worksheet
+            return worksheet
+
+        if self.governor is None:
+            return fetch()
+        return self.governor.write(title, fetch)
+
+    # --- CALLING ---
+    def call(self, tab, method, *args, stale_ok=False, **kwargs):
+        """
+        Runs worksheet.<method>(*args, **kwargs) on the shared handle.
+        If Google rejects the token (401) we reconnect once and retry.
+        With a governor, identical concurrent reads share one request and
+        everything waits for quota (see quota.py). Only pass stale_ok=True for
+        reads that are just shown to the user, never for reads a write relies on.
+        """
+        if self.governor is None:
+            return self._call(tab, method, args, kwargs)
+        fetch = lambda: self._call(tab, method, args, kwargs)
+        if method in WRITE_METHODS:
+            return self.governor.write(tab, fetch)
+        return self.governor.read((tab, method, repr(args), repr(sorted(kwargs.items()))), fetch, stale_ok)
+
+    def _call(self, tab, method, args, kwargs):
+        start = time.perf_counter()
+        try:
+            result = getattr(self.worksheet(tab), method)(*args, **kwargs)
+        except Exception as e:
+            if not is_auth_error(e):
+                raise
+            with self._lock:
+                self.auth_reconnects += 1
+                self.reconnect()
+            start = time.perf_counter()
+            result = getattr(self.worksheet(tab), method)(*args, **kwargs)
+        self._observe(method, start, result)
+        return result
+
+    def stats(self):
+        stats = {
+            "handshakes": self.handshakes,
+            "handshakes_avoided": self.reuses,
+            "auth_reconnects": self.auth_reconnects,
+        }
+        if self.governor is not None:
+            stats["quota"] = self.governor.stats()
+        return stats
+
+
+def rowcol_to_a1(row, col):
+    """(1, 1) -> "A1", (12, 28) -> "AB12" (same as gspread.utils.rowcol_to_a1, without importing gspread)."""
+    letters = ""
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return f"{letters}{row}"
+
+
+def api_status(error):
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+
+def is_auth_error(error):
+    return api_status(error) == 401
@@ -0,0 +1,178 @@
+"""
+Write-behind save queue.
+
+Saves are written to a local SQLite spool first (so the user's day is never
+lost) and acknowledged straight away. A background SpoolWorker drains the
+spool to Google Sheets with append_rows in batches, backing off on quota
+(429) and server (5xx) errors.
+
+Each spooled row has a kind ("summary" for the daily summary row, "items"
+for all of that day's normalized item rows) and the worker writes each kind
+with its own writer.
+"""
+import json
+import os
+import random
+import sqlite3
+import threading
+import time
+
+PENDING = "pending"
+SYNCED = "synced"
+FAILED = "failed"
+
+SUMMARY = "summary"
+ITEMS = "items"
+
+BATCH_SIZE = 50
+MAX_BACKOFF = 300  # seconds
+
+
+class SaveSpool:
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        with self._db() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("""
+                CREATE TABLE IF NOT EXISTS saves (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT NOT NULL,
+                    entry_date TEXT NOT NULL,
+                    row_json TEXT NOT NULL,
+                    kind TEXT NOT NULL DEFAULT 'summary',
+                    status TEXT NOT NULL DEFAULT 'pending',
+                    attempts INTEGER NOT NULL DEFAULT 0,
+                    last_error TEXT,
+                    created_at REAL NOT NULL,
+                    synced_at REAL
+                )
+            """)
+            columns = [c[1] for c in db.execute("PRAGMA table_info(saves)")]
+            if "kind" not in columns:  # spools created before item rows existed
+                db.execute("ALTER TABLE saves ADD COLUMN kind TEXT NOT NULL DEFAULT 'summary'")
+            db.execute("CREATE INDEX IF NOT EXISTS saves_status ON saves (status, id)")
+            db.execute("CREATE INDEX IF NOT EXISTS saves_user ON saves (username, id)")
+
+    def _db(self):
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            self._local.db = db
+        return db
+
+    def enqueue(self, username, entry_date, row, kind=SUMMARY):
+        """Stores one sheet row durably and returns its spool id."""
+        with self._db() as db:
+            cur = db.execute(
+                "INSERT INTO saves (username, entry_date, row_json, kind, created_at) VALUES (?, ?, ?, ?, ?)",
+                (username, str(entry_date), json.dumps(row), kind, time.time()),
+            )
+            return cur.lastrowid
+
+    def pending(self, limit=BATCH_SIZE):
+        """Oldest pending entries as (id, username, row, kind) tuples."""
+        with self._db() as db:
+            rows = db.execute(
+                "SELECT id, username, row_json, kind FROM saves WHERE status = ? ORDER BY id LIMIT ?",
+                (PENDING, limit),
+            ).fetchall()
+        return [(id_, username, json.loads(row_json), kind) for id_, username, row_json, kind in rows]
+
+    def mark(self, ids, status, error=None):
+        if not ids:
+            return
+        marks = ",".join("?" * len(ids))
+        with self._db() as db:
+            db.execute(
+                f"UPDATE saves SET status = ?, attempts = attempts + 1, last_error = ?, "
+                f"synced_at = CASE WHEN ? = 'synced' THEN ? ELSE synced_at END WHERE id IN ({marks})",
+                (status, error, status, time.time(), *ids),
+            )
+
+    def note_error(self, ids, error):
+        """Records a failed attempt but leaves the entries pending for the next retry."""
+        self.mark(ids, PENDING, error)
+
+    def recent(self, username, limit=10):
+        """Latest saves for one user, for the sync status panel."""
+        with self._db() as db:
+            return db.execute(
+                "SELECT id, entry_date, status, attempts, last_error, created_at FROM saves "
+                "WHERE username = ? AND kind = ? ORDER BY id DESC LIMIT ?",
+                (username, SUMMARY, limit),
+            ).fetchall()
+
+
+def is_retryable(error):
+    """Quota (429), server (5xx) and network errors are worth retrying; anything else is not."""
+    status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        return isinstance(error, (ConnectionError, TimeoutError, OSError))
+    return status == 429 or status >= 500
+
+
+class SpoolWorker(threading.Thread):
+    """
+    Background thread that flushes the spool.
+    writers maps kind -> write_rows(rows), which must write a batch of rows in one call
+    (e.g. worksheet.append_rows); a plain function is used for summaries only.
+    """
+
+    def __init__(self, spool, writers, batch_size=BATCH_SIZE, base_delay=1.0):
+        super().__init__(daemon=True, name="save-spool-worker")
+        self.spool = spool
+        self.writers = writers if isinstance(writers, dict) else {SUMMARY: writers}
+        self.batch_size = batch_size
+        self.base_delay = base_delay
+        self._wake = threading.Event()
+        self._failures = 0
+
+    def notify(self):
+        """Wakes the worker after an enqueue so saves go out without waiting for the poll."""
+        self._wake.set()
+
+    def flush_once(self):
+        """Sends one batch (one write call per kind). Returns how many rows were handled (synced or failed)."""
+        entries = self.spool.pending(self.batch_size)
+        if not entries:
+            return 0
+        by_kind = {}
+        for entry in entries:
+            by_kind.setdefault(entry[3], []).append(entry)
+
+        for kind, group in by_kind.items():
+            ids = [entry[0] for entry in group]
+            write_rows = self.writers.get(kind)
+            if write_rows is None:
+                self.spool.mark(ids, FAILED, f"No writer for {kind!r} rows")
+                continue
+            try:
+                write_rows([entry[2] for entry in group])
+            except Exception as e:
+                if is_retryable(e):
+                    self.spool.note_error(ids, str(e))
+                    raise
+                self.spool.mark(ids, FAILED, str(e))
+                continue
+            self.spool.mark(ids, SYNCED)
+        return len(entries)
+
+    def backoff(self):
+        delay = min(MAX_BACKOFF, self.base_delay * (2 ** self._failures))
+        return delay * (0.5 + random.random() / 2)
+
+    def run(self):
+        while True:
+            self._wake.clear()
+            try:
+                handled = self.flush_once()
+            except Exception:
+                # Don't let new saves cut the backoff short, or a 429 storm feeds itself
+                self._failures += 1
+                time.sleep(self.backoff())
+                continue
+            self._failures = 0
+            if handled < self.batch_size:
+                self._wake.wait(timeout=30)
@@ -0,0 +1,667 @@
+"""
+Storage engines for the tracker.
+
+Every read/write the app does goes through one of these, so we can pick the
+engine in .streamlit/secrets.toml:
+
+    [storage]
+    engine = "sheets"        # default: Google Sheets
+    # engine = "sqlite"      # local embedded database, no quota / latency
+    # sqlite_path = "local_data/wellness.db"
+    # normalized_items = true # also write one row per logged item
+
+Records are plain dicts keyed like the sheet headers, so the UI doesn't care
+which engine it is talking to.
+
+Daily summaries are upserted on (username, Date): saving a day again
+overwrites that day's row instead of adding a duplicate.
+"""
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+
+from history import INDEX_TTL, HistoryStore, appended_first_row, column_range, row_runs
+from sheets import rowcol_to_a1
+
+# Column order of the main log tab (row 1 of the sheet)
+SUMMARY_COLUMNS = ["Date", "Food", "Exercise", "Net_Calories", "username"]
+FEEDBACK_COLUMNS = ["username", "month", "note"]
+# Client body metrics kept by the coach ("profiles" tab / profiles table)
+PROFILE_COLUMNS = ["username", "height_cm", "weight_kg", "activity"]
+PROFILES_TAB = "profiles"
+
+# One row per logged food/exercise item ("items" tab / log_items table).
+# Calories are signed: food adds energy, exercise subtracts it, so a plain
+# sum over a user's day gives the net.
+ITEM_COLUMNS = ["Date", "username", "Kind", "Meal", "Item", "Qty", "Calories", "Protein", "Carbs", "Fat"]
+ITEMS_TAB = "items"
+
+CHANGE_LOG_SIZE = 1000  # in-place updates remembered for incremental readers
+
+
+class ChangeLog:
+    """
+    Summary rows updated in place (upserts) and rewrites (compaction), so
+    readers that only follow appended rows (rollups) can catch up.
+    With a shared cache the log lives in its event table, so a reader also
+    sees changes written by other app processes; revisions are event seqs.
+    """
+
+    channel = "summaries"
+
+    def __init__(self, capacity=CHANGE_LOG_SIZE, shared=None):
+        self.shared = shared if shared is not None and shared.enabled else None
+        self.revision = 0
+        self._entries = deque(maxlen=capacity)  # (revision, record)
+        self._reset_at = 0
+        self._lock = threading.Lock()
+
+    def note_updates(self, records):
+        if self.shared:
+            for record in records:
+                self.shared.publish(self.channel, {"op": "update", "record": record})
+            return
+        with self._lock:
+            for record in records:
+                self.revision += 1
+                self._entries.append((self.revision, record))
+
+    def note_reset(self):
+        """Rows were deleted or moved: every reader has to start over."""
+        if self.shared:
+            self.shared.publish(self.channel, {"op": "reset"})
+            return
+        with self._lock:
+            self.revision += 1
+            self._reset_at = self.revision
+            self._entries.clear()
+
+    def since(self, revision):
+        if self.shared:
+            last = self.shared.last_seq()
+            events = self.shared.events(self.channel, revision, upto=last)
+            if events is None or any(e["op"] == "reset" for _, e in events):
+                return last, None
+            return last, [e["record"] for _, e in events]
+        with self._lock:
+            if revision == self.revision:
+                return self.revision, []
+            oldest = self._entries[0][0] if self._entries else self.revision + 1
+            if revision < self._reset_at or oldest > revision + 1:
+                return self.revision, None
+            return self.revision, [record for rev, record in self._entries if rev > revision]
+
+
+class ItemRows:
+    """
+    (username, Date) -> rows of the items tab, kept up to date by our own
+    writes so a save only touches the rows of the days it replaces. It is
+    built from the Date and username columns on first use, and again after
+    INDEX_TTL or once a write shows another process changed the tab (rows no
+    longer holding their day, or an append that didn't land after our last row).
+    """
+
+    def __init__(self, conn, tab=ITEMS_TAB, ttl=INDEX_TTL):
+        self.conn = conn
+        self.tab = tab
+        self.ttl = ttl
+        self._days = None        # (username, Date) -> [row numbers]
+        self._last_row = 1
+        self._built_at = 0.0
+
+    @staticmethod
+    def _key(row):
+        return str(row[ITEM_COLUMNS.index("username")]), str(row[ITEM_COLUMNS.index("Date")])
+
+    def _build(self):
+        dates, names = self.conn.call(self.tab, "batch_get", [
+            column_range(ITEM_COLUMNS.index("Date") + 1), column_range(ITEM_COLUMNS.index("username") + 1),
+        ])
+        days = {}
+        for offset, name in enumerate(names):
+            if name and offset < len(dates) and dates[offset]:
+                days.setdefault((str(name[0]), str(dates[offset][0])), []).append(offset + 2)
+        self._days = days
+        self._last_row = max(len(names), len(dates)) + 1
+        self._built_at = time.monotonic()
+
+    def reset(self):
+        self._days = None
+
+    def rows_for(self, keys):
+        """Sorted rows currently holding any of these days."""
+        if self._days is None or time.monotonic() - self._built_at > self.ttl:
+            self._build()
+        return sorted(row for key in keys for row in self._days.get(key, []))
+
+    def holds(self, rows, keys):
+        """Reads back just the Date and username cells of `rows` (one batch_get) and checks they hold these days."""
+        if not rows:
+            return True
+        runs = row_runs(rows)
+        blocks = self.conn.call(self.tab, "batch_get", [f"A{first}:B{last}" for first, last in runs])
+        for (first, last), block in zip(runs, blocks):
+            if len(block) < last - first + 1:
+                return False
+            for values in block:
+                values = list(values) + ["", ""]  # A = Date, B = username
+                if (str(values[1]), str(values[0])) not in keys:
+                    return False
+        return True
+
+    def note_write(self, keys, reused, deleted, new, response):
+        """
+        Applies a save_log_items write: the days in `keys` now hold `new`, the
+        first len(reused) of them in the `reused` rows, the rest appended; the
+        `deleted` rows are gone and everything below them moved up.
+        """
+        for key in keys:
+            self._days.pop(key, None)
+        for row, values in zip(reused, new):
+            self._days.setdefault(self._key(values), []).append(row)
+        for first, last in reversed(row_runs(deleted)):
+            count = last - first + 1
+            for rows in self._days.values():
+                rows[:] = [row - count if row > last else row for row in rows]
+            self._last_row -= count
+        appended = new[len(reused):]
+        if appended:
+            first_row = appended_first_row(response)
+            if first_row and first_row != self._last_row + 1:  # another process appended too
+                self.reset()
+                return
+            start = first_row or self._last_row + 1
+            for offset, values in enumerate(appended):
+                self._days.setdefault(self._key(values), []).append(start + offset)
+            self._last_row = start + len(appended) - 1
+
+
+class StorageBackend:
+    """The operations the app needs from any storage engine."""
+
+    name = "base"
+
+    def save_daily_summaries(self, rows):
+        """Writes a batch of summary rows (lists in SUMMARY_COLUMNS order)."""
+        raise NotImplementedError
+
+    def save_log_items(self, days):
+        """
+        Replaces the item rows of each saved day with the day's current items.
+        days are log_item_day() dicts; a day saved again keeps only its new items.
+        """
+        raise NotImplementedError
+
+    def read_history(self, username):
+        """One user's summary rows."""
+        raise NotImplementedError
+
+    def read_master_since(self, offset):
+        """
+        (records, new offset): summary rows after the first `offset` row slots
+        (incremental rollups). Offsets count row slots, blank sheet rows
+        included, the same unit read_master_page pages by.
+        """
+        raise NotImplementedError
+
+    def read_master_page(self, offset, limit):
+        """Summary rows in the `limit` row slots after the first `offset` (admin drill-down)."""
+        raise NotImplementedError
+
+    def master_size(self):
+        """Row slots in the main log right now: what read_master_page has to page through."""
+        raise NotImplementedError
+
+    def read_feedback(self):
+        """Every coach note; empty list if there is no feedback store."""
+        raise NotImplementedError
+
+    def save_feedback(self, rows):
+        """Appends a batch of coach notes (lists in FEEDBACK_COLUMNS order) in one call."""
+        raise NotImplementedError
+
+    def read_profiles(self):
+        """Client body metrics (PROFILE_COLUMNS); empty list if none are kept."""
+        raise NotImplementedError
+
+    def read_master_changes(self, revision):
+        """
+        (current revision, summary records updated in place since `revision`),
+        or (current revision, None) if rows were deleted/moved and readers must re-read everything.
+        """
+        return self.changes.since(revision)
+
+    def compact_daily_summaries(self):
+        """One-off cleanup: keeps the latest row per (username, Date). Returns rows removed."""
+        raise NotImplementedError
+
+    def warm_up(self):
+        """Does the slow first-use work (connecting, loading drivers) ahead of the first request."""
+
+    def stats(self):
+        return {}
+
+
+# --- GOOGLE SHEETS ENGINE ---
+class SheetsStorage(StorageBackend):
+    name = "sheets"
+
+    def __init__(self, conn, main_tab=0, feedback_tab="feedback", shared=None):
+        self.conn = conn
+        self.main_tab = main_tab
+        self.feedback_tab = feedback_tab
+        self.history = HistoryStore(conn, tab=main_tab, shared=shared)
+        self.changes = ChangeLog(shared=shared)
+        self.items = ItemRows(conn)
+        self._header = None
+        self._write_lock = threading.Lock()
+
+    def save_daily_summaries(self, rows):
+        """
+        Days that already have a row are overwritten with one batch_update of
+        their row ranges (found through the history index, no scan); new days
+        are appended. Within a batch the last row for a day wins. The target
+        rows are read back first: if one no longer holds its day, the index is
+        rebuilt from the sheet before anything is written.
+        """
+        user_col = SUMMARY_COLUMNS.index("username")
+        date_col = SUMMARY_COLUMNS.index("Date")
+        latest = {}
+        for row in rows:
+            latest[(row[user_col], str(row[date_col]))] = row
+
+        with self._write_lock:
+            targets = {key: self.history.row_for(*key) for key in latest}
+            if self._moved({key: r for key, r in targets.items() if r}):
+                # The sheet changed under the index (compaction in another process, manual edit): re-read it
+                self.history.reset()
+                targets = {key: self.history.row_for(*key) for key in latest}
+
+            updates, appends = [], []
+            for key, row in latest.items():
+                sheet_row = targets[key]
+                if sheet_row:
+                    updates.append((sheet_row, row))
+                else:
+                    appends.append(row)
+
+            response = None
+            if updates:
+                self.conn.call(self.main_tab, "batch_update", [
+                    {"range": f"{rowcol_to_a1(r, 1)}:{rowcol_to_a1(r, len(row))}", "values": [row]}
+                    for r, row in updates
+                ])
+                for _, row in updates:
+                    self.history.invalidate(row[user_col])
+                self.changes.note_updates([dict(zip(SUMMARY_COLUMNS, row)) for _, row in updates])
+            if appends:
+                response = self.conn.call(self.main_tab, "append_rows", appends)
+                first_row = appended_first_row(response)
+                for offset, row in enumerate(appends):
+                    self.history.note_append(row[user_col], first_row=first_row + offset if first_row else None,
+                                             day=row[date_col])
+            return response
+
+    def _moved(self, targets):
+        """
+        True if any of the {(username, Date): row} targets no longer holds that
+        day on the sheet. Reads just those rows, in one batch_get.
+        """
+        if not targets:
+            return False
+        header = self._master_header()
+        user_col, date_col = header.index("username"), header.index("Date")
+        blocks = self.conn.call(self.main_tab, "batch_get", [
+            f"{rowcol_to_a1(r, 1)}:{rowcol_to_a1(r, len(header))}" for r in targets.values()
+        ])
+        for key, block in zip(targets, blocks):
+            values = list(block[0]) if block else []
+            values += [""] * (len(header) - len(values))
+            if (str(values[user_col]), str(values[date_col])) != key:
+                return True
+        return False
+
+    def compact_daily_summaries(self):
+        """
+        Rewrites the main tab with only the latest row per (username, Date),
+        then deletes the leftover rows at the bottom. If it stops half way the
+        sheet still has every day (some twice), never fewer.
+        """
+        with self._write_lock:
+            values = self.conn.call(
+                self.main_tab, "get_values",
+                value_render_option="UNFORMATTED_VALUE", date_time_render_option="FORMATTED_STRING",
+            )
+            if len(values) < 2:
+                return 0
+            header, data = values[0], values[1:]
+            user_col, date_col = header.index("username"), header.index("Date")
+            width = len(header)
+
+            last_for_key = {}
+            for i, row in enumerate(data):
+                row = list(row) + [""] * (width - len(row))
+                if row[user_col] and row[date_col]:
+                    last_for_key[(row[user_col], str(row[date_col]))] = i
+            kept = []
+            for i, row in enumerate(data):
+                row = list(row) + [""] * (width - len(row))
+                if not any(row):
+                    continue
+                key = (row[user_col], str(row[date_col]))
+                if key not in last_for_key or last_for_key[key] == i:
+                    kept.append(row)
+
+            removed = len(data) - len(kept)
+            if removed == 0:
+                return 0
+            self.conn.call(self.main_tab, "update", range_name=f"A2:{rowcol_to_a1(len(kept) + 1, width)}",
+                           values=kept)
+            self.conn.call(self.main_tab, "delete_rows", len(kept) + 2, len(values))
+            self.history.reset()
+            self.changes.note_reset()
+            return removed
+
+    def _ensure_tab(self, title, columns):
+        # Created on first use so existing spreadsheets don't need a manual step
+        import gspread  # only the Sheets engine needs it, and the connection has loaded it by now
+        try:
+            self.conn.worksheet(title)
+        except gspread.WorksheetNotFound:
+            self.conn.add_worksheet(title, rows=1000, cols=len(columns))
+            self.conn.call(title, "append_row", columns)
+
+    def save_log_items(self, days):
+        """
+        The rows of the days being replaced come from the item row index (no
+        scan) and are read back to check they still hold those days; they are
+        overwritten with the new rows in one batch_update, and any difference
+        is appended or deleted.
+        """
+        days = item_days(days)
+        if not days:
+            return None
+        with self._write_lock:
+            self._ensure_tab(ITEMS_TAB, ITEM_COLUMNS)
+            old = self.items.rows_for(days)
+            if not self.items.holds(old, days):
+                # The tab changed under the index (another process, manual edit): re-read it
+                self.items.reset()
+                old = self.items.rows_for(days)
+            new = [row for rows in days.values() for row in rows]
+
+            reused = min(len(old), len(new))
+            if reused:
+                updates, taken = [], 0
+                for first, last in row_runs(old[:reused]):
+                    count = last - first + 1
+                    updates.append({"range": f"{rowcol_to_a1(first, 1)}:{rowcol_to_a1(last, len(ITEM_COLUMNS))}",
+                                    "values": new[taken:taken + count]})
+                    taken += count
+                self.conn.call(ITEMS_TAB, "batch_update", updates)
+            for first, last in reversed(row_runs(old[reused:])):  # bottom up, so row numbers stay valid
+                self.conn.call(ITEMS_TAB, "delete_rows", first, last)
+            response = self.conn.call(ITEMS_TAB, "append_rows", new[reused:]) if len(new) > reused else None
+            self.items.note_write(days, old[:reused], old[reused:], new, response)
+            return response
+
+    def read_history(self, username):
+        return self.history.get(username)
+
+    def _master_header(self):
+        if self._header is None:
+            self._header = self.conn.call(self.main_tab, "row_values", 1)
+        return self._header
+
+    def _read_master_values(self, first_row, last_row=None):
+        """
+        Range read of sheet rows first_row..last_row. Blank rows in between come
+        back as [] (Sheets only trims the blank rows at the end).
+        """
+        header = self._master_header()
+        end = rowcol_to_a1(last_row, len(header)) if last_row else rowcol_to_a1(1, len(header))[:-1]
+        return self.conn.call(
+            self.main_tab, "get_values", f"A{first_row}:{end}",
+            value_render_option="UNFORMATTED_VALUE", date_time_render_option="FORMATTED_STRING",
+        )
+
+    def _master_records(self, values):
+        header = self._master_header()
+        width = len(header)
+        return [dict(zip(header, list(row) + [""] * (width - len(row)))) for row in values if any(row)]
+
+    # Row 1 is the header, so row slot n (0-based) lives on sheet row n + 2
+    def read_master_since(self, offset):
+        values = self._read_master_values(offset + 2)
+        return self._master_records(values), offset + len(values)
+
+    def read_master_page(self, offset, limit):
+        return self._master_records(self._read_master_values(offset + 2, offset + 1 + limit))
+
+    def master_size(self):
+        # The last row with a Date or username; two narrow columns instead of the whole log
+        header = self._master_header()
+        days, names = self.conn.call(self.main_tab, "batch_get", [
+            column_range(header.index("Date") + 1), column_range(header.index("username") + 1),
+        ])
+        return max(len(days), len(names))
+
+    def read_feedback(self):
+        import gspread
+        try:
+            return self.conn.call(self.feedback_tab, "get_all_records", stale_ok=True)
+        except gspread.WorksheetNotFound:
+            return []  # Feedback tab doesn't exist
+
+    def save_feedback(self, rows):
+        self._ensure_tab(self.feedback_tab, FEEDBACK_COLUMNS)
+        return self.conn.call(self.feedback_tab, "append_rows", rows)
+
+    def read_profiles(self):
+        import gspread
+        try:
+            return self.conn.call(PROFILES_TAB, "get_all_records", stale_ok=True)
+        except gspread.WorksheetNotFound:
+            return []
+
+    def warm_up(self):
+        self.conn.spreadsheet()
+
+    def stats(self):
+        return self.conn.stats()
+
+
+# --- LOCAL SQLITE ENGINE ---
+class SQLiteStorage(StorageBackend):
+    name = "sqlite"
+
+    def __init__(self, path, shared=None):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._local = threading.local()
+        self.changes = ChangeLog(shared=shared)
+        db = self._db()
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS daily_logs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                Date TEXT NOT NULL,
+                Food TEXT,
+                Exercise TEXT,
+                Net_Calories REAL,
+                username TEXT NOT NULL
+            )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS daily_logs_user_date ON daily_logs (username, Date)")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS log_items (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                Date TEXT NOT NULL,
+                username TEXT NOT NULL,
+                Kind TEXT NOT NULL,
+                Meal TEXT,
+                Item TEXT,
+                Qty REAL,
+                Calories REAL,
+                Protein REAL,
+                Carbs REAL,
+                Fat REAL
+            )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS log_items_user_date ON log_items (username, Date)")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS feedback (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                username TEXT NOT NULL,
+                month TEXT,
+                note TEXT
+            )
+        """)
+        db.execute("CREATE INDEX IF NOT EXISTS feedback_user ON feedback (username, id)")
+        db.execute("""
+            CREATE TABLE IF NOT EXISTS profiles (
+                username TEXT PRIMARY KEY,
+                height_cm REAL,
+                weight_kg REAL,
+                activity TEXT
+            )
+        """)
+        db.commit()
+
+    def _db(self):
+        # One connection per thread (sessions and the spool worker run on different threads)
+        db = getattr(self._local, "db", None)
+        if db is None:
+            db = sqlite3.connect(self.path, timeout=30)
+            db.row_factory = sqlite3.Row
+            self._local.db = db
+        return db
+
+    def _records(self, sql, params=(), columns=SUMMARY_COLUMNS):
+        return [{c: row[c] for c in columns} for row in self._db().execute(sql, params)]
+
+    def save_daily_summaries(self, rows):
+        """Updates the day's row through the (username, Date) index, inserting only new days."""
+        db = self._db()
+        updated = []
+        with db:
+            for row in rows:
+                record = dict(zip(SUMMARY_COLUMNS, row))
+                cur = db.execute(
+                    "UPDATE daily_logs SET Food = :Food, Exercise = :Exercise, Net_Calories = :Net_Calories "
+                    "WHERE username = :username AND Date = :Date",
+                    record,
+                )
+                if cur.rowcount:
+                    updated.append(record)
+                else:
+                    db.execute(f"INSERT INTO daily_logs ({', '.join(SUMMARY_COLUMNS)}) VALUES (?, ?, ?, ?, ?)", row)
+        self.changes.note_updates(updated)
+        return None
+
+    def compact_daily_summaries(self):
+        db = self._db()
+        with db:
+            cur = db.execute(
+                "DELETE FROM daily_logs WHERE id NOT IN (SELECT MAX(id) FROM daily_logs GROUP BY username, Date)"
+            )
+        if cur.rowcount:
+            self.changes.note_reset()
+        return cur.rowcount
+
+    def save_log_items(self, days):
+        db = self._db()
+        with db:
+            for (username, day), rows in item_days(days).items():
+                db.execute("DELETE FROM log_items WHERE username = ? AND Date = ?", (username, day))
+                db.executemany(
+                    f"INSERT INTO log_items ({', '.join(ITEM_COLUMNS)}) VALUES ({', '.join('?' * len(ITEM_COLUMNS))})",
+                    rows,
+                )
+        return None
+
+    def read_history(self, username):
+        return self._records("SELECT * FROM daily_logs WHERE username = ? ORDER BY Date, id", (username,))
+
+    def read_master_since(self, offset):
+        records = self._records("SELECT * FROM daily_logs ORDER BY id LIMIT -1 OFFSET ?", (offset,))
+        return records, offset + len(records)
+
+    def read_master_page(self, offset, limit):
+        return self._records("SELECT * FROM daily_logs ORDER BY id LIMIT ? OFFSET ?", (limit, offset))
+
+    def master_size(self):
+        return self._db().execute("SELECT COUNT(*) FROM daily_logs").fetchone()[0]
+
+    def read_feedback(self):
+        return self._records("SELECT * FROM feedback ORDER BY id", columns=FEEDBACK_COLUMNS)
+
+    def read_profiles(self):
+        return self._records("SELECT * FROM profiles ORDER BY username", columns=PROFILE_COLUMNS)
+
+    def save_feedback(self, rows):
+        db = self._db()
+        with db:
+            db.executemany("INSERT INTO feedback (username, month, note) VALUES (?, ?, ?)", rows)
+
+
+def format_log_to_string(log_list, type="food"):
+    """Session log -> the text kept in the Food / Exercise columns of a summary row."""
+    if not log_list: return "None"
+    text_summary = []
+    for item in log_list:
+        if type == "food":
+            text_summary.append(f"{item['Meal']}: {item['Food']} (x{item['Qty']})")
+        else:
+            text_summary.append(f"{item['Activity']} ({item['Duration']} mins)")
+    return ", ".join(text_summary)
+
+
+def log_item_rows(selected_date, username, food_log, exercise_log):
+    """Turns the session logs into ITEM_COLUMNS rows for the normalized items store."""
+    rows = []
+    for item in food_log:
+        rows.append([str(selected_date), username, "food", item["Meal"], item["Food"], item["Qty"],
+                     item["Calories"], item["Protein"], item["Carbs"], item["Fat"]])
+    for item in exercise_log:
+        rows.append([str(selected_date), username, "exercise", "Exercise", item["Activity"], item["Duration"],
+                     -item["Calories Burned"], 0, 0, 0])
+    return rows
+
+
+def log_item_day(selected_date, username, food_log, exercise_log):
+    """One saved day for save_log_items: its key and all its item rows (possibly none)."""
+    return {"Date": str(selected_date), "username": username,
+            "items": log_item_rows(selected_date, username, food_log, exercise_log)}
+
+
+def item_days(entries):
+    """
+    log_item_day() dicts -> {(username, Date): item rows}; a later entry for the same
+    day wins. Bare item rows (spools written before days were saved whole) are
+    grouped by their own Date and username.
+    """
+    days = {}
+    for entry in entries:
+        if isinstance(entry, dict):
+            days[(entry["username"], entry["Date"])] = list(entry["items"])
+        else:
+            key = (entry[ITEM_COLUMNS.index("username")], str(entry[ITEM_COLUMNS.index("Date")]))
+            days.setdefault(key, []).append(entry)
+    return days
+
+
+def make_storage(config, sheets_factory, default_sqlite_path, shared=None):
+    """
+    Picks the engine from the [storage] config section.
+    sheets_factory() is only called when the Sheets engine is selected.
+    shared is the cross-process cache (shared_cache.py), if one is configured.
+    """
+    engine = config.get("engine", "sheets")
+    if engine == "sqlite":
+        return SQLiteStorage(config.get("sqlite_path", default_sqlite_path), shared=shared)
+    if engine == "sheets":
+        return SheetsStorage(sheets_factory(), shared=shared)
+    raise ValueError(f"Unknown storage engine: {engine}")
@@ -0,0 +1,34 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path[:0] = [ROOT, os.path.join(ROOT, "benchmarks")]
+
+import fake_gspread  # noqa: E402
+from sheets import SheetsConnection  # noqa: E402
+from storage import SheetsStorage  # noqa: E402
+
+
+@pytest.fixture
+def spreadsheet():
+    """An in-memory spreadsheet with an empty main log and feedback tab."""
+    sheet = fake_gspread.FakeSpreadsheet([
+        fake_gspread.FakeWorksheet("Sheet1", fake_gspread.HEADER),
+        fake_gspread.FakeWorksheet("feedback", fake_gspread.FEEDBACK_HEADER),
+    ])
+    fake_gspread.install(sheet)
+    return sheet
+
+
+@pytest.fixture
+def make_storage(spreadsheet):
+    """Builds SheetsStorage instances that act like separate app processes on the same sheet."""
+    def make(**conn_kwargs):
+        return SheetsStorage(SheetsConnection({"type": "service_account"}, "test", **conn_kwargs))
+    return make
+
+
+def sheet_rows(spreadsheet, title="Sheet1"):
+    return [row for row in next(ws for ws in spreadsheet.worksheets if ws.title == title).values[1:]]
@@ -0,0 +1,24 @@
+import os
+
+import bulk
+from storage import SQLiteStorage
+
+
+def test_exports_are_rotated(tmp_path, monkeypatch):
+    storage = SQLiteStorage(str(tmp_path / "wellness.db"))
+    storage.save_daily_summaries([["2026-10-01", "x", "None", 1, "amy"]])
+    out_dir = tmp_path / "exports"
+    for n in range(5):
+        monkeypatch.setattr(bulk.time, "strftime", lambda fmt, n=n: f"run{n}")
+        path, rows = bulk.export_file(storage, "csv", str(out_dir))
+        os.utime(path, (n, n))
+        assert rows == 1
+    assert sorted(os.listdir(out_dir)) == [f"master_log_run{n}.csv" for n in (2, 3, 4)]
+
+
+def test_export_skips_blank_chunks(spreadsheet, make_storage):
+    storage = make_storage()
+    sheet = spreadsheet.worksheets[0]
+    sheet.values += [["2026-10-01", "x", "None", 1, "amy"]] + [[] for _ in range(10)] + [["2026-10-02", "x", "None", 2, "bob"]]
+    chunks = list(bulk.iter_master_chunks(storage, chunk_rows=4))
+    assert [r["username"] for chunk in chunks for r in chunk] == ["amy", "bob"]
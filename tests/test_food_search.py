@@ -0,0 +1,13 @@
+from food_search import FoodSearchIndex
+
+NAMES = ["Corn / Jagung (1/2 cup)", "Chicken Rice (Roasted - 1 plate)", "Chapati (1 piece)",
+         "Chee Cheong Fun (1 plate)", "Nasi Lemak (1 plate)", "Roti Canai (1 piece + dhal)"]
+
+
+def test_short_queries_match_the_full_search():
+    index = FoodSearchIndex(NAMES, {"Corn / Jagung (1/2 cup)": ["maize"]})
+    index.warm()
+    for query in ["c", "ch", "n", "ma", "r"]:
+        assert index.search(query, k=3) == index._search(query, len(NAMES))[:3]  # full ranking, cut to 3
+    assert index.search("ch", k=2)[0].startswith("Ch")
+    assert index.search("jaggung")[0] == "Corn / Jagung (1/2 cup)"
@@ -0,0 +1,51 @@
+import threading
+import time
+
+import fake_gspread
+from test_upsert import day
+
+
+def test_history_after_manual_row_delete(spreadsheet, make_storage):
+    storage = make_storage()
+    storage.save_daily_summaries([
+        day("2026-10-01", "amy", 1111, "amy meal"), day("2026-10-01", "bob", 2222, "bob private meal"),
+    ])
+    storage.history.row_for("amy", "2026-10-01")  # index built while amy is on row 2
+    del spreadsheet.worksheets[0].values[1]  # someone deletes amy's row in the sheet; bob moves up to row 2
+
+    assert storage.read_history("amy") == []
+    assert [r["Net_Calories"] for r in storage.read_history("bob")] == [2222]
+
+
+def test_history_after_compaction_in_another_process(spreadsheet, make_storage):
+    a, b = make_storage(), make_storage()
+    spreadsheet.worksheets[0].values += [
+        day("2026-10-01", "amy", 0), day("2026-10-01", "amy", 1), day("2026-10-01", "bob", 2),
+    ]
+    b.history.row_for("amy", "2026-10-01")  # b indexes the sheet before the compaction
+    assert a.compact_daily_summaries() == 1
+
+    assert [r["username"] for r in b.read_history("amy")] == ["amy"]
+    assert [r["Net_Calories"] for r in b.read_history("bob")] == [2]
+
+
+def test_history_reads_for_different_users_overlap(spreadsheet, make_storage, monkeypatch):
+    storage = make_storage()
+    users = [f"client{i}" for i in range(8)]
+    storage.save_daily_summaries([day("2026-10-01", user) for user in users])
+    storage.history.row_for(users[0], "2026-10-01")  # index built up front
+
+    batch_get = fake_gspread.FakeWorksheet.batch_get
+
+    def slow_batch_get(self, ranges, **kwargs):
+        time.sleep(0.2)
+        return batch_get(self, ranges, **kwargs)
+
+    monkeypatch.setattr(fake_gspread.FakeWorksheet, "batch_get", slow_batch_get)
+    start = time.perf_counter()
+    threads = [threading.Thread(target=storage.read_history, args=(user,)) for user in users]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert time.perf_counter() - start < 0.2 * len(users) / 2
@@ -0,0 +1,24 @@
+import threading
+
+from instrumentation import Profiler
+
+
+def test_sheets_calls_count_for_the_rerun_that_made_them():
+    runs = threading.local()
+    profiler = Profiler(enabled=True, context=lambda: getattr(runs, "current", None))
+
+    def rerun(session_id, username):  # e.g. a fragment rerun, on its own thread
+        runs.current = (session_id, username)
+        profiler.on_sheets_call("batch_get", 0.01, [["a", "b"]])
+
+    threads = [threading.Thread(target=rerun, args=("s1", "amy")), threading.Thread(target=rerun, args=("s2", None))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    profiler.on_sheets_call("append_rows", 0.01, {})  # spool worker: no rerun on this thread
+
+    assert {r["session"]: r["calls"] for r in profiler.sheets_usage("session")} == {
+        "s1": 1, "s2": 1, "(background)": 1}
+    assert {r["user"]: r["calls"] for r in profiler.sheets_usage("user")} == {
+        "amy": 1, "(anonymous)": 1, "(background)": 1}
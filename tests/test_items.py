@@ -0,0 +1,62 @@
+import fake_gspread
+from conftest import sheet_rows
+from storage import SQLiteStorage, log_item_day
+
+FOOD = {"Meal": "Breakfast", "Food": "Oats", "Qty": 1.0, "Calories": 100, "Protein": 5, "Carbs": 20, "Fat": 2}
+WALK = {"Activity": "Walking", "Duration": 30, "Calories Burned": 120}
+
+
+def items(storage_rows):
+    return sorted((r[0], r[1], r[4]) for r in storage_rows)
+
+
+def test_sheets_resave_replaces_the_days_items(spreadsheet, make_storage):
+    storage = make_storage()
+    storage.save_log_items([log_item_day("2026-10-01", "amy", [FOOD, FOOD], [WALK]),
+                            log_item_day("2026-10-01", "bob", [FOOD], [])])
+    storage.save_log_items([log_item_day("2026-10-01", "amy", [FOOD], [])])
+    assert items(sheet_rows(spreadsheet, "items")) == [
+        ("2026-10-01", "amy", "Oats"), ("2026-10-01", "bob", "Oats"),
+    ]
+    storage.save_log_items([log_item_day("2026-10-01", "amy", [FOOD, FOOD, FOOD], [WALK])])
+    assert items(sheet_rows(spreadsheet, "items")).count(("2026-10-01", "amy", "Oats")) == 3
+    assert len(sheet_rows(spreadsheet, "items")) == 5
+
+
+def test_sheets_empty_day_removes_its_items(spreadsheet, make_storage):
+    storage = make_storage()
+    storage.save_log_items([log_item_day("2026-10-01", "amy", [FOOD], [WALK])])
+    storage.save_log_items([log_item_day("2026-10-01", "amy", [], [])])
+    assert sheet_rows(spreadsheet, "items") == []
+
+
+
+def test_sheets_save_does_not_scan_the_items_tab(spreadsheet, make_storage):
+    storage = make_storage()
+    storage.save_log_items([log_item_day("2026-10-01", "amy", [FOOD], [WALK])])
+    fake_gspread.reset_calls()
+    storage.save_log_items([log_item_day("2026-10-02", "amy", [FOOD], [])])
+    assert fake_gspread.CALLS["batch_get"] == 0  # a new day: nothing to read
+    storage.save_log_items([log_item_day("2026-10-01", "amy", [FOOD], [])])
+    assert fake_gspread.CALLS["batch_get"] == 1  # only the day's own rows, read back
+    assert items(sheet_rows(spreadsheet, "items")) == [("2026-10-01", "amy", "Oats"), ("2026-10-02", "amy", "Oats")]
+
+
+def test_sheets_resave_after_another_process_wrote_items(spreadsheet, make_storage):
+    a, b = make_storage(), make_storage()
+    a.save_log_items([log_item_day("2026-10-01", "amy", [FOOD, FOOD], [WALK])])
+    b.save_log_items([log_item_day("2026-10-01", "bob", [FOOD], []), log_item_day("2026-10-02", "amy", [FOOD], [])])
+    b.save_log_items([log_item_day("2026-10-01", "amy", [FOOD], [])])  # moves bob's and amy's 10-02 rows up
+    a.save_log_items([log_item_day("2026-10-01", "amy", [FOOD], [WALK])])
+    a.save_log_items([log_item_day("2026-10-02", "amy", [], [WALK])])
+    assert items(sheet_rows(spreadsheet, "items")) == [
+        ("2026-10-01", "amy", "Oats"), ("2026-10-01", "amy", "Walking"), ("2026-10-01", "bob", "Oats"),
+        ("2026-10-02", "amy", "Walking"),
+    ]
+
+def test_sqlite_resave_replaces_the_days_items(tmp_path):
+    storage = SQLiteStorage(str(tmp_path / "wellness.db"))
+    storage.save_log_items([log_item_day("2026-10-01", "amy", [FOOD, FOOD], [WALK])])
+    storage.save_log_items([log_item_day("2026-10-01", "amy", [FOOD], [])])
+    rows = storage._db().execute("SELECT Date, username, Item FROM log_items").fetchall()
+    assert [tuple(r) for r in rows] == [("2026-10-01", "amy", "Oats")]
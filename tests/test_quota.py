@@ -0,0 +1,53 @@
+from conftest import sheet_rows
+from quota import QuotaGovernor
+
+
+def drain(governor):
+    while governor.reads.try_acquire():
+        pass
+
+
+def test_reads_are_fresh_unless_stale_ok():
+    governor = QuotaGovernor(reads_per_minute=6000, writes_per_minute=6000, burst=1)
+    value = {"n": 1}
+    fetch = lambda: value["n"]
+    assert governor.read(("tab", "get"), fetch, stale_ok=True) == 1
+    value["n"] = 2
+    drain(governor)
+    assert governor.read(("tab", "get"), fetch) == 2            # waits for a token instead
+    drain(governor)
+    assert governor.read(("tab", "get"), fetch, stale_ok=True) == 1  # display read may lag a little
+
+
+def test_write_drops_remembered_reads_of_that_tab():
+    governor = QuotaGovernor(reads_per_minute=6000, writes_per_minute=6000, burst=1)
+    value = {"n": 1}
+    assert governor.read(("feedback", "get_all_records"), lambda: value["n"], stale_ok=True) == 1
+    governor.write("feedback", lambda: value.update(n=2))
+    drain(governor)
+    assert governor.read(("feedback", "get_all_records"), lambda: value["n"], stale_ok=True) == 2
+
+
+def test_compaction_never_rewrites_from_a_stale_snapshot(spreadsheet, make_storage):
+    a = make_storage(governor=QuotaGovernor(reads_per_minute=6000, writes_per_minute=6000, burst=1))
+    b = make_storage()
+    sheet = spreadsheet.worksheets[0]
+    sheet.values += [["2026-10-01", "x", "None", 1, "amy"], ["2026-10-01", "x", "None", 2, "amy"]]
+    assert a.compact_daily_summaries() == 1
+
+    b.save_daily_summaries([["2026-10-02", "x", "None", 3, "bob"]])
+    sheet.values.append(["2026-10-01", "x", "None", 4, "amy"])
+    drain(a.conn.governor)
+    assert a.compact_daily_summaries() == 1
+    assert sorted(r[4] + str(r[3]) for r in sheet_rows(spreadsheet)) == ["amy4", "bob3"]
+
+
+def test_new_tabs_are_counted_as_writes(spreadsheet, make_storage):
+    spreadsheet.worksheets.pop()  # no feedback tab yet
+    governor = QuotaGovernor()
+    calls = []
+    storage = make_storage(governor=governor, observer=lambda method, elapsed, result: calls.append(method))
+    storage.save_feedback([["amy", "2026-10", "Nice week"]])
+    assert calls == ["connect", "add_worksheet", "append_row", "append_rows"]
+    assert governor.stats()["writes"] == 3
+    assert sheet_rows(spreadsheet, "feedback") == [["amy", "2026-10", "Nice week"]]
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+
+from recommend import RANKINGS, FoodRecommender
+
+
+class Catalog:
+    """The parts of catalog.FoodCatalog the recommender reads."""
+
+    def __init__(self, n, seed=0):
+        rng = np.random.default_rng(seed)
+        self.names = [f"food{i}" for i in range(n)]
+        self.version = f"test-{n}-{seed}"
+        cals = rng.uniform(20, 900, n)
+        self._columns = {"Cals": cals, "Prot": cals * rng.uniform(0, 0.1, n),
+                         "Carbs": cals * rng.uniform(0, 0.2, n), "Fat": cals * rng.uniform(0, 0.05, n)}
+
+    def column(self, nutrient):
+        return self._columns[nutrient]
+
+
+@pytest.mark.parametrize("rank", list(RANKINGS))
+def test_pairs_fit_the_budget_for_every_ranking(rank):
+    recommender = FoodRecommender(Catalog(50_000))
+    for remaining in (300, 800, 1500):
+        result = recommender.suggest(remaining, protein_gap=40, rank=rank, k=5)
+        assert len(result["singles"]) == 5
+        assert len(result["pairs"]) == 5
+        assert all(pair["Cals"] <= result["budget"] for pair in result["pairs"])
@@ -0,0 +1,46 @@
+from rollups import ClientRollups
+
+
+def test_blank_rows_do_not_inflate_later_refreshes(spreadsheet, make_storage):
+    storage = make_storage()
+    sheet = spreadsheet.worksheets[0]
+    sheet.values += [["2026-10-01", "x", "None", 1, "amy"], [], ["", "", "", "", ""],
+                     ["2026-10-01", "x", "None", 2, "bob"]]
+    rollups = ClientRollups()
+    rollups.refresh(storage, force=True)
+    assert (rollups.total_entries, rollups.rows) == (2, 4)
+
+    storage.save_daily_summaries([["2026-10-02", "x", "None", 3, "amy"]])
+    rollups.refresh(storage, force=True)
+    rollups.refresh(storage, force=True)
+    assert (rollups.total_entries, rollups.entries, rollups.rows) == (3, 3, 5)
+    assert rollups.clients["amy"].monthly["2026-10"] == 4
+
+
+def test_pages_cover_every_row_slot(spreadsheet, make_storage):
+    storage = make_storage()
+    sheet = spreadsheet.worksheets[0]
+    sheet.values += [[f"2026-10-{d:02d}", "x", "None", d, "amy"] if d % 3 else [] for d in range(1, 11)]
+    rollups = ClientRollups()
+    rollups.refresh(storage, force=True)
+    pages = [storage.read_master_page(offset, 4) for offset in range(0, rollups.rows, 4)]
+    assert [r["Net_Calories"] for page in pages for r in page] == [1, 2, 4, 5, 7, 8, 10]
+
+
+def test_compaction_in_another_process(spreadsheet, make_storage):
+    a, b = make_storage(), make_storage()
+    spreadsheet.worksheets[0].values += [
+        ["2026-10-01", "x", "None", 0, "amy"], ["2026-10-01", "x", "None", 1, "amy"],
+        ["2026-10-01", "x", "None", 2, "bob"], ["2026-10-02", "x", "None", 3, "amy"],
+        ["2026-10-02", "x", "None", 4, "bob"],
+    ]
+    rollups = ClientRollups()
+    rollups.refresh(b, force=True)
+    assert rollups.rows == 5
+
+    assert a.compact_daily_summaries() == 1  # b's change log never hears about it
+    a.save_daily_summaries([["2026-10-02", "x", "None", 5, "carol"]])
+    rollups.refresh(b, force=True)
+    assert sorted(rollups.clients) == ["amy", "bob", "carol"]
+    assert (rollups.entries, rollups.rows) == (5, 5)
+    assert rollups.clients["amy"].monthly["2026-10"] == 4
@@ -0,0 +1,38 @@
+from conftest import sheet_rows
+
+
+def day(date, username, net=1000, food="x"):
+    return [date, food, "None", net, username]
+
+
+def test_save_again_overwrites_the_day(spreadsheet, make_storage):
+    storage = make_storage()
+    storage.save_daily_summaries([day("2026-10-01", "amy", 1000)])
+    storage.save_daily_summaries([day("2026-10-01", "amy", 1500)])
+    assert sheet_rows(spreadsheet) == [day("2026-10-01", "amy", 1500)]
+
+
+def test_upsert_after_compaction_in_another_process(spreadsheet, make_storage):
+    a, b = make_storage(), make_storage()
+    a.save_daily_summaries([day("2026-10-01", "amy", 1)])
+    a.save_daily_summaries([day("2026-10-01", "bob", 2)])
+    # An old duplicate at the top, as written before saves were upserts
+    spreadsheet.worksheets[0].values.insert(1, day("2026-10-01", "amy", 0))
+    a.save_daily_summaries([day("2026-10-02", "amy", 3)])
+
+    b.history.row_for("amy", "2026-10-02")  # b indexes the sheet before the compaction
+    assert a.compact_daily_summaries() == 1
+    b.save_daily_summaries([day("2026-10-02", "amy", 4)])
+
+    assert sorted(sheet_rows(spreadsheet)) == sorted([
+        day("2026-10-01", "amy", 1), day("2026-10-01", "bob", 2), day("2026-10-02", "amy", 4),
+    ])
+
+
+def test_upsert_after_manual_row_delete(spreadsheet, make_storage):
+    storage = make_storage()
+    storage.save_daily_summaries([day("2026-10-01", "amy", 1), day("2026-10-02", "bob", 2)])
+    storage.history.row_for("bob", "2026-10-02")
+    del spreadsheet.worksheets[0].values[1]  # someone deletes amy's row in the sheet
+    storage.save_daily_summaries([day("2026-10-01", "amy", 5)])
+    assert sorted(sheet_rows(spreadsheet)) == sorted([day("2026-10-01", "amy", 5), day("2026-10-02", "bob", 2)])
@@ -0,0 +1,92 @@
+"""
+Server-side shaping of a client's history for the History tab.
+
+The browser only ever gets a bounded payload: the history is cut to the
+selected date range, rolled up to days / weeks / months here, and long
+series are downsampled with LTTB (Largest-Triangle-Three-Buckets), which keeps
+peaks and dips that plain every-nth-point sampling would drop.
+"""
+import numpy as np
+import pandas as pd
+
+POINT_BUDGET = 400   # max points sent to the chart
+TABLE_ROWS = 200     # max rows sent to the table (most recent first)
+ROLLING_DAYS = 7
+
+# period -> pandas resample rule (None = one row per day)
+PERIODS = {"Daily": None, "Weekly": "W-MON", "Monthly": "MS"}
+
+
+def daily_frame(records):
+    """
+    One row per logged day, indexed by date. If a day was saved more than
+    once the latest row wins (same rule as the upsert).
+    """
+    df = pd.DataFrame(records)
+    if df.empty or "Date" not in df:
+        return pd.DataFrame(columns=["Food", "Exercise", "Net_Calories"], index=pd.DatetimeIndex([], name="Date"))
+    df["Date"] = pd.to_datetime(df["Date"].astype(str).str[:10], errors="coerce")
+    df["Net_Calories"] = pd.to_numeric(df["Net_Calories"], errors="coerce")
+    df = df.dropna(subset=["Date"]).drop_duplicates("Date", keep="last")
+    return df.set_index("Date").sort_index().drop(columns=["username"], errors="ignore")
+
+
+def summarize(daily, period):
+    """
+    Daily   -> Net_Calories + a rolling ROLLING_DAYS-day average
+    Weekly / Monthly -> average and total net per period, and days logged
+    """
+    rule = PERIODS[period]
+    if rule is None:
+        out = daily[["Net_Calories"]].copy()
+        out[f"{ROLLING_DAYS}-day avg"] = out["Net_Calories"].rolling(f"{ROLLING_DAYS}D").mean().round(1)
+        return out
+    grouped = daily["Net_Calories"].resample(rule, label="left", closed="left")
+    out = pd.DataFrame({
+        "Avg_Net_Calories": grouped.mean().round(1),
+        "Total_Net_Calories": grouped.sum(),
+        "Days_Logged": grouped.count(),
+    })
+    return out[out["Days_Logged"] > 0]
+
+
+def lttb(x, y, threshold):
+    """
+    Indices of the `threshold` points that best keep the shape of (x, y).
+    x must be increasing. First and last points are always kept.
+    """
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # n - 2 inner points split into threshold - 2 buckets
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0] = 0
+    keep[-1] = n - 1
+    a = 0
+    for i in range(threshold - 2):
+        start, end = edges[i], edges[i + 1]
+        # average of the next bucket (or the last point) is the third triangle corner
+        if i + 2 < len(edges):
+            nxt = slice(edges[i + 1], edges[i + 2])
+            cx, cy = x[nxt].mean(), y[nxt].mean()
+        else:
+            cx, cy = x[-1], y[-1]
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = start + int(np.argmax(area))
+        keep[i + 1] = a
+    return keep
+
+
+def downsample(frame, column, budget=POINT_BUDGET):
+    """frame (date-indexed) cut to `budget` rows chosen by LTTB on `column`."""
+    series = frame[column].dropna()
+    if len(series) <= budget:
+        return frame.loc[series.index]
+    x = series.index.asi8
+    keep = lttb(x, series.to_numpy(), budget)
+    return frame.loc[series.index[keep]]